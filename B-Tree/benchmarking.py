@@ -0,0 +1,1182 @@
+from os import getcwd, path as os_path
+from sys import path as sys_path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import pickle
+import tracemalloc
+
+sys_path.append(getcwd())
+from btree import *
+
+
+DEGREES = [2, 4, 8, 16, 32, 64, 128, 256, 512]
+
+
+def time_it(function, *args):
+    """Times a single call of a function.
+
+    Parameters
+    ----------
+
+    function : callable
+
+        The function to be timed.
+
+    *args : list
+
+        The arguments to be given to the function.
+
+    Returns
+    -------
+
+    tuple : (seconds, result)
+
+        seconds : float
+
+            How long the call took, in seconds.
+
+        result : object
+
+            Whatever the function returned.
+    """
+    start = perf_counter()
+    result = function(*args)
+    return (perf_counter() - start, result)
+
+
+def benchmark_find_insert(num_keys=100000, degrees=DEGREES, seed=0):
+    """Measures the cost of BTree.insert() and BTree.find() for several degrees.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys are inserted into (and then searched for in) each tree.
+
+    degrees : list (default = DEGREES)
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    For each degree, a BTree object is built by inserting num_keys shuffled keys one by one, and then every key is looked up through BTree.find(). The average cost per key of each phase is printed out in microseconds, along with the depth of the resulting tree.
+    """
+    keys = list(range(num_keys))
+    Random(seed).shuffle(keys)
+
+    print(
+        "{:>8} {:>6} {:>14} {:>14}".format(
+            "degree", "depth", "insert (us)", "find (us)"
+        )
+    )
+    for degree in degrees:
+        tree = BTree(degree)
+        insert_time, _ = time_it(tree.insert, keys)
+        find_time, _ = time_it(lambda: [tree.find(key) for key in keys])
+        print(
+            "{:>8} {:>6} {:>14.2f} {:>14.2f}".format(
+                degree,
+                tree.get_depth(),
+                insert_time / num_keys * 1e6,
+                find_time / num_keys * 1e6,
+            )
+        )
+
+
+def benchmark_bulk_load(num_keys=100000, degrees=DEGREES):
+    """Compares building a tree through BTree.insert() against BTree.bulk_load().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many sorted keys each tree is built with.
+
+    degrees : list (default = DEGREES)
+
+        The min_num_keys values to be benchmarked.
+
+    Methodology
+    -----------
+
+    For each degree, the same sorted keys are loaded once through repeated insertions and once through BTree.bulk_load(), and the total time of each approach is printed out in milliseconds.
+    """
+    keys = list(range(num_keys))
+
+    print("{:>8} {:>14} {:>14}".format("degree", "insert (ms)", "bulk (ms)"))
+    for degree in degrees:
+        insert_time, _ = time_it(BTree, degree, keys)
+        bulk_time, _ = time_it(BTree.bulk_load, degree, keys)
+        print(
+            "{:>8} {:>14.1f} {:>14.1f}".format(
+                degree, insert_time * 1e3, bulk_time * 1e3
+            )
+        )
+
+
+def benchmark_buffer_pool(
+    num_keys=50000, degree=16, buffer_sizes=[4, 16, 64, 256], seed=0
+):
+    """Measures how the buffer pool of a DiskBTree behaves under random lookups.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 50000)
+
+        How many keys the tree holds and how many lookups are made.
+
+    degree : int (default = 16)
+
+        The min_num_keys of the tree.
+
+    buffer_sizes : list (default = [4, 16, 64, 256])
+
+        The buffer pool capacities to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    The tree is bulk loaded into a temporary page file once. Then, for each eviction policy and buffer size, it is reopened and every key is looked up in random order, printing out the time per lookup and the counters of the buffer pool.
+    """
+    keys = list(range(num_keys))
+    Random(seed).shuffle(keys)
+
+    with TemporaryDirectory() as directory:
+        path = os_path.join(directory, "benchmark.btree")
+        DiskBTree.bulk_load(degree, range(num_keys), path=path).close()
+
+        print(
+            "{:>8} {:>8} {:>12} {:>10} {:>10} {:>10}".format(
+                "policy", "pages", "find (us)", "hits", "misses", "hit ratio"
+            )
+        )
+        for eviction in EVICTION_POLICIES:
+            for buffer_size in buffer_sizes:
+                tree = DiskBTree(
+                    degree, path, buffer_size=buffer_size, eviction=eviction
+                )
+                find_time, _ = time_it(lambda: [tree.find(key) for key in keys])
+                stats = tree.buffer_pool.get_stats()
+                tree.close()
+                print(
+                    "{:>8} {:>8} {:>12.2f} {:>10} {:>10} {:>10.3f}".format(
+                        eviction,
+                        buffer_size,
+                        find_time / num_keys * 1e6,
+                        stats["hits"],
+                        stats["misses"],
+                        stats["hit_ratio"],
+                    )
+                )
+
+
+def benchmark_scans(num_keys=100000, degrees=[2, 8, 32, 128], num_ranges=1000, seed=0):
+    """Compares ordered scans of BTree and BPlusTree objects.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    degrees : list (default = [2, 8, 32, 128])
+
+        The min_num_keys values to be benchmarked.
+
+    num_ranges : int (default = 1000)
+
+        How many range queries are made on each tree.
+
+    seed : int (default = 0)
+
+        The seed used to choose the ranges.
+
+    Methodology
+    -----------
+
+    For each degree, a BTree and a BPlusTree object are built with the same keys. Then, each tree is fully iterated once and queried for num_ranges ranges of 100 keys each, printing out the time of each phase in milliseconds.
+    """
+    keys = list(range(num_keys))
+    random = Random(seed)
+    starts = [random.randrange(num_keys - 100) for _ in range(num_ranges)]
+
+    print(
+        "{:>8} {:>10} {:>12} {:>12}".format(
+            "degree", "tree", "scan (ms)", "ranges (ms)"
+        )
+    )
+    for degree in degrees:
+        for tree in [BTree.bulk_load(degree, keys), BPlusTree(degree, keys)]:
+            scan_time, _ = time_it(lambda: sum(1 for _ in tree))
+            range_time, _ = time_it(
+                lambda: [list(tree.range(start, start + 99)) for start in starts]
+            )
+            print(
+                "{:>8} {:>10} {:>12.1f} {:>12.1f}".format(
+                    degree, type(tree).__name__, scan_time * 1e3, range_time * 1e3
+                )
+            )
+
+
+def insert_with_exceptions(tree, keys):
+    """Inserts keys into a BTree object like BTree.insert() does, but having each overflow reported by a DegreeOverflowError (the duplicate check is left out).
+
+    Parameters
+    ----------
+
+    tree : BTree
+
+        A BTree object.
+
+    keys : list
+
+        The keys to be inserted, none of which may be in the tree already.
+    """
+    for key in merge_to_list(keys):
+        check_type(key)
+        _, path = tree.find_path(key)
+        page_pointer, _ = path[-1]
+        tree.update_sizes(path, 1)
+        try:
+            page_pointer.insert(key)
+        except DegreeOverflowError:
+            tree.promote(path)
+        tree.num_keys += 1
+
+
+def remove_with_exceptions(tree, keys):
+    """Removes keys from a BTree object like BTree.remove() does, but having each underflow reported by a DegreeUnderflowError.
+
+    Parameters
+    ----------
+
+    tree : BTree
+
+        A BTree object.
+
+    keys : list
+
+        The keys to be removed, all of which must be in the tree.
+    """
+    for key in merge_to_list(keys):
+        _, path = tree.find_path(key)
+        page_pointer, _ = path[-1]
+        try:
+            if page_pointer.is_leaf():
+                tree.update_sizes(path, -1)
+                page_pointer.remove(key)
+            else:
+                path = path[:-1] + page_pointer.replace_with_leaf_element(key)
+                tree.update_sizes(path, -1)
+                leaf_page, _ = path[-1]
+                if len(leaf_page) < leaf_page.min_num_keys:
+                    raise DegreeUnderflowError(leaf_page)
+        except DegreeUnderflowError:
+            tree.rebalance(path)
+        tree.num_keys -= 1
+
+
+def benchmark_restructuring(num_keys=100000, degrees=range(1, 9), seed=0):
+    """Compares insertions and removals driven by exceptions against the ones made by BTree.insert() and BTree.remove().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys are inserted into (and then removed from) each tree.
+
+    degrees : iterable (default = range(1, 9))
+
+        The min_num_keys values to be benchmarked. Small degrees split and merge pages more often, so they are the ones where the difference shows.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    For each degree, the same shuffled keys are inserted into an empty tree and then removed from it, once through insert_with_exceptions() and remove_with_exceptions() and once through BTree.insert() and BTree.remove(). Both share the same restructuring code, so the difference is the cost of raising and catching the exceptions. The throughput of each phase is printed out in thousands of keys per second.
+    """
+    keys = list(range(num_keys))
+    random = Random(seed)
+    random.shuffle(keys)
+    removal_keys = keys[:]
+    random.shuffle(removal_keys)
+
+    print(
+        "{:>8} {:>16} {:>16} {:>16} {:>16}".format(
+            "degree",
+            "raise ins (k/s)",
+            "insert (k/s)",
+            "raise rem (k/s)",
+            "remove (k/s)",
+        )
+    )
+    for degree in degrees:
+        tree = BTree(degree)
+        raising_insert_time, _ = time_it(insert_with_exceptions, tree, keys)
+        raising_remove_time, _ = time_it(remove_with_exceptions, tree, removal_keys)
+        tree = BTree(degree)
+        insert_time, _ = time_it(tree.insert, keys)
+        remove_time, _ = time_it(tree.remove, removal_keys)
+        print(
+            "{:>8} {:>16.1f} {:>16.1f} {:>16.1f} {:>16.1f}".format(
+                degree,
+                num_keys / raising_insert_time / 1e3,
+                num_keys / insert_time / 1e3,
+                num_keys / raising_remove_time / 1e3,
+                num_keys / remove_time / 1e3,
+            )
+        )
+
+
+def get_occupancy(tree):
+    """Counts the pages of a BTree object and how full they are.
+
+    Parameters
+    ----------
+
+    tree : BTree
+
+        A BTree object.
+
+    Returns
+    -------
+
+    tuple : (num_pages, occupancy)
+
+        num_pages : int
+
+            How many pages the tree has.
+
+        occupancy : float
+
+            The number of keys of the tree divided by how many keys its pages could hold.
+    """
+    num_pages = 0
+    capacity = 0
+    pages = [tree.root]
+    while pages:
+        page = pages.pop()
+        num_pages += 1
+        capacity += page.max_num_keys
+        pages.extend(page.descendent_pages)
+    return (num_pages, tree.root.size / capacity)
+
+
+def benchmark_b_star(num_keys=100000, degrees=[2, 4, 8, 16, 32], seed=0):
+    """Compares the default splitting policy against the B* one.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys are inserted into each tree.
+
+    degrees : list (default = [2, 4, 8, 16, 32])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    For each degree and policy, the shuffled keys are inserted one by one and half of them are then removed. The number of pages and their occupancy after the insertions are printed out, along with the depth of the tree and the throughput of each phase in thousands of keys per second.
+    """
+    keys = list(range(num_keys))
+    random = Random(seed)
+    random.shuffle(keys)
+    removal_keys = random.sample(keys, num_keys // 2)
+
+    print(
+        "{:>8} {:>8} {:>8} {:>10} {:>6} {:>14} {:>14}".format(
+            "degree",
+            "policy",
+            "pages",
+            "occupancy",
+            "depth",
+            "insert (k/s)",
+            "remove (k/s)",
+        )
+    )
+    for degree in degrees:
+        for b_star in [False, True]:
+            tree = BTree(degree, b_star=b_star)
+            insert_time, _ = time_it(tree.insert, keys)
+            num_pages, occupancy = get_occupancy(tree)
+            depth = tree.get_depth()
+            remove_time, _ = time_it(tree.remove, removal_keys)
+            print(
+                "{:>8} {:>8} {:>8} {:>10.3f} {:>6} {:>14.1f} {:>14.1f}".format(
+                    degree,
+                    "b*" if b_star else "b-tree",
+                    num_pages,
+                    occupancy,
+                    depth,
+                    num_keys / insert_time / 1e3,
+                    len(removal_keys) / remove_time / 1e3,
+                )
+            )
+
+
+def benchmark_insert_many(num_keys=100000, batch_size=10000, degrees=DEGREES, seed=0):
+    """Compares inserting a batch into an existing tree through BTree.insert() against BTree.insert_many().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds before the batch is inserted.
+
+    batch_size : int (default = 10000)
+
+        How many keys each batch has.
+
+    degrees : list (default = DEGREES)
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to pick and shuffle the batches.
+
+    Methodology
+    -----------
+
+    Each tree is bulk loaded with the even numbers below 2 * num_keys, and batches of odd numbers are inserted into copies of it. A clustered batch holds consecutive odd numbers, so it lands in few leaf pages, while a scattered batch is picked uniformly at random. Both come shuffled. The total time of each batch is printed out in milliseconds, once for BTree.insert() and once for BTree.insert_many().
+    """
+    rnd = Random(seed)
+    keys = list(range(0, 2 * num_keys, 2))
+    start = rnd.randrange(num_keys - batch_size)
+    clustered = list(range(2 * start + 1, 2 * (start + batch_size), 2))
+    scattered = rnd.sample(range(1, 2 * num_keys, 2), batch_size)
+    rnd.shuffle(clustered)
+
+    print(
+        "{:>8} {:>16} {:>16} {:>16} {:>16}".format(
+            "degree",
+            "clust. ins (ms)",
+            "clust. many (ms)",
+            "scat. ins (ms)",
+            "scat. many (ms)",
+        )
+    )
+    for degree in degrees:
+        times = []
+        for batch in (clustered, scattered):
+            for method in (BTree.insert, BTree.insert_many):
+                tree = BTree.bulk_load(degree, keys, fill_factor=0.75)
+                batch_time, _ = time_it(method, tree, batch)
+                times.append(batch_time * 1e3)
+        print("{:>8} {:>16.1f} {:>16.1f} {:>16.1f} {:>16.1f}".format(degree, *times))
+
+
+def benchmark_find_many(num_keys=100000, num_probes=100000, degrees=DEGREES, seed=0):
+    """Compares looking up a batch of keys through BTree.__contains__() against BTree.contains_many().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_probes : int (default = 100000)
+
+        How many keys are looked up.
+
+    degrees : list (default = DEGREES)
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to pick the probes.
+
+    Methodology
+    -----------
+
+    Each tree is bulk loaded with the even numbers below 2 * num_keys and probed with random numbers of the same interval, so about half of them are found. The average cost per probe is printed out in microseconds, both for one membership test per probe and for a single call of BTree.contains_many().
+    """
+    rnd = Random(seed)
+    keys = list(range(0, 2 * num_keys, 2))
+    probes = [rnd.randrange(2 * num_keys) for _ in range(num_probes)]
+
+    print("{:>8} {:>14} {:>14}".format("degree", "in (us)", "many (us)"))
+    for degree in degrees:
+        tree = BTree.bulk_load(degree, keys)
+        single_time, _ = time_it(lambda: [probe in tree for probe in probes])
+        many_time, _ = time_it(tree.contains_many, probes)
+        print(
+            "{:>8} {:>14.2f} {:>14.2f}".format(
+                degree, single_time / num_probes * 1e6, many_time / num_probes * 1e6
+            )
+        )
+
+
+def benchmark_remove_range(
+    num_keys=100000, fractions=[0.01, 0.1, 0.5], degrees=[2, 8, 64]
+):
+    """Compares removing a range of keys through BTree.remove() against BTree.remove_range().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds before the removal.
+
+    fractions : list (default = [0.01, 0.1, 0.5])
+
+        The fractions of the keys to be removed, always starting from the smallest one, as when expiring old data.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    Methodology
+    -----------
+
+    For each degree and fraction, two copies of the same tree are built through BTree.bulk_load(). The keys of the range are removed one by one from the first one and all at once from the second one, and the total time of each approach is printed out in milliseconds.
+    """
+    keys = list(range(num_keys))
+
+    print(
+        "{:>8} {:>10} {:>14} {:>14}".format(
+            "degree", "fraction", "remove (ms)", "range (ms)"
+        )
+    )
+    for degree in degrees:
+        for fraction in fractions:
+            hi = int(num_keys * fraction) - 1
+            tree = BTree.bulk_load(degree, keys)
+            remove_time, _ = time_it(tree.remove, keys[: hi + 1])
+            tree = BTree.bulk_load(degree, keys)
+            range_time, _ = time_it(tree.remove_range, None, hi)
+            print(
+                "{:>8} {:>10} {:>14.1f} {:>14.3f}".format(
+                    degree, fraction, remove_time * 1e3, range_time * 1e3
+                )
+            )
+
+
+def benchmark_set_algebra(num_keys=100000, degrees=[2, 8, 64], seed=0):
+    """Compares the intersection of two trees through membership tests against BTree.intersection().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to pick the keys.
+
+    Methodology
+    -----------
+
+    Two trees with num_keys keys each, picked at random from an interval twice as large (so about half of them are shared), are intersected once by testing each key of the first one against the second one and bulk loading the result, and once through BTree.intersection(). The total time of each approach is printed out in milliseconds.
+    """
+    rnd = Random(seed)
+    first = sorted(rnd.sample(range(2 * num_keys), num_keys))
+    second = sorted(rnd.sample(range(2 * num_keys), num_keys))
+
+    print("{:>8} {:>14} {:>14}".format("degree", "probe (ms)", "merge (ms)"))
+    for degree in degrees:
+        first_tree = BTree.bulk_load(degree, first)
+        second_tree = BTree.bulk_load(degree, second)
+        probe_time, _ = time_it(
+            lambda: BTree.bulk_load(
+                degree, [key for key in first_tree if key in second_tree]
+            )
+        )
+        merge_time, _ = time_it(first_tree.intersection, second_tree)
+        print(
+            "{:>8} {:>14.1f} {:>14.1f}".format(
+                degree, probe_time * 1e3, merge_time * 1e3
+            )
+        )
+
+
+def benchmark_bloom_filter(
+    num_keys=100000, num_probes=100000, degrees=[2, 8, 64], seed=0
+):
+    """Compares membership tests for absent keys with and without a Bloom filter.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_probes : int (default = 100000)
+
+        How many absent keys are looked up.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to pick the probes.
+
+    Methodology
+    -----------
+
+    Each tree holds the even numbers below 2 * num_keys and is probed with odd numbers of the same interval, which are all absent but fall between present keys, so every lookup without the filter goes down to a leaf page. The average cost per probe is printed out in microseconds without and with a Bloom filter (see BTree.use_bloom_filter()), along with the share of lookups the filter has short-circuited.
+    """
+    rnd = Random(seed)
+    keys = list(range(0, 2 * num_keys, 2))
+    probes = [2 * rnd.randrange(num_keys) + 1 for _ in range(num_probes)]
+
+    print(
+        "{:>8} {:>14} {:>14} {:>14}".format(
+            "degree", "plain (us)", "bloom (us)", "short-circuit"
+        )
+    )
+    for degree in degrees:
+        tree = BTree.bulk_load(degree, keys)
+        plain_time, _ = time_it(lambda: [probe in tree for probe in probes])
+        tree.use_bloom_filter(0.01)
+        bloom_time, _ = time_it(lambda: [probe in tree for probe in probes])
+        print(
+            "{:>8} {:>14.2f} {:>14.2f} {:>14.3f}".format(
+                degree,
+                plain_time / num_probes * 1e6,
+                bloom_time / num_probes * 1e6,
+                tree.bloom_filter.get_stats()["short_circuit_rate"],
+            )
+        )
+
+
+def benchmark_cursor(
+    num_keys=100000, num_probes=100000, degrees=[2, 8, 64], seed=0
+):
+    """Compares clustered lookups through BTree.find() against Cursor.seek(), and a full scan through Cursor.next().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_probes : int (default = 100000)
+
+        How many keys are looked up.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to pick the probes.
+
+    Methodology
+    -----------
+
+    The probes follow a random walk over the keys, each one landing at most 8 keys away from the previous one, as in lookups with strong locality. The average cost per probe is printed out in microseconds for BTree.find() and for a single cursor that searches from its previous position, along with the average cost of each step of a full forward scan through Cursor.next().
+    """
+    rnd = Random(seed)
+    keys = list(range(num_keys))
+    probes = []
+    position = num_keys // 2
+    for _ in range(num_probes):
+        position = min(max(position + rnd.randint(-8, 8), 0), num_keys - 1)
+        probes.append(position)
+
+    print(
+        "{:>8} {:>14} {:>14} {:>14}".format(
+            "degree", "find (us)", "seek (us)", "next (us)"
+        )
+    )
+    for degree in degrees:
+        tree = BTree.bulk_load(degree, keys)
+        find_time, _ = time_it(lambda: [tree.find(probe) for probe in probes])
+        cursor = tree.cursor()
+        seek_time, _ = time_it(lambda: [cursor.seek(probe) for probe in probes])
+        cursor = tree.cursor()
+        next_time, _ = time_it(lambda: [cursor.next() for _ in range(num_keys)])
+        print(
+            "{:>8} {:>14.2f} {:>14.2f} {:>14.2f}".format(
+                degree,
+                find_time / num_probes * 1e6,
+                seek_time / num_probes * 1e6,
+                next_time / num_keys * 1e6,
+            )
+        )
+
+
+def benchmark_stats(num_keys=100000, num_calls=100, degrees=[2, 8, 64], seed=0):
+    """Compares BTree.stats() against counting the pages of every level from scratch.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_calls : int (default = 100)
+
+        How many times each report is taken.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    Each tree is built by inserting the keys in random order and then removing half of them, so that its counters have gone through plenty of splits and merges. The average cost per report is printed out in microseconds for BTree.stats(), which reads the counters, and for BTree.recount_levels(), which visits every page, along with the height and fill factor reported.
+    """
+    rnd = Random(seed)
+    keys = list(range(num_keys))
+    rnd.shuffle(keys)
+
+    print(
+        "{:>8} {:>8} {:>8} {:>14} {:>14}".format(
+            "degree", "height", "fill", "stats (us)", "recount (us)"
+        )
+    )
+    for degree in degrees:
+        tree = BTree(degree)
+        tree.insert(keys)
+        tree.remove(keys[: num_keys // 2])
+        stats_time, _ = time_it(lambda: [tree.stats() for _ in range(num_calls)])
+        recount_time, _ = time_it(
+            lambda: [tree.recount_levels() for _ in range(num_calls)]
+        )
+        stats = tree.stats()
+        print(
+            "{:>8} {:>8} {:>8.2f} {:>14.2f} {:>14.2f}".format(
+                degree,
+                stats["height"],
+                stats["fill_factor"],
+                stats_time / num_calls * 1e6,
+                recount_time / num_calls * 1e6,
+            )
+        )
+
+
+def measure_memory(function):
+    """Measures how much memory the result of a function keeps allocated.
+
+    Parameters
+    ----------
+
+    function : callable
+
+        The function to be called, without arguments.
+
+    Returns
+    -------
+
+    tuple : (num_bytes, result)
+
+        num_bytes : int
+
+            How many bytes allocated during the call are still allocated after it, as traced by tracemalloc.
+
+        result : object
+
+            Whatever the function returned, which keeps its memory alive.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        num_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return (num_bytes, result)
+
+
+def benchmark_memory(num_keys=100000, degrees=[2, 8, 64], seed=0):
+    """Compares the memory taken per key by trees whose pages keep their keys in lists against trees whose pages keep them in arrays.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    Each tree is built by inserting the keys in random order, which leaves its pages about 70% full, as they usually are. The keys are created inside the measured call, so that the int and float objects held by the lists of the pages are counted as well, while the ones that only passed through the arrays are freed. The int keys are large enough not to be shared small ints. The number of bytes still allocated per key is printed out for int and float keys, stored in lists (key_type=None) and in arrays (key_type=int or float).
+    """
+    rnd = Random(seed)
+    order = list(range(num_keys))
+    rnd.shuffle(order)
+    key_makers = {int: lambda key: key * 1000003, float: lambda key: key + 0.5}
+
+    def build(degree, key_type, make_key):
+        tree = BTree(degree, key_type=key_type)
+        tree.insert([make_key(key) for key in order])
+        return tree
+
+    print(
+        "{:>8} {:>8} {:>16} {:>16}".format(
+            "degree", "type", "list (B/key)", "array (B/key)"
+        )
+    )
+    for degree in degrees:
+        for key_type, make_key in key_makers.items():
+            row = []
+            for tree_key_type in [None, key_type]:
+                num_bytes, tree = measure_memory(
+                    lambda: build(degree, tree_key_type, make_key)
+                )
+                row.append(num_bytes / num_keys)
+            print(
+                "{:>8} {:>8} {:>16.1f} {:>16.1f}".format(
+                    degree, key_type.__name__, *row
+                )
+            )
+
+
+def benchmark_prefix_keys(
+    num_keys=100000, num_probes=100000, degrees=[2, 8, 64], seed=0
+):
+    """Compares str trees whose pages keep full keys in lists against trees whose pages keep the shared prefix of their keys only once.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_probes : int (default = 100000)
+
+        How many keys are looked up.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys and pick the probes.
+
+    Methodology
+    -----------
+
+    The keys are file paths sharing long prefixes, such as "/srv/data/projects/group-07/user-0042/file-000123.txt", inserted in random order. As in benchmark_memory(), they are created inside the measured call, so the bytes per key printed out include the str objects held by the pages. The average cost of BTree.find() is printed out in microseconds as well, for key_type=None and key_type=str.
+    """
+    rnd = Random(seed)
+    order = list(range(num_keys))
+    rnd.shuffle(order)
+    probes = [
+        "/srv/data/projects/group-{:02}/user-{:04}/file-{:06}.txt".format(
+            key % 16, key % 1000, key
+        )
+        for key in rnd.choices(order, k=num_probes)
+    ]
+
+    def build(degree, key_type):
+        tree = BTree(degree, key_type=key_type)
+        tree.insert(
+            [
+                "/srv/data/projects/group-{:02}/user-{:04}/file-{:06}.txt".format(
+                    key % 16, key % 1000, key
+                )
+                for key in order
+            ]
+        )
+        return tree
+
+    print(
+        "{:>8} {:>14} {:>14} {:>14} {:>14}".format(
+            "degree", "list (B/key)", "prefix (B/key)", "list (us)", "prefix (us)"
+        )
+    )
+    for degree in degrees:
+        row = []
+        for key_type in [None, str]:
+            num_bytes, tree = measure_memory(lambda: build(degree, key_type))
+            find_time, _ = time_it(lambda: [tree.find(probe) for probe in probes])
+            row.append((num_bytes / num_keys, find_time / num_probes * 1e6))
+        print(
+            "{:>8} {:>14.1f} {:>14.1f} {:>14.2f} {:>14.2f}".format(
+                degree, row[0][0], row[1][0], row[0][1], row[1][1]
+            )
+        )
+
+
+def benchmark_prefix_scan(
+    num_keys=100000, num_queries=1000, degrees=[2, 8, 64], seed=0
+):
+    """Compares autocomplete queries answered by BTree.prefix_scan() and BTree.count_prefix() against filtering every element with str.startswith().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys each tree holds.
+
+    num_queries : int (default = 1000)
+
+        How many prefixes are queried.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to generate the keys and pick the prefixes.
+
+    Methodology
+    -----------
+
+    The keys are random lowercase words of 4 to 12 letters, and each query is the first 3 letters of one of them, asking for the first 10 matches, as an autocomplete box would. The average cost per query is printed out in microseconds for a full scan that filters with str.startswith() (only for the first degree, since it does not depend on it), for BTree.prefix_scan() with limit=10 and for BTree.count_prefix().
+    """
+    rnd = Random(seed)
+    keys = set()
+    while len(keys) < num_keys:
+        keys.add(
+            "".join(
+                rnd.choice("abcdefghijklmnopqrstuvwxyz")
+                for _ in range(rnd.randint(4, 12))
+            )
+        )
+    keys = sorted(keys)
+    prefixes = [key[:3] for key in rnd.choices(keys, k=num_queries)]
+
+    tree = BTree.bulk_load(degrees[0], keys)
+    filter_time, _ = time_it(
+        lambda: [
+            [key for key in tree if key.startswith(prefix)][:10]
+            for prefix in prefixes[:10]
+        ]
+    )
+    print("full scan: {:.2f} us".format(filter_time / 10 * 1e6))
+
+    print("{:>8} {:>14} {:>14}".format("degree", "scan (us)", "count (us)"))
+    for degree in degrees:
+        tree = BTree.bulk_load(degree, keys)
+        scan_time, _ = time_it(
+            lambda: [list(tree.prefix_scan(prefix, 10)) for prefix in prefixes]
+        )
+        count_time, _ = time_it(
+            lambda: [tree.count_prefix(prefix) for prefix in prefixes]
+        )
+        print(
+            "{:>8} {:>14.2f} {:>14.2f}".format(
+                degree,
+                scan_time / num_queries * 1e6,
+                count_time / num_queries * 1e6,
+            )
+        )
+
+
+def benchmark_streaming_insert(num_keys=100000, degrees=[2, 8, 64], seed=0):
+    """Compares the memory and time taken to insert the keys of a generator, streamed one at a time, against materializing them in a list first, and against reading them from a file with BTree.insert_from_file().
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys are inserted.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    The memory of the tree itself is the same in every case, so what is measured is the transient memory, that is, the peak traced by tracemalloc during the call minus what is still allocated after it. Materializing the input, as BTree.insert() used to do, keeps every key of the input alive until the last one is inserted, while streaming it only keeps the current one. The keys are written to a temporary file, one per line, and loaded with BTree.insert_from_file() as well, whose transient memory is bounded by its chunk size. The transient memory is printed out in bytes per key, followed by the time taken in seconds.
+    """
+    rnd = Random(seed)
+    order = list(range(num_keys))
+    rnd.shuffle(order)
+
+    def measure_transient(function):
+        tracemalloc.start()
+        try:
+            start = perf_counter()
+            function()
+            elapsed = perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return ((peak - current) / num_keys, elapsed)
+
+    with TemporaryDirectory() as directory:
+        file_path = os_path.join(directory, "keys.txt")
+        with open(file_path, "w") as file:
+            file.writelines("{}\n".format(key * 1000003) for key in order)
+
+        print(
+            "{:>8} {:>16} {:>16} {:>16}".format(
+                "degree", "list (B/key, s)", "stream (B/key, s)", "file (B/key, s)"
+            )
+        )
+        for degree in degrees:
+            row = []
+            for function in [
+                lambda tree: tree.insert(list(key * 1000003 for key in order)),
+                lambda tree: tree.insert(key * 1000003 for key in order),
+                lambda tree: tree.insert_from_file(
+                    file_path, parse=int, chunk_size=10000
+                ),
+            ]:
+                tree = BTree(degree)
+                row.append(measure_transient(lambda: function(tree)))
+            print(
+                "{:>8} {:>16} {:>16} {:>16}".format(
+                    degree,
+                    *("{:.1f}, {:.2f}".format(*cell) for cell in row),
+                )
+            )
+
+
+def benchmark_snapshot(num_keys=100000, degrees=[2, 8, 64], seed=0):
+    """Compares restoring a tree from a snapshot written by BTree.save() against rebuilding it through BTree.insert() and against pickling it.
+
+    Parameters
+    ----------
+
+    num_keys : int (default = 100000)
+
+        How many keys the tree holds.
+
+    degrees : list (default = [2, 8, 64])
+
+        The min_num_keys values to be benchmarked.
+
+    seed : int (default = 0)
+
+        The seed used to shuffle the keys.
+
+    Methodology
+    -----------
+
+    Each tree is built by inserting the keys in random order. The time taken to rebuild it the same way is compared with the time taken by BTree.save() and BTree.load(), and by pickle.dump() and pickle.load() through a file, for int keys stored in lists and in arrays (key_type=int). The times are printed out in seconds, along with the size of each file in bytes per key.
+    """
+    rnd = Random(seed)
+    order = [key * 1000003 for key in range(num_keys)]
+    rnd.shuffle(order)
+
+    print(
+        "{:>8} {:>8} {:>10} {:>10} {:>10} {:>12} {:>12} {:>12}".format(
+            "degree",
+            "type",
+            "insert",
+            "save",
+            "load",
+            "pickle",
+            "unpickle",
+            "B/key (s/p)",
+        )
+    )
+    with TemporaryDirectory() as directory:
+        snapshot_path = os_path.join(directory, "tree.snapshot")
+        pickle_path = os_path.join(directory, "tree.pickle")
+        for degree in degrees:
+            for key_type in [None, int]:
+                insert_time, tree = time_it(
+                    lambda: BTree(degree, order, key_type=key_type)
+                )
+                save_time, _ = time_it(tree.save, snapshot_path)
+                load_time, _ = time_it(BTree.load, snapshot_path)
+
+                def dump():
+                    with open(pickle_path, "wb") as file:
+                        pickle.dump(tree, file, pickle.HIGHEST_PROTOCOL)
+
+                def undump():
+                    with open(pickle_path, "rb") as file:
+                        return pickle.load(file)
+
+                pickle_time, _ = time_it(dump)
+                unpickle_time, _ = time_it(undump)
+                print(
+                    "{:>8} {:>8} {:>10.3f} {:>10.3f} {:>10.3f} {:>12.3f} "
+                    "{:>12.3f} {:>12}".format(
+                        degree,
+                        "list" if key_type is None else "array",
+                        insert_time,
+                        save_time,
+                        load_time,
+                        pickle_time,
+                        unpickle_time,
+                        "{:.1f}/{:.1f}".format(
+                            os_path.getsize(snapshot_path) / num_keys,
+                            os_path.getsize(pickle_path) / num_keys,
+                        ),
+                    )
+                )
+
+
+if __name__ == "__main__":
+    benchmark_find_insert()
+    benchmark_bulk_load()
+    benchmark_buffer_pool()
+    benchmark_scans()
+    benchmark_restructuring()
+    benchmark_b_star()
+    benchmark_insert_many()
+    benchmark_find_many()
+    benchmark_remove_range()
+    benchmark_set_algebra()
+    benchmark_bloom_filter()
+    benchmark_cursor()
+    benchmark_stats()
+    benchmark_memory()
+    benchmark_prefix_keys()
+    benchmark_prefix_scan()
+    benchmark_streaming_insert()
+    benchmark_snapshot()
@@ -0,0 +1,528 @@
+from bisect import bisect_left, bisect_right
+
+from btree.helper import *
+from btree.BTree import *
+from btree.LeafPage import *
+from btree.Page import *
+
+
+class BPlusTree:
+    """The B+Tree: a B-Tree variant that keeps every key in linked leaf pages."""
+
+    def __init__(self, min_num_keys, *args, internal_min_num_keys=None):
+        """The BPlusTree class constructor.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        min_num_keys : int
+
+            The degree of the leaf pages, which hold between min_num_keys and 2 * min_num_keys keys.
+
+        *args : list
+
+            The elements to be inserted. Any further treatment and measures shall be taken by BPlusTree.insert().
+
+        internal_min_num_keys : int, None (default = None)
+
+            The degree of the internal pages. If None, 2 * min_num_keys is used: internal pages only hold separators (which are never returned by searches), so they can afford a larger fan-out than the leaves.
+
+        Returns
+        -------
+
+        BPlusTree
+
+            A BPlusTree object containing the values from *args.
+
+        Methodology
+        -----------
+
+        The tree starts as a single LeafPage object, which is the root and both the first and the last leaf of the tree. Further elements are inserted through BPlusTree.insert().
+        """
+        if internal_min_num_keys is None:
+            internal_min_num_keys = 2 * min_num_keys
+
+        self.min_num_keys = min_num_keys
+        self.internal_min_num_keys = internal_min_num_keys
+        self.root = LeafPage(min_num_keys, self)
+        self.first_leaf = self.root
+        self.last_leaf = self.root
+        self.num_keys = 0
+
+        self.insert(*args)
+
+    def insert(self, *args):
+        """Inserts any amount of items into the BPlusTree.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        *args : list
+
+            The elements to be inserted, merged lazily just like in BTree.insert().
+
+        Methodology
+        -----------
+
+        Each element is checked just like in BTree.insert(). Then, BPlusTree.find_path() descends to the leaf where the element belongs, the element is inserted in it and, if the leaf overflows, BPlusTree.split() takes care of it, going up the recorded path as far as needed.
+        """
+        for arg in iterate_merged(args):
+            check_type(arg)
+            path, leaf = self.find_path(arg)
+            if arg in leaf:
+                raise ValueError("The value {} is already in the B+Tree.".format(arg))
+            leaf.insert(arg, will_raise=False)
+            self.num_keys += 1
+
+            if len(leaf) > leaf.max_num_keys:
+                self.split(leaf, path)
+
+    def find_path(self, element):
+        """Descends from the root to the leaf page where an element is expected to be.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be searched for.
+
+        Returns
+        -------
+
+        tuple : (path, leaf)
+
+            path : list
+
+                The (page, index) pairs of the internal pages visited, from the root down, where index is the position of the descendent page that has been followed.
+
+            leaf : LeafPage
+
+                The leaf page in which the element is (or would be) stored.
+
+        Methodology
+        -----------
+
+        Each separator of an internal page is the smallest key of the subtree at its right, so the descendent page to be followed is the one given by bisect_right().
+        """
+        path = []
+        page_pointer = self.root
+        while page_pointer.descendent_pages:
+            index = bisect_right(page_pointer.keys, element)
+            path.append((page_pointer, index))
+            page_pointer = page_pointer.descendent_pages[index]
+        return (path, page_pointer)
+
+    def find(self, element):
+        """Finds an element in the BPlusTree object.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be found.
+
+        Returns
+        -------
+
+        tuple : (in_tree, page_pointer, page_index)
+
+            The same as BTree.find(), except that page_pointer is always a leaf page.
+        """
+        _, leaf = self.find_path(element)
+        in_page, index = leaf.search(element)
+        return (in_page, leaf, index if in_page else -1)
+
+    def split(self, page, path):
+        """Splits an overflowing page, inserting the new page in its parent.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        page : Page
+
+            The overflowing page.
+
+        path : list
+
+            The path from the root to the page, as returned by BPlusTree.find_path().
+
+        Methodology
+        -----------
+
+        A leaf is split in two, and the first key of the right half is copied up to the parent as a separator, while the new leaf is linked between the original one and its next leaf. An internal page is split around its middle key, which is moved up to the parent. If the parent overflows as well, it is split in the same way, and if the root is split, a new root is created above it.
+        """
+        while len(page) > page.max_num_keys:
+            middle_index = len(page) // 2
+            if page.is_leaf():
+                right_page = LeafPage(self.min_num_keys, self)
+                right_page.keys = page.keys[middle_index:]
+                del page.keys[middle_index:]
+                separator = right_page[0]
+
+                right_page.previous_page = page
+                right_page.next_page = page.next_page
+                if page.next_page is None:
+                    self.last_leaf = right_page
+                else:
+                    page.next_page.previous_page = right_page
+                page.next_page = right_page
+            else:
+                right_page = Page(self.internal_min_num_keys, self)
+                separator = page[middle_index]
+                right_page.keys = page.keys[middle_index + 1 :]
+                right_page.descendent_pages = page.descendent_pages[middle_index + 1 :]
+                del page.keys[middle_index:]
+                del page.descendent_pages[middle_index + 1 :]
+
+            if not path:
+                self.root = Page(self.internal_min_num_keys, self)
+                self.root.keys = [separator]
+                self.root.descendent_pages = [page, right_page]
+                return
+
+            page, index = path.pop()
+            page.keys.insert(index, separator)
+            page.descendent_pages.insert(index + 1, right_page)
+
+    def remove(self, *args):
+        """Removes any amount of items of the BPlusTree object.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        *args : list
+
+            The elements to be removed, merged lazily just like in BTree.insert(). A ValueError is raised if any of them is not in the tree.
+
+        Methodology
+        -----------
+
+        The element is removed from its leaf and, if the leaf underflows, BPlusTree.rebalance() fixes it. Separators equal to removed keys may remain in internal pages, since they still split the key space correctly.
+        """
+        for arg in iterate_merged(args):
+            path, leaf = self.find_path(arg)
+            if arg not in leaf:
+                raise ValueError("The value {} is not in this tree.".format(arg))
+            leaf.remove(arg, will_raise=False)
+            self.num_keys -= 1
+
+            self.rebalance(leaf, path)
+
+    def rebalance(self, page, path):
+        """Fixes an underflowing page by borrowing from or merging with a sibling.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        page : Page
+
+            The page that has just lost a key.
+
+        path : list
+
+            The path from the root to the page, as returned by BPlusTree.find_path().
+
+        Methodology
+        -----------
+
+        If a sibling (under the same parent) has keys to spare, one key is borrowed from it through BPlusTree.borrow_left() or BPlusTree.borrow_right(). Otherwise, the page is merged with a sibling through BPlusTree.merge(), which takes a separator away from the parent, so the parent is checked next. If the root ends up with no keys, its only descendent becomes the new root.
+        """
+        while path and len(page) < page.min_num_keys:
+            parent_page, index = path.pop()
+            left_page = parent_page.descendent_pages[index - 1] if index > 0 else None
+            right_page = (
+                parent_page.descendent_pages[index + 1]
+                if index < len(parent_page)
+                else None
+            )
+
+            if left_page is not None and len(left_page) > left_page.min_num_keys:
+                self.borrow_left(page, left_page, parent_page, index)
+                return
+            if right_page is not None and len(right_page) > right_page.min_num_keys:
+                self.borrow_right(page, right_page, parent_page, index)
+                return
+
+            if left_page is not None:
+                self.merge(left_page, page, parent_page, index - 1)
+            else:
+                self.merge(page, right_page, parent_page, index)
+            page = parent_page
+
+        if len(self.root) == 0 and self.root.descendent_pages:
+            self.root = self.root.descendent_pages[0]
+
+    def borrow_left(self, page, left_page, parent_page, index):
+        """Moves the last key of the left sibling into a page.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        page : Page
+
+            The page that borrows a key.
+
+        left_page : Page
+
+            The sibling at the left of the page.
+
+        parent_page : Page
+
+            The parent of both pages.
+
+        index : int
+
+            The index of the page under parent_page.descendent_pages.
+
+        Methodology
+        -----------
+
+        For leaves, the key itself is moved and becomes the new separator between both pages. For internal pages, the key is rotated through the parent: the separator goes down to the page, the last key of the sibling goes up, and the last descendent of the sibling moves along.
+        """
+        if page.is_leaf():
+            page.keys.insert(0, left_page.keys.pop())
+            parent_page.keys[index - 1] = page[0]
+        else:
+            page.keys.insert(0, parent_page[index - 1])
+            parent_page.keys[index - 1] = left_page.keys.pop()
+            page.descendent_pages.insert(0, left_page.descendent_pages.pop())
+
+    def borrow_right(self, page, right_page, parent_page, index):
+        """Moves the first key of the right sibling into a page.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        page : Page
+
+            The page that borrows a key.
+
+        right_page : Page
+
+            The sibling at the right of the page.
+
+        parent_page : Page
+
+            The parent of both pages.
+
+        index : int
+
+            The index of the page under parent_page.descendent_pages.
+
+        Methodology
+        -----------
+
+        This method mirrors BPlusTree.borrow_left().
+        """
+        if page.is_leaf():
+            page.keys.append(right_page.keys.pop(0))
+            parent_page.keys[index] = right_page[0]
+        else:
+            page.keys.append(parent_page[index])
+            parent_page.keys[index] = right_page.keys.pop(0)
+            page.descendent_pages.append(right_page.descendent_pages.pop(0))
+
+    def merge(self, left_page, right_page, parent_page, separator_index):
+        """Merges two sibling pages into the left one.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        left_page : Page
+
+            The page that will remain.
+
+        right_page : Page
+
+            The page at its right, which will be discarded.
+
+        parent_page : Page
+
+            The parent of both pages.
+
+        separator_index : int
+
+            The index of the separator between both pages under parent_page.keys.
+
+        Methodology
+        -----------
+
+        Leaves are simply concatenated and the right leaf is unlinked from the list of leaves. Internal pages also take the separator down from the parent, between their keys. In both cases, the separator and the right page are removed from the parent.
+        """
+        if left_page.is_leaf():
+            left_page.keys.extend(right_page.keys)
+            left_page.next_page = right_page.next_page
+            if right_page.next_page is None:
+                self.last_leaf = left_page
+            else:
+                right_page.next_page.previous_page = left_page
+        else:
+            left_page.keys.append(parent_page[separator_index])
+            left_page.keys.extend(right_page.keys)
+            left_page.descendent_pages.extend(right_page.descendent_pages)
+
+        del parent_page.keys[separator_index]
+        del parent_page.descendent_pages[separator_index + 1]
+
+    def range(self, lo=None, hi=None, inclusive=True, reverse=False):
+        """Iterates lazily over the elements of the BPlusTree object that lie between two bounds.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        lo, hi, inclusive, reverse
+
+            The same as in BTree.range().
+
+        Returns
+        -------
+
+        generator
+
+            A generator yielding the elements of the range, one at a time.
+
+        Methodology
+        -----------
+
+        A single descent finds the leaf of the first bound. From there on, only the leaves are visited, following their next_page (or previous_page) links, so internal pages are never visited again. Leaves that lie entirely inside the range are yielded at once, without comparing each key against the bound.
+        """
+        if type(inclusive) is bool:
+            inclusive = (inclusive, inclusive)
+        include_lo, include_hi = inclusive
+        if reverse:
+            return self.iterate_backwards(lo, hi, include_lo, include_hi)
+        return self.iterate_forwards(lo, hi, include_lo, include_hi)
+
+    def iterate_forwards(self, lo, hi, include_lo, include_hi):
+        """Yields the elements between two bounds in crescent order.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        lo, hi, include_lo, include_hi
+
+            The same as in BTree.iterate_forwards().
+        """
+        if lo is None:
+            page_pointer, index = self.first_leaf, 0
+        else:
+            _, page_pointer = self.find_path(lo)
+            if include_lo:
+                index = bisect_left(page_pointer.keys, lo)
+            else:
+                index = bisect_right(page_pointer.keys, lo)
+
+        while page_pointer is not None:
+            keys = page_pointer.keys
+            if hi is None or (keys and keys[-1] < hi):
+                yield from keys[index:]
+            else:
+                for i in range(index, len(keys)):
+                    key = keys[i]
+                    if key > hi or (key == hi and not include_hi):
+                        return
+                    yield key
+            page_pointer, index = page_pointer.next_page, 0
+
+    def iterate_backwards(self, lo, hi, include_lo, include_hi):
+        """Yields the elements between two bounds in decrescent order.
+
+        Parameters
+        ----------
+
+        self : BPlusTree
+
+            A BPlusTree object.
+
+        lo, hi, include_lo, include_hi
+
+            The same as in BTree.iterate_backwards().
+        """
+        if hi is None:
+            page_pointer, index = self.last_leaf, len(self.last_leaf)
+        else:
+            _, page_pointer = self.find_path(hi)
+            if include_hi:
+                index = bisect_right(page_pointer.keys, hi)
+            else:
+                index = bisect_left(page_pointer.keys, hi)
+
+        while page_pointer is not None:
+            keys = page_pointer.keys
+            if lo is None or (keys and keys[0] > lo):
+                yield from reversed(keys[:index])
+            else:
+                for i in range(index - 1, -1, -1):
+                    key = keys[i]
+                    if key < lo or (key == lo and not include_lo):
+                        return
+                    yield key
+            page_pointer = page_pointer.previous_page
+            if page_pointer is not None:
+                index = len(page_pointer)
+
+    def __iter__(self):
+        """Iterates over the elements of the BPlusTree object in crescent order, leaf by leaf."""
+        return self.range()
+
+    def __reversed__(self):
+        """Iterates over the elements of the BPlusTree object in decrescent order, leaf by leaf."""
+        return self.range(reverse=True)
+
+    def __contains__(self, element):
+        """Tells if the BPlusTree object contains a given element, through BPlusTree.find()."""
+        return self.find(element)[0]
+
+    __repr__ = BTree.__repr__
+    get_depth = BTree.get_depth
+    get_pages_of_depth = BTree.get_pages_of_depth
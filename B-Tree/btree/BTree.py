@@ -1,13 +1,2896 @@
 # from btree.RootPage import *
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice, repeat
+from pickle import UnpicklingError, dumps, loads
+from struct import Struct, error as StructError
+from sys import byteorder
+
 from btree.helper import *
+from btree.BloomFilter import *
+from btree.Cursor import *
 from btree.Page import *
+from btree.PrefixPage import *
+
+
+SNAPSHOT_HEADER = Struct("<4sHIBBIQ")
+SNAPSHOT_LEVEL = Struct("<Q")
+SNAPSHOT_PAGE = Struct("<BI")
+SNAPSHOT_VALUES_LENGTH = Struct("<Q")
+SNAPSHOT_BLOCK_TYPES = {"q": KEY_BLOCK_INT, "d": KEY_BLOCK_FLOAT}
+
+
+class BTree:
+    """The B-Tree object per se."""
+
+    def __init__(
+        self, min_num_keys, *args, top_down=False, b_star=False, key_type=None
+    ):
+        """The BTree class constructor.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        min_num_keys : int
+
+            The degree of the tree. This value will be applied to all Page objects and objects of Page subclasses as well.
+
+        *args : list
+
+            The elements to be inserted. Any further treatment and measures shall be taken by BTree.insert().
+
+        top_down : bool (default = False)
+
+            Whether insertions and removals should be made in a single pass from the root down, through BTree.insert_top_down() and BTree.remove_top_down(), instead of descending first and restructuring pages on the way back up.
+
+        b_star : bool (default = False)
+
+            Whether to follow the B*-tree policy: an overflowing page gives keys to an adjacent page with room instead of being split, and two full pages are split into three (see BTree.redistribute()), while an underflowing page borrows keys from adjacent internal pages as well as from leaf ones (see BTree.rebalance()). Pages end up about 2/3 full instead of 1/2, so the tree is smaller and splits and merges are rarer. It cannot be combined with top_down.
+
+        key_type : type, None (default = None)
+
+            If int or float, every key must be of exactly that type, and the keys of each page are stored in an array of signed 64-bit integers (or doubles) instead of a list (see BTree.create_keys()). If str, every key must be a str object, and each page stores the prefix its keys share only once (see PrefixPage). If None, any of SUPPORTED_TYPES may be stored.
+
+        Returns
+        -------
+
+        BTree
+
+            A BTree object containing the values from *args and the degree stated in min_num_keys.
+
+        Methodology
+        -----------
+
+        This constructor initializes the BTree object, which in turn initializes a Page object (through BTree.create_page()) to be its root attribute.
+
+        If there are any additional arguments under *args, they will be inserted sequentially in the BTree object through Btree.insert().
+
+        Besides the number of keys, the BTree object keeps how many pages and keys each level holds, under self.level_num_pages and self.level_num_keys (from the leaves up), which are updated by every method that moves keys between levels (see BTree.stats()).
+
+        In top-down mode, pages may hold up to 2 * min_num_keys + 1 keys (instead of 2 * min_num_keys), so that a full page can be split into two valid halves before anything is pushed into it, and two pages with min_num_keys keys can be merged with the key between them. Every level is then visited exactly once per operation, which spares the second, upward pass of the default mode (and the page accesses it implies for a DiskBTree).
+        """
+        if top_down and b_star:
+            raise ValueError("The top-down mode does not support the B* policy.")
+        if key_type is not None and key_type not in SUPPORTED_TYPES:
+            raise ValueError("The key type must be one of SUPPORTED_TYPES.")
+        self.min_num_keys = min_num_keys
+        self.top_down = top_down
+        self.b_star = b_star
+        self.key_type = key_type
+        self.key_typecode = KEY_TYPECODES.get(key_type)
+        self.root = self.create_page()
+        self.num_keys = 0
+        self.level_num_pages = [1]
+        self.level_num_keys = [0]
+        self.bloom_filter = None
+
+        self.insert(*args)
+
+    def create_page(self):
+        """Creates a new, empty Page object for the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        Returns
+        -------
+
+        Page
+
+            The newly-created Page object.
+
+        Methodology
+        -----------
+
+        Every page of the tree is created through this method, so that subclasses (such as DiskBTree) can decide which kind of Page object backs them. Trees of str keys get PrefixPage objects, and trees of int or float keys get pages whose keys are held in an array (see BTree.create_keys()). In top-down mode, the page may hold one more key (see BTree.__init__()).
+        """
+        if self.key_type is str:
+            page = PrefixPage(self.min_num_keys, self)
+        else:
+            page = Page(self.min_num_keys, self)
+        if self.top_down:
+            page.max_num_keys += 1
+        if self.key_typecode is not None:
+            page.keys = array(self.key_typecode)
+        return page
+
+    def create_keys(self, keys=()):
+        """Creates the container that holds the keys of a page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        keys : iterable (default = ())
+
+            The keys to be held, in crescent order.
+
+        Returns
+        -------
+
+        list, array
+
+            A list of the keys or, if the BTree object has a key type (see BTree.__init__()), an array of them (or, for str keys, a PrefixKeys object).
+
+        Methodology
+        -----------
+
+        A list holds a pointer to a boxed int or float object for each key, which takes about 36 bytes per key, while an array stores the raw 8-byte values. Arrays support the same slicing, concatenation, insertion, removal and bisection as lists, so the rest of the tree handles both alike. Whenever keys gathered in a list (such as separators) must become the keys of a page, they go through this method, so that no page of a typed tree ends up with a list. Reading a key from an array creates a new int or float object, though, which makes searches somewhat slower: the arrays trade some speed for memory, which is why they are only used when a key type is given.
+        """
+        if self.key_type is None:
+            return list(keys)
+        if self.key_type is str:
+            return PrefixKeys(keys)
+        return array(self.key_typecode, keys)
+
+    def check_key(self, element):
+        """Raises an exception if an element cannot be inserted into the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : object
+
+            The element to be checked.
+
+        Methodology
+        -----------
+
+        The element must be of SUPPORTED_TYPES, which is checked through check_type(). If the BTree object has a key type, a TypeError is raised for elements of any other type (including int elements for a float tree, which would come back as float objects), and a ValueError for int elements that do not fit in a signed 64-bit integer.
+        """
+        check_type(element)
+        if self.key_type is None:
+            return
+        if type(element) is not self.key_type:
+            raise TypeError(
+                "This tree only holds keys of {}. Type of the argument: {}".format(
+                    self.key_type, type(element)
+                )
+            )
+        if self.key_type is int and not -(2**63) <= element < 2**63:
+            raise ValueError(
+                "The key {} does not fit in a 64-bit integer.".format(element)
+            )
+
+    def release_page(self, page):
+        """Tells the BTree object that a Page object is no longer part of it.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The Page object that has been discarded.
+
+        Methodology
+        -----------
+
+        Pages that are merged away or replaced are handed to this method. In memory there is nothing to be done, since the garbage collector takes care of them, but subclasses (such as DiskBTree) use it to reclaim the storage of the page.
+        """
+        pass
+
+    @classmethod
+    def bulk_load(cls, min_num_keys, iterable, fill_factor=1.0, **kwargs):
+        """Builds a BTree object from a sorted (or sortable) iterable, bottom-up.
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The BTree class (or subclass) to be instantiated.
+
+        min_num_keys : int
+
+            The degree of the tree.
+
+        iterable : iterable
+
+            The elements to be stored in the tree. If they are not in crescent order already, they will be sorted first.
+
+        fill_factor : float (default = 1.0)
+
+            How full each page should be, as a fraction of max_num_keys. The resulting number of keys per page is never below min_num_keys, so values under 0.5 behave as 0.5.
+
+        **kwargs : dict
+
+            Further keyworded arguments to be given to the constructor of cls.
+
+        Returns
+        -------
+
+        BTree
+
+            A BTree object containing the given elements.
+
+        Methodology
+        -----------
+
+        Instead of calling BTree.insert() for each element, this method sorts the elements (if needed) and hands them to BTree.pack(), which packs them directly into leaf pages, leaving one element out between every two consecutive leaves. These left out elements are the keys of the level above, which is packed in the same way, and so on until a level fits in a single page, which becomes the root. The page sizes of each level are decided by get_page_sizes(), so every page respects the B-Tree rules, and the whole process takes linear time when the elements are already sorted.
+        """
+        tree = cls(min_num_keys, **kwargs)
+        keys = list(iterable)
+        for key in keys:
+            tree.check_key(key)
+        if any(keys[i] >= keys[i + 1] for i in range(len(keys) - 1)):
+            keys.sort()
+            for i in range(len(keys) - 1):
+                if keys[i] == keys[i + 1]:
+                    raise ValueError(
+                        "The value {} is already in the B-Tree.".format(keys[i])
+                    )
+
+        tree.pack(keys, fill_factor=fill_factor)
+        return tree
+
+    def pack(self, keys, values=None, fill_factor=1.0):
+        """Fills an empty BTree object with sorted keys, building its pages bottom-up.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            An empty BTree object.
+
+        keys : list
+
+            The keys to be stored, in strictly crescent order.
+
+        values : list, None (default = None)
+
+            The values of the keys, side by side with them, if the BTree object holds values.
+
+        fill_factor : float (default = 1.0)
+
+            How full each page should be, as in BTree.bulk_load().
+
+        Methodology
+        -----------
+
+        This method does the actual work of BTree.bulk_load(), which is described there. Values, if any, are sliced exactly like the keys. Since the pages are built one level at a time, the per-level counters of BTree.stats() are set along the way.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("The fill factor must be in the (0, 1] interval.")
+        if self.num_keys:
+            raise ValueError("Bulk loading needs an empty B-Tree.")
+
+        self.num_keys = len(keys)
+        min_num_keys = self.min_num_keys
+        max_num_keys = self.root.max_num_keys
+        target_num_keys = min(
+            max(int(round(fill_factor * max_num_keys)), min_num_keys), max_num_keys
+        )
+
+        descendents = []
+        self.level_num_pages = []
+        self.level_num_keys = []
+        while True:
+            sizes = get_page_sizes(
+                len(keys), min_num_keys, max_num_keys, target_num_keys
+            )
+            self.level_num_pages.append(len(sizes))
+            self.level_num_keys.append(sum(sizes))
+            if self.key_type is not None:
+                keys = self.create_keys(keys)
+            pages = []
+            separators = []
+            separator_values = []
+            key_index = 0
+            descendent_index = 0
+            for size in sizes:
+                page = self.create_page()
+                page.keys = keys[key_index : key_index + size]
+                if values is not None:
+                    page.values = values[key_index : key_index + size]
+                page.num_keys = size
+                key_index += size
+                if descendents:
+                    page.descendent_pages = descendents[
+                        descendent_index : descendent_index + size + 1
+                    ]
+                    descendent_index += size + 1
+                page.update_size()
+                pages.append(page)
+                if key_index < len(keys):
+                    separators.append(keys[key_index])
+                    if values is not None:
+                        separator_values.append(values[key_index])
+                    key_index += 1
+
+            if len(pages) == 1:
+                break
+            keys = separators
+            if values is not None:
+                values = separator_values
+            descendents = pages
+
+        self.release_page(self.root)
+        self.root = pages[0]
+        if self.bloom_filter is not None:
+            self.rebuild_bloom_filter()
+
+    def save(self, path):
+        """Writes a snapshot of the BTree object to a binary file, to be read back by BTree.load().
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : str
+
+            The path of the file. If it exists, it is overwritten.
+
+        Methodology
+        -----------
+
+        The file starts with a header holding SNAPSHOT_MAGIC, SNAPSHOT_VERSION, the degree, the mode (top_down and b_star) and whether the pages hold values, the key type (as its index under SNAPSHOT_KEY_TYPES), the height and the number of keys. The pages follow level by level, from the root down and from left to right, each level preceded by its number of pages. Each page is written as the kind of its key block and its number of keys, followed by the key block made by encode_keys(), just as in DiskPage.encode(), and, if the tree holds values, by the pickled list of its values and its length. Nothing else is needed: the descendent pages of a level are the pages of the level below, in order, and each page has one more of them than it has keys.
+
+        The pages are visited one level at a time, as in BTree.recount_levels(), and each level is written with a single call, so saving takes O(n) time without recursion. Pages are not pickled, since pickling follows the parent_tree attribute of every page back into the tree, and their keys are written as raw 64-bit integers, doubles or UTF-8 bytes whenever possible. The arrays of trees of int or float keys already hold the little-endian 64-bit values a key block is made of (on little-endian machines, which is almost all of them), so they are written as they are, without creating an int or float object for each key.
+        """
+        has_values = self.root.values is not None
+        flags = (
+            (SNAPSHOT_TOP_DOWN if self.top_down else 0)
+            | (SNAPSHOT_B_STAR if self.b_star else 0)
+            | (SNAPSHOT_VALUES if has_values else 0)
+        )
+        pages = [self.root]
+        levels = [pages]
+        while pages[0].descendent_pages:
+            pages = [
+                descendent for page in pages for descendent in page.descendent_pages
+            ]
+            levels.append(pages)
+
+        with open(path, "wb") as file:
+            file.write(
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC,
+                    SNAPSHOT_VERSION,
+                    self.min_num_keys,
+                    flags,
+                    SNAPSHOT_KEY_TYPES.index(self.key_type),
+                    len(levels),
+                    self.num_keys,
+                )
+            )
+            for pages in levels:
+                data = [SNAPSHOT_LEVEL.pack(len(pages))]
+                for page in pages:
+                    if self.key_typecode is not None and byteorder == "little":
+                        block_type = SNAPSHOT_BLOCK_TYPES[self.key_typecode]
+                        key_block = page.keys.tobytes()
+                    else:
+                        block_type, key_block = encode_keys(page.keys)
+                    data.append(SNAPSHOT_PAGE.pack(block_type, len(page.keys)))
+                    data.append(key_block)
+                    if has_values:
+                        encoded_values = dumps(list(page.values))
+                        data.append(SNAPSHOT_VALUES_LENGTH.pack(len(encoded_values)))
+                        data.append(encoded_values)
+                file.write(b"".join(data))
+
+    @classmethod
+    def load(cls, path):
+        """Builds a BTree object from a snapshot written by BTree.save().
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The BTree class (or subclass) to be instantiated.
+
+        path : str
+
+            The path of the snapshot.
+
+        Returns
+        -------
+
+        BTree
+
+            A BTree object with the degree, mode, key type and contents of the saved one.
+
+        Methodology
+        -----------
+
+        The whole file is read at once and the pages are rebuilt exactly as they were saved, level by level from the root down, through BTree.create_page() and BTree.create_keys(). Each page of a level takes the next len(page) + 1 pages of the level below as its descendent pages, so no key is compared, moved or rebalanced, and loading takes O(n) time, mostly spent decoding the key blocks. For trees of int or float keys, the key blocks are copied straight into the arrays of the pages (see BTree.save()), which takes about as long as reading the file. The sizes of the subtrees are then computed from the leaves up, and the per-level counters of BTree.stats() are set along the way.
+
+        A ValueError is raised if the file is not a snapshot, if its version is not SNAPSHOT_VERSION, or if it is cut short, which is checked before each block is read, so that no truncated block reaches decode_keys() or the unpickler. A snapshot of a tree that holds values can only be loaded by a class whose pages hold values (such as BTreeMap), while a snapshot without values loaded by such a class gives None as the value of every key, just like BTree.insert() does. The values are unpickled, so snapshots must only be loaded from trusted sources.
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("The file {} is not a B-Tree snapshot.".format(path))
+        magic, version, min_num_keys, flags, key_type_index, height, num_keys = (
+            SNAPSHOT_HEADER.unpack_from(data)
+        )
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("The file {} is not a B-Tree snapshot.".format(path))
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(
+                "The snapshot version {} is not supported (expected {}).".format(
+                    version, SNAPSHOT_VERSION
+                )
+            )
+
+        tree = cls(
+            min_num_keys,
+            top_down=bool(flags & SNAPSHOT_TOP_DOWN),
+            b_star=bool(flags & SNAPSHOT_B_STAR),
+            key_type=SNAPSHOT_KEY_TYPES[key_type_index],
+        )
+        has_values = bool(flags & SNAPSHOT_VALUES)
+        if has_values and tree.root.values is None:
+            raise ValueError(
+                "The snapshot holds values, which {} cannot hold.".format(cls.__name__)
+            )
+
+        offset = SNAPSHOT_HEADER.size
+        levels = []
+        try:
+            for _ in range(height):
+                (num_pages,) = SNAPSHOT_LEVEL.unpack_from(data, offset)
+                offset += SNAPSHOT_LEVEL.size
+                pages = []
+                for _ in range(num_pages):
+                    block_type, page_num_keys = SNAPSHOT_PAGE.unpack_from(
+                        data, offset
+                    )
+                    offset += SNAPSHOT_PAGE.size
+                    page = tree.create_page()
+                    if (
+                        tree.key_typecode is not None
+                        and block_type == SNAPSHOT_BLOCK_TYPES[tree.key_typecode]
+                        and byteorder == "little"
+                    ):
+                        keys = page.keys
+                        end = offset + keys.itemsize * page_num_keys
+                        if end > len(data):
+                            raise ValueError(
+                                "The snapshot {} is cut short.".format(path)
+                            )
+                        keys.frombytes(data[offset:end])
+                        offset = end
+                    else:
+                        keys, offset = decode_keys(
+                            data, offset, block_type, page_num_keys
+                        )
+                        if tree.key_type is not None:
+                            keys = tree.create_keys(keys)
+                    page.keys = keys
+                    page.num_keys = page_num_keys
+                    if has_values:
+                        (length,) = SNAPSHOT_VALUES_LENGTH.unpack_from(data, offset)
+                        offset += SNAPSHOT_VALUES_LENGTH.size
+                        if offset + length > len(data):
+                            raise ValueError(
+                                "The snapshot {} is cut short.".format(path)
+                            )
+                        try:
+                            page.values = loads(data[offset : offset + length])
+                        except (UnpicklingError, EOFError):
+                            raise ValueError(
+                                "The values of the snapshot {} cannot be "
+                                "unpickled.".format(path)
+                            )
+                        offset += length
+                    elif page.values is not None:
+                        page.values = [None] * page_num_keys
+                    pages.append(page)
+                if levels:
+                    descendent_index = 0
+                    for page in levels[-1]:
+                        page.descendent_pages = pages[
+                            descendent_index : descendent_index + len(page) + 1
+                        ]
+                        descendent_index += len(page) + 1
+                levels.append(pages)
+        except (StructError, IndexError, UnicodeDecodeError):
+            raise ValueError("The snapshot {} is cut short.".format(path))
+        if offset > len(data):
+            raise ValueError("The snapshot {} is cut short.".format(path))
+
+        for pages in reversed(levels):
+            for page in pages:
+                page.update_size()
+        tree.release_page(tree.root)
+        tree.root = levels[0][0]
+        tree.num_keys = num_keys
+        tree.level_num_pages = [len(pages) for pages in reversed(levels)]
+        tree.level_num_keys = [
+            sum(len(page) for page in pages) for pages in reversed(levels)
+        ]
+        return tree
+
+    def insert(self, *args):
+        """Inserts any amount of items into the BTree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        *args : list
+
+            The elements to be inserted. Iterables of any kind (lists, tuples, sets, ranges, generators, files and so on), nested as deep as needed, are merged as if they were an one-dimensional list, and each of their elements is inserted subsequently.
+
+        Methodology
+        -----------
+
+        The elements of *args are taken one at a time from iterate_merged(), so a generator is consumed as it is inserted, without ever holding all of its elements in memory. The method will verify if each item can be a key of the BTree object through BTree.check_key(): if not, a TypeError (or ValueError) will be raised, leaving the elements before it inserted.
+
+        Then, BTree.find_path() will be called to see if the element is already in the BTree object. If it is, a ValueError will be raised. Otherwise, BTree.insert_at() will insert the element into the leaf page at the end of the path BTree.find_path() returned. In top-down mode, BTree.insert_top_down() takes care of everything instead.
+        """
+        for arg in iterate_merged(args):
+            self.check_key(arg)
+            if self.top_down:
+                self.insert_top_down(arg)
+                continue
+            in_tree, path = self.find_path(arg)
+            if in_tree:
+                raise ValueError("The value {} is already in the B-Tree.".format(arg))
+            self.insert_at(path, arg)
+
+    def insert_at(self, path, element, value=None):
+        """Inserts an element into the leaf page at the end of a path, splitting pages as needed.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path to the leaf page where the element belongs, as returned by BTree.find_path() for an element that is not in the BTree object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be inserted.
+
+        value : object (default = None)
+
+            The value of the element, if the BTree object holds values.
+
+        Methodology
+        -----------
+
+        The element is inserted at the index the path ends with, the size of every page on the path is incremented through BTree.update_sizes() and, if the leaf page now has more keys than allowed, BTree.promote() is called with the path. The length is checked right after the insertion instead of having Page.insert() raise a DegreeOverflowError, since raising and catching an exception on every split is much slower, especially for small degrees.
+        """
+        page_pointer, index = path[-1]
+        page_pointer.insert_item(index, element, value)
+        self.update_sizes(path, 1)
+        self.update_leaf_count(1)
+        if len(page_pointer) > page_pointer.max_num_keys:
+            self.promote(path)
+        self.num_keys += 1
+        if self.bloom_filter is not None:
+            self.update_bloom_filter([element])
+
+    def insert_top_down(self, element, value=None, overwrite=False):
+        """Inserts an element in a single pass from the root down to a leaf page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be inserted.
+
+        value : object (default = None)
+
+            The value of the element, if the BTree object holds values.
+
+        overwrite : bool (default = False)
+
+            What to do if the element is already in the BTree object: if True, its value is replaced with the given one; if False, a ValueError is raised.
+
+        Returns
+        -------
+
+        bool
+
+            Whether the element has been inserted (False if it was already there and its value has been overwritten).
+
+        Methodology
+        -----------
+
+        This is the insertion of the top-down mode (see BTree.__init__()), as described by Cormen et al. Every full page met on the way down (including the root) is split through BTree.promote() before the descent goes through it, so its parent, which has just been visited, always has room for the middle key. The insertion in the leaf page therefore never causes a split that travels back up, and each level is visited exactly once. The sizes of the pages are incremented on the way down and restored if the element turns out to be in the BTree object already.
+        """
+        path = []
+        page_pointer = self.root
+        if len(page_pointer) >= page_pointer.max_num_keys:
+            self.promote([(page_pointer, 0)])
+
+        while True:
+            in_page, index = page_pointer.search(element)
+            if in_page:
+                self.update_sizes(path, -1)
+                if not overwrite:
+                    raise ValueError(
+                        "The value {} is already in the B-Tree.".format(element)
+                    )
+                page_pointer.set_item(index, element, value)
+                return False
+            if page_pointer.is_leaf():
+                break
+
+            descendent = page_pointer.descendent_pages[index]
+            if len(descendent) >= descendent.max_num_keys:
+                self.promote(path + [(page_pointer, index), (descendent, 0)])
+                continue
+            page_pointer.size += 1
+            path.append((page_pointer, index))
+            page_pointer = descendent
+
+        page_pointer.insert_item(index, element, value)
+        page_pointer.size += 1
+        self.update_leaf_count(1)
+        self.num_keys += 1
+        if self.bloom_filter is not None:
+            self.update_bloom_filter([element])
+        return True
+
+    def insert_many(self, iterable):
+        """Inserts a batch of elements, descending the BTree object once per leaf page instead of once per element.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        iterable : iterable
+
+            The elements to be inserted, in any order. A TypeError is raised if any of them is of an unsupported type, and a ValueError if any of them is repeated in the batch or is already in the BTree object.
+
+        Methodology
+        -----------
+
+        The batch is sorted first, so that the elements that belong in the same leaf page lie next to each other. Then, starting from the smallest element, BTree.insert_leaf_batch() descends to the leaf page where it belongs, takes every following element that also belongs there and merges all of them into that leaf page at once, splitting it (and its ancestors) only once. The next descent starts at the first element that has not been inserted yet, so a batch that lands in k leaf pages costs k descents, no matter how many elements it has.
+
+        A batch is always inserted bottom-up, whatever the mode of the BTree object.
+        """
+        elements = sorted(iterable)
+        for element in elements:
+            self.check_key(element)
+        for index in range(len(elements) - 1):
+            if elements[index] == elements[index + 1]:
+                raise ValueError(
+                    "The value {} is repeated in the batch.".format(elements[index])
+                )
+
+        start = 0
+        while start < len(elements):
+            start = self.insert_leaf_batch(elements, start)
+
+    def insert_leaf_batch(self, elements, start):
+        """Inserts the elements of a sorted batch that belong in the same leaf page as its first element.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        elements : list
+
+            The whole batch, sorted and without repeated elements.
+
+        start : int
+
+            The index of the first element of the batch that has not been inserted yet.
+
+        Returns
+        -------
+
+        int
+
+            The index of the first element of the batch that does not belong in that leaf page, from which BTree.insert_many() goes on.
+
+        Methodology
+        -----------
+
+        BTree.find_path() descends to the leaf page of elements[start]. The closest key above it in the pages of the path is the upper bound of the leaf page, so every element up to that bound (found by bisecting the batch) belongs there. A lone element is just handed to BTree.insert_at(). Otherwise, the elements are merged with the keys of the leaf page in a single pass, bisecting the keys of the leaf page for each element and copying the keys in between as slices, which raises a ValueError before changing anything if any of them is already there. Then the sizes of the pages on the path are updated once, and BTree.split() breaks the leaf page into as many pages as needed.
+        """
+        in_tree, path = self.find_path(elements[start])
+        if in_tree:
+            raise ValueError(
+                "The value {} is already in the B-Tree.".format(elements[start])
+            )
+
+        end = len(elements)
+        for page, index in reversed(path[:-1]):
+            if index < len(page):
+                end = bisect_left(elements, page[index], start)
+                break
+
+        if end - start == 1:
+            self.insert_at(path, elements[start])
+            return end
+
+        leaf_page = path[-1][0]
+        old_keys = leaf_page.keys
+        old_values = leaf_page.values
+        keys = []
+        values = None if old_values is None else []
+        key_index = 0
+        for element in elements[start:end]:
+            next_index = bisect_left(old_keys, element, key_index)
+            if next_index < len(old_keys) and old_keys[next_index] == element:
+                raise ValueError(
+                    "The value {} is already in the B-Tree.".format(element)
+                )
+            keys.extend(old_keys[key_index:next_index])
+            keys.append(element)
+            if values is not None:
+                values.extend(old_values[key_index:next_index])
+                values.append(None)
+            key_index = next_index
+        keys.extend(old_keys[key_index:])
+        if values is not None:
+            values.extend(old_values[key_index:])
+
+        leaf_page.keys = keys if self.key_type is None else self.create_keys(keys)
+        if values is not None:
+            leaf_page.values = values
+        leaf_page.num_keys = len(keys)
+        self.update_sizes(path, end - start)
+        self.update_leaf_count(end - start)
+        self.num_keys += end - start
+        if len(leaf_page) > leaf_page.max_num_keys:
+            self.split(path)
+        if self.bloom_filter is not None:
+            self.update_bloom_filter(elements[start:end])
+        return end
+
+    def insert_from_file(
+        self, path, parse=None, chunk_size=100000, encoding="utf-8"
+    ):
+        """Inserts the elements listed in a text file, one per line, reading the file in chunks.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : str
+
+            The path of the file.
+
+        parse : callable, None (default = None)
+
+            A function turning a line (without its line break) into an element, such as int or float. If None, each line is inserted as a str element. Blank lines are skipped.
+
+        chunk_size : int (default = 100000)
+
+            How many lines are read and inserted at a time.
+
+        encoding : str (default = "utf-8")
+
+            The encoding of the file.
+
+        Returns
+        -------
+
+        int
+
+            How many elements have been inserted.
+
+        Methodology
+        -----------
+
+        The file is read lazily, chunk_size lines at a time, and each chunk is parsed and handed to BTree.insert_many(), which inserts it one leaf page at a time. Only one chunk is held in memory at a time, so files much larger than the memory can be loaded, and the lines of each chunk that belong in the same leaf page are merged into it at once. Elements that are repeated, either within a chunk or across the file, raise a ValueError, just like in BTree.insert_many().
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive.")
+        num_inserted = 0
+        with open(path, encoding=encoding) as file:
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+                elements = []
+                for line in lines:
+                    line = line.rstrip("\r\n")
+                    if line.strip():
+                        elements.append(line if parse is None else parse(line))
+                self.insert_many(elements)
+                num_inserted += len(elements)
+        return num_inserted
+
+    def find(self, element):
+        """Finds an element in the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : Object
+
+            An object to be found in the BTree.
+
+        Returns
+        -------
+
+        tuple : (in_tree, page_pointer)
+
+            in_tree : bool
+
+                Tells if the item is in the BTree object.
+
+            page_pointer : Page
+
+                If in_tree == True, tells the page in which the element to be found is. Otherwise, tells the page in which the element was expected to be found.
+
+            page_index : int
+
+                The index in which the given element is stored in the page returned under page_pointer. If the element is not found, then the returned value will be -1.
+
+        Methodology
+        -----------
+
+        This method will begin its search at self.root, which will be the initial value of the page_pointer variable. Then, it will bisect the page_pointer Page object through Page.search(), which tells both if the given element is in it and, if not, which descendent page to visit next. If it is, it will return a tuple telling in the first element that it has been found (True), which is the page in which the element is stored in the second element (Page) and which is the index in which the element is stored (int). If it is not, the first element will be False, the Page returned will be the leaf page in which the method expected to find the element and the index returned will be -1.
+        """
+        page_pointer = self.root
+
+        while True:
+            in_page, index = page_pointer.search(element)
+            if in_page:
+                return (True, page_pointer, index)
+            elif page_pointer.descendent_pages:
+                page_pointer = page_pointer.descendent_pages[index]
+            else:
+                return (False, page_pointer, -1)
+
+    def find_path(self, element):
+        """Finds an element in the BTree object, recording the path from the root.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : SUPPORTED_TYPES
+
+            An element to be found in the BTree.
+
+        Returns
+        -------
+
+        tuple : (in_tree, path)
+
+            in_tree : bool
+
+                Tells if the element is in the BTree object.
+
+            path : list
+
+                A list of (page, index) tuples from the root down to the page where the search ended. For every page but the last, index tells which descendent page has been followed. For the last page, index is the index of the element under its keys if in_tree == True, and the index where it should be inserted otherwise (in which case the last page is a leaf).
+
+        Methodology
+        -----------
+
+        This method works just like BTree.find(), bisecting each page on the way down through Page.search(), but it keeps the index of every step. Since pages do not point to their parents, this path is what BTree.insert() and BTree.remove() use to reach the parent and the siblings of a page in O(1) while splitting, merging and borrowing.
+        """
+        path = []
+        page_pointer = self.root
+
+        while True:
+            in_page, index = page_pointer.search(element)
+            path.append((page_pointer, index))
+            if in_page:
+                return (True, path)
+            elif page_pointer.descendent_pages:
+                page_pointer = page_pointer.descendent_pages[index]
+            else:
+                return (False, path)
+
+    def cursor(self, element=None):
+        """Returns a Cursor object over the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : SUPPORTED_TYPES, None (default = None)
+
+            Where the cursor starts: on the element (or on the smallest element greater than it, through Cursor.seek()) or, if None, on the smallest element of the BTree object.
+
+        Returns
+        -------
+
+        Cursor
+
+            A Cursor object, which moves through Cursor.next() and Cursor.prev() in O(1) amortized steps and searches from its current position through Cursor.seek(), which suits lookups that land close to each other.
+        """
+        cursor = Cursor(self)
+        if element is None:
+            cursor.first()
+        else:
+            check_type(element)
+            cursor.seek(element)
+        return cursor
+
+    def find_many(self, iterable):
+        """Finds a batch of elements in the BTree object through a single traversal.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        iterable : iterable
+
+            The elements to be found, in any order. Repeated elements are allowed.
+
+        Returns
+        -------
+
+        list
+
+            A list holding, for each element and in the order they were given, the same (in_tree, page_pointer, page_index) tuple that BTree.find() would return for it.
+
+        Methodology
+        -----------
+
+        The elements are sorted (through the order of their positions, so the results can be put back in place) and handed to BTree.find_sorted(), which visits each page at most once for the whole batch. Since every run of elements it reports ends at the same page and index, a single tuple is created per run and shared by all of its elements.
+        """
+        elements = list(iterable)
+        order = sorted(range(len(elements)), key=elements.__getitem__)
+        probes = [elements[position] for position in order]
+
+        results = [None] * len(elements)
+        for start, end, in_tree, page_pointer, index in self.find_sorted(probes):
+            result = (in_tree, page_pointer, index)
+            for position in order[start:end]:
+                results[position] = result
+        return results
+
+    def contains_many(self, iterable):
+        """Tells, for each element of a batch, if it is in the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        iterable : iterable
+
+            The elements to be searched for, in any order. Repeated elements are allowed.
+
+        Returns
+        -------
+
+        bytearray
+
+            A bytearray holding, for each element (in the order they were given), 1 if it is in the BTree object and 0 otherwise. It takes one byte per element, instead of the 8-byte pointer per element of a list of bools, and its items are truthy or falsy just like bools.
+
+        Methodology
+        -----------
+
+        This works just like BTree.find_many(), but only the runs of elements that have been found matter: the result starts as all zeros and only their positions are set to 1, so no tuple is created per element. If the BTree object has a Bloom filter (see BTree.use_bloom_filter()), the elements it rules out are left out of the traversal altogether.
+        """
+        elements = list(iterable)
+        positions = range(len(elements))
+        if self.bloom_filter is not None:
+            positions = [
+                position
+                for position in positions
+                if self.bloom_filter.query(elements[position])
+            ]
+        order = sorted(positions, key=elements.__getitem__)
+        probes = [elements[position] for position in order]
+
+        results = bytearray(len(elements))
+        for start, end, in_tree, _, _ in self.find_sorted(probes):
+            if in_tree:
+                for position in order[start:end]:
+                    results[position] = 1
+            elif self.bloom_filter is not None:
+                self.bloom_filter.num_false_positives += end - start
+        return results
+
+    def find_sorted(self, elements):
+        """Finds a sorted batch of elements, sharing the descent between elements that go through the same pages.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        elements : list
+
+            The elements to be found, in crescent order. Repeated elements are allowed.
+
+        Returns
+        -------
+
+        generator
+
+            A generator yielding (start, end, in_tree, page_pointer, page_index) tuples, in crescent order of start. Each of them tells that every element under elements[start:end] gives the (in_tree, page_pointer, page_index) result of BTree.find(): either they are all equal to the key at page_index of page_pointer, or none of them is in the BTree object and page_pointer is the leaf page where they were expected to be found (with page_index = -1).
+
+        Methodology
+        -----------
+
+        Instead of descending from the root once per element, the traversal keeps a stack of (settled, run) tuples, starting with the root and the whole batch. A pending run is a (page, start, end) tuple, whose elements still have to be looked for under the page, while a settled run is a result tuple, ready to be yielded. At each page, the first pending element is bisected into the keys of the page: if it is equal to the key it lands on, bisecting the batch gives every element equal to that key, which are reported as found; otherwise, bisecting the batch with that key (the upper bound of the descendent page) gives every element that goes down the same descendent page, and they are pushed onto the stack together (or reported as not found if the page is a leaf). Runs that are already settled are pushed onto the same stack, in reverse order along with the pending ones, so that the results come out in crescent order. Each page is thus visited at most once per batch and the cost of a page is proportional to the number of runs it splits the batch into, not to the number of elements that go through it.
+        """
+        if not elements:
+            return
+
+        stack = [(False, (self.root, 0, len(elements)))]
+        while stack:
+            settled, run = stack.pop()
+            if settled:
+                yield run
+                continue
+
+            page_pointer, start, end = run
+            keys = page_pointer.keys
+            descendents = page_pointer.descendent_pages
+            runs = []
+            while start < end:
+                index = bisect_left(keys, elements[start])
+                if index < len(keys) and keys[index] == elements[start]:
+                    next_start = bisect_right(elements, keys[index], start, end)
+                    runs.append((True, (start, next_start, True, page_pointer, index)))
+                else:
+                    next_start = end
+                    if index < len(keys):
+                        next_start = bisect_left(elements, keys[index], start, end)
+                    if descendents:
+                        runs.append((False, (descendents[index], start, next_start)))
+                    else:
+                        runs.append(
+                            (True, (start, next_start, False, page_pointer, -1))
+                        )
+                start = next_start
+            stack.extend(reversed(runs))
+
+    def update_sizes(self, path, delta):
+        """Adds a number to the size of every page on a path.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            A list of (page, index) tuples, as returned by BTree.find_path().
+
+        delta : int
+
+            How many keys have been added to (or, if negative, removed from) the subtree of the last page of the path.
+        """
+        for page, _ in path:
+            page.size += delta
+
+    def update_level_counts(self, path, num_pages):
+        """Updates the per-level counters after the page at the end of a path has been split or merged.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path down to the page that has been split (or merged away), before the split (or merge). It usually starts at the root, in which case the level of the page is told by its length. Paths that start at the root of a subtree, as the ones of BTree.join_pages(), are handled as well (see BTree.get_path_level()).
+
+        num_pages : int
+
+            How many pages the split has added to the level of the page, or, if negative, how many the merge has removed from it.
+
+        Methodology
+        -----------
+
+        Each page added to a level comes with one separator moved up to the level above, and each page removed from it takes one separator down, so num_pages is enough to update both levels. If the page is the first one of the path (the root of the tree or of a subtree), it keeps being the same Page object one level above, so that level gains a page first (and the tree may grow a level). Nothing is done while the counters are stale (see BTree.stats()).
+        """
+        if self.level_num_pages is None:
+            return
+        level = self.get_path_level(path)
+        if len(path) == 1:
+            self.update_level(level + 1, 1, 0)
+        self.level_num_pages[level] += num_pages
+        self.level_num_keys[level] -= num_pages
+        self.level_num_keys[level + 1] += num_pages
+
+    def get_path_level(self, path):
+        """Returns the level of the page at the end of a path.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            A list of (page, index) tuples going down from any page.
+
+        Returns
+        -------
+
+        int
+
+            The level of the last page of the path, counted from the leaves up (0 for a leaf page), as in self.level_num_pages.
+
+        Methodology
+        -----------
+
+        If the path starts at the root, the level is told by its length alone. Otherwise (which only happens while subtrees are cut and joined, see BTree.join_pages()), the level is found by walking down the leftmost descendent pages of the page, which takes O(height) steps.
+        """
+        if path[0][0] is self.root:
+            return len(self.level_num_pages) - len(path)
+        level = 0
+        page_pointer = path[-1][0]
+        while page_pointer.descendent_pages:
+            page_pointer = page_pointer.descendent_pages[0]
+            level += 1
+        return level
+
+    def update_level(self, level, num_pages, num_keys):
+        """Adds to the counters of a level, adding the level if the tree has not reached it yet, unless the counters are stale (see BTree.stats())."""
+        if self.level_num_pages is None:
+            return
+        while len(self.level_num_pages) <= level:
+            self.level_num_pages.append(0)
+            self.level_num_keys.append(0)
+        self.level_num_pages[level] += num_pages
+        self.level_num_keys[level] += num_keys
+
+    def add_level_counts(self, level_num_pages, level_num_keys, sign=1):
+        """Adds the per-level counters of a subtree (or, if sign is -1, subtracts them) to the ones of the BTree object, both counted from the leaves up."""
+        for level, (num_pages, num_keys) in enumerate(
+            zip(level_num_pages, level_num_keys)
+        ):
+            self.update_level(level, sign * num_pages, sign * num_keys)
+
+    def trim_levels(self):
+        """Drops the levels left without pages at the top of the per-level counters, after subtrees have been cut away."""
+        if self.level_num_pages is None:
+            return
+        while len(self.level_num_pages) > 1 and not self.level_num_pages[-1]:
+            self.level_num_pages.pop()
+            self.level_num_keys.pop()
+
+    def update_leaf_count(self, delta):
+        """Adds a number to the counter of keys in leaf pages, unless the counters are stale (see BTree.stats())."""
+        if self.level_num_keys is not None:
+            self.level_num_keys[0] += delta
+
+    def promote(self, path):
+        """Promotes an element one level above.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object that has too many keys, as a list of (page, index) tuples. The index of the last tuple is not used.
+
+        Methodology
+        -----------
+
+        The method will begin by separating the keys (and values, if the Page object holds any) and descendents that will go to each descendent page, as well as the middle key which will remain in the original page.
+
+        It is with these values that the method creates two new pages, inserting the respective descendents where they are supposed to be and computing their sizes.
+
+        Finally, it gives the two newly-created Page objects, the middle key (and value) of the current Page object and the Page object itself to self.promote_root_page() or self.promote_page(), depending on whether the Page object to be promoted is a root page (the path has a single step) or not.
+
+        Under the B* policy, only the root is split this way: any other page is handed to BTree.redistribute().
+        """
+        if self.b_star and len(path) > 1:
+            self.redistribute(path)
+            return
+
+        page = path[-1][0]
+        middle_index = page.min_num_keys
+
+        middle_key = page[middle_index]
+        middle_value = page.get_value(middle_index)
+
+        left_child = self.create_page()
+        right_child = self.create_page()
+        left_child.descendent_pages = page.descendent_pages[: middle_index + 1]
+        right_child.descendent_pages = page.descendent_pages[middle_index + 1 :]
+        left_child.keys = page[:middle_index]
+        right_child.keys = page[middle_index + 1 :]
+        if page.values is not None:
+            left_child.values = page.values[:middle_index]
+            right_child.values = page.values[middle_index + 1 :]
+        left_child.num_keys = len(left_child)
+        right_child.num_keys = len(right_child)
+        left_child.update_size()
+        right_child.update_size()
+
+        self.update_level_counts(path, 1)
+        if len(path) == 1:
+            self.promote_root_page(
+                page, left_child, middle_key, right_child, middle_value
+            )
+        else:
+            self.promote_page(
+                path, left_child, middle_key, right_child, middle_value
+            )
+
+    def redistribute(self, path):
+        """Handles an overflowing page which is not the root, as in a B*-tree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object that has too many keys, as given to BTree.promote().
+
+        Methodology
+        -----------
+
+        If an adjacent page has room, keys are moved into it (through the parent page, by Page.borrow_left() or Page.borrow_right()) until both pages hold about the same number of keys, and no page is created. Otherwise, the page and a full sibling are split into three pages through BTree.split_two_to_three(), and BTree.promote() is called for the parent page if it now has too many keys.
+        """
+        page = path[-1][0]
+        parent_page, page_index = path[-2]
+        left_page, right_page = page.get_adjacent_pages(parent_page, page_index)
+        left_room = 0 if left_page is None else left_page.max_num_keys - len(left_page)
+        right_room = (
+            0 if right_page is None else right_page.max_num_keys - len(right_page)
+        )
+
+        if left_room > 0 and left_room >= right_room:
+            while len(page) > len(left_page) + 1:
+                left_page.borrow_right(parent_page, page_index - 1)
+            return
+        if right_room > 0:
+            while len(page) > len(right_page) + 1:
+                right_page.borrow_left(parent_page, page_index + 1)
+            return
+
+        if right_page is not None:
+            self.split_two_to_three(parent_page, page_index)
+        else:
+            self.split_two_to_three(parent_page, page_index - 1)
+        self.update_level_counts(path, 1)
+        if len(parent_page) > parent_page.max_num_keys:
+            self.promote(path[:-1])
+
+    def split_two_to_three(self, parent_page, separator_index):
+        """Spreads the keys of two adjacent pages over three pages.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        parent_page : Page
+
+            The parent of both pages.
+
+        separator_index : int
+
+            The index of the key between both pages under parent_page.keys.
+
+        Methodology
+        -----------
+
+        The keys (and values) of both pages and the key between them are gathered in order, along with their descendent pages. A new page is created to sit between both pages, and the keys are spread evenly over the three pages, leaving two keys to go up to parent_page as separators. Since both pages are full, each of the three ends up about 2/3 full. The sizes of the three pages are recomputed from their contents, and the size of parent_page does not change.
+        """
+        left_page = parent_page.descendent_pages[separator_index]
+        right_page = parent_page.descendent_pages[separator_index + 1]
+        keys = (
+            left_page.keys
+            + self.create_keys([parent_page[separator_index]])
+            + right_page.keys
+        )
+        values = None
+        if parent_page.values is not None:
+            values = (
+                left_page.values
+                + [parent_page.get_value(separator_index)]
+                + right_page.values
+            )
+        descendents = left_page.descendent_pages + right_page.descendent_pages
+
+        middle_page = self.create_page()
+        num_keys = len(keys) - 2
+        separators = []
+        key_index = 0
+        descendent_index = 0
+        for index, page in enumerate([left_page, middle_page, right_page]):
+            size = num_keys // 3 + (index < num_keys % 3)
+            page.keys = keys[key_index : key_index + size]
+            if values is not None:
+                page.values = values[key_index : key_index + size]
+            page.num_keys = size
+            if descendents:
+                page.descendent_pages = descendents[
+                    descendent_index : descendent_index + size + 1
+                ]
+                descendent_index += size + 1
+            page.update_size()
+            key_index += size
+            if index < 2:
+                separators.append(
+                    (keys[key_index], None if values is None else values[key_index])
+                )
+                key_index += 1
+
+        parent_page.set_item(separator_index, *separators[0])
+        parent_page.insert_item(separator_index + 1, *separators[1])
+        parent_page.descendent_pages.insert(separator_index + 1, middle_page)
+
+    def promote_root_page(
+        self, page, left_child, middle_key, right_child, middle_value=None
+    ):
+        """Promotes a root page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The Page object to be promoted.
+
+        left_child : Page
+
+            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the left pointer relative to the middle key element.
+
+        middle_key : SUPPORTED_TYPES
+
+            The middle element. It will be used as reference during the insertion of the left_child and right_child under the proper descendent_pages list attribute.
+
+        right_child : Page
+
+            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the right pointer relative to the middle key element.
+
+        middle_value : object (default = None)
+
+            The value of the middle element, if the BTree object holds values.
+
+        Methodology
+        -----------
+
+        Since it is the root page we are talking about, the process is relatively straightforward: it is just a matter of setting page.keys to be just the middle key element and the page.descendent_pages list to be just the two newly-created Page objects. The size of the root does not change.
+        """
+        page.keys = self.create_keys([middle_key])
+        if page.values is not None:
+            page.values = [middle_value]
+        page.num_keys = 1
+        page.descendent_pages = [left_child, right_child]
+
+    def promote_page(
+        self, path, left_child, middle_key, right_child, middle_value=None
+    ):
+        """Promotes a page which is not the root.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object to be promoted, as given to BTree.promote().
+
+        left_child : Page
+
+            A Page object created by BTree.promote(), which will take the place of the promoted Page object under the descendent_pages list of its parent.
+
+        middle_key : SUPPORTED_TYPES
+
+            The middle element, which will be inserted in the parent page.
+
+        right_child : Page
+
+            A Page object created by BTree.promote(), which will be set under the descendent_pages list of the parent page right after left_child.
+
+        middle_value : object (default = None)
+
+            The value of the middle element, if the BTree object holds values.
+
+        Methodology
+        -----------
+
+        Although the goal of this method is virtually the same as BTree.promote_root_page(), its executions are quite different. The pages that fall under this method can be leaf pages or pages in intermediate levels.
+
+        The parent page and the position of the Page object under it are taken from the path, so no page is searched: the middle key is inserted in the parent page at that position, left_child takes the place of the Page object and right_child is inserted right after it. The Page object is then released. The size of the parent page does not change.
+
+        Before wrapping it up, the method verifies whether the parent page now has too many keys, calling BTree.promote() with the path without its last step if so.
+        """
+        page = path[-1][0]
+        parent_page, page_index = path[-2]
+        parent_page.insert_item(page_index, middle_key, middle_value)
+        parent_page.descendent_pages[page_index] = left_child
+        parent_page.descendent_pages.insert(page_index + 1, right_child)
+        self.release_page(page)
+        del page
+
+        if len(parent_page) > parent_page.max_num_keys:
+            self.promote(path[:-1])
+
+    def split(self, path):
+        """Splits a page with any number of keys above the maximum into as few pages as possible.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object that has too many keys, as given to BTree.promote().
+
+        Methodology
+        -----------
+
+        If the page has just one key too many, BTree.promote() takes care of it as usual (following the B* policy, if any). Otherwise, get_page_sizes() spreads its keys (and values and descendent pages) over the fewest pages that can hold them, leaving one key between every two of them as a separator, and a new page is created for each slice, just as in BTree.pack().
+
+        If the page is the root, the separators become its only keys and the new pages its descendents, so the root keeps being the same Page object. Otherwise, the new pages take the place of the page under its parent page, the separators are inserted there and the page is released. Either way, the size of the page that receives the separators does not change, and BTree.split() is called for it if it now has too many keys.
+        """
+        page = path[-1][0]
+        if len(page) <= page.max_num_keys + 1:
+            self.promote(path)
+            return
+
+        sizes = get_page_sizes(
+            len(page), page.min_num_keys, page.max_num_keys, page.max_num_keys
+        )
+        keys = page.keys
+        values = page.values
+        descendents = page.descendent_pages
+        pages = []
+        separators = []
+        separator_values = []
+        key_index = 0
+        descendent_index = 0
+        for size in sizes:
+            new_page = self.create_page()
+            new_page.keys = keys[key_index : key_index + size]
+            if values is not None:
+                new_page.values = values[key_index : key_index + size]
+            new_page.num_keys = size
+            key_index += size
+            if descendents:
+                new_page.descendent_pages = descendents[
+                    descendent_index : descendent_index + size + 1
+                ]
+                descendent_index += size + 1
+            new_page.update_size()
+            pages.append(new_page)
+            if key_index < len(keys):
+                separators.append(keys[key_index])
+                separator_values.append(None if values is None else values[key_index])
+                key_index += 1
+
+        self.update_level_counts(path, len(pages) - 1)
+        if len(path) == 1:
+            page.keys = self.create_keys(separators)
+            if values is not None:
+                page.values = separator_values
+            page.num_keys = len(separators)
+            page.descendent_pages = pages
+            parent_path = path
+        else:
+            parent_page, page_index = path[-2]
+            for offset, separator in enumerate(separators):
+                parent_page.insert_item(
+                    page_index + offset, separator, separator_values[offset]
+                )
+            parent_page.descendent_pages[page_index : page_index + 1] = pages
+            self.release_page(page)
+            parent_path = path[:-1]
+
+        parent_page = parent_path[-1][0]
+        if len(parent_page) > parent_page.max_num_keys:
+            self.split(parent_path)
+
+    def demote(self, path):
+        """Demotes a page of the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object to be demoted, as a list of (page, index) tuples. The index of the last tuple is not used.
+
+        Methodology
+        -----------
+
+        The parent page and the index in which the page is stored under parent_page.descendent_pages are taken from the path. Then, the method decides which sibling page will be part of the merge procedure, calling either BTree.demote_left() or BTree.demote_right().
+
+        After these methods are done with their jobs, this method moves forward to a set of verifications: if, after this procedure, the parent page violates the B-Tree minimum degree rule, then BTree.rebalance() is called with the path without its last step. Otherwise, if the parent page actually is the root of the BTree object and its length is 0, it means that the depth of the B-Tree has lowered, and the self.root attribute must be resetted. This is done by calling BTree.recreate_root().
+
+        """
+        parent_page, page_index = path[-2]
+        if page_index > 0:
+            self.demote_left(path)
+        else:
+            self.demote_right(path)
+
+        if len(path) > 2 and len(parent_page) < parent_page.min_num_keys:
+            self.rebalance(path[:-1])
+
+        elif len(path) == 2 and len(parent_page) == 0:
+            self.recreate_root()
+
+    def demote_left(self, path):
+        """Merges the page in question with the page at its left, taking an element from the parent page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object which will undergo the merge procedure.
+
+        Methodology
+        -----------
+
+        After obtaining the parent page, the element to be taken from it and the left page, this method will move on to the proper page merge. Actually, what happens is that the left page receives the middle element taken from parent_page and the remaining elements from page (values included), as well as the descendent pages of page. Then, page is removed and released. Since both pages are adjacent, the keys are just concatenated.
+
+        The method finishes by verifying whether the resulting left_page has surpassed the maximum number of keys it is allowed to store in the BTree object. If so, BTree.promote() is called with the path to left_page.
+        """
+        page = path[-1][0]
+        parent_page, page_index = path[-2]
+        left_page = parent_page.descendent_pages[page_index - 1]
+        middle_element, middle_value = parent_page.remove_item(page_index - 1)
+        del parent_page.descendent_pages[page_index]
+
+        left_page.keys = left_page.keys + self.create_keys([middle_element]) + page.keys
+        if left_page.values is not None:
+            left_page.values = left_page.values + [middle_value] + page.values
+        left_page.num_keys = len(left_page)
+        left_page.size += 1 + page.size
+        left_page.descendent_pages = left_page.descendent_pages + page.descendent_pages
+        self.release_page(page)
+        del page
+        self.update_level_counts(path, -1)
+
+        if len(left_page) > left_page.max_num_keys:
+            self.promote(path[:-2] + [(parent_page, page_index - 1), (left_page, 0)])
+
+    def demote_right(self, path):
+        """Merges the page in question with the page at its right, taking an element from the parent page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object which will undergo the merge procedure.
+
+        Methodology
+        -----------
+
+        This method mirrors BTree.demote_left(): the right page receives the elements of page (values included), the middle element taken from parent_page and its own elements, in this order, as well as the descendent pages of page before its own. Then, page is removed and released, and BTree.promote() is called with the path to right_page if it has too many keys.
+        """
+        page = path[-1][0]
+        parent_page, page_index = path[-2]
+        right_page = parent_page.descendent_pages[page_index + 1]
+        middle_element, middle_value = parent_page.remove_item(page_index)
+        del parent_page.descendent_pages[page_index]
+
+        right_page.keys = (
+            page.keys + self.create_keys([middle_element]) + right_page.keys
+        )
+        if right_page.values is not None:
+            right_page.values = page.values + [middle_value] + right_page.values
+        right_page.num_keys = len(right_page)
+        right_page.size += 1 + page.size
+        right_page.descendent_pages = (
+            page.descendent_pages + right_page.descendent_pages
+        )
+        self.release_page(page)
+        del page
+        self.update_level_counts(path, -1)
+
+        if len(right_page) > right_page.max_num_keys:
+            self.promote(path[:-2] + [(parent_page, page_index), (right_page, 0)])
+
+    def remove(self, *args):
+        """Removes any amount of items of the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        *args : list
+
+            The elements to be removed, merged just like in BTree.insert().
+
+        Methodology
+        -----------
+
+        For each element yielded by iterate_merged(), BTree.find_path() will be called to see if the element is already in the BTree object. If it is not, an ValueError will be raised. Otherwise, BTree.remove_at() removes it. In top-down mode, BTree.remove_top_down() takes care of everything instead.
+        """
+        for arg in iterate_merged(args):
+            if self.top_down:
+                self.remove_top_down(arg)
+                continue
+            in_tree, path = self.find_path(arg)
+            if not in_tree:
+                raise ValueError("The value {} is not in this tree.".format(arg))
+            self.remove_at(path)
+
+    def remove_at(self, path):
+        """Removes the element at the end of a path, rebalancing pages as needed.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path to the element, as returned by BTree.find_path() for an element that is in the BTree object.
+
+        Returns
+        -------
+
+        tuple : (element, value)
+
+            element : SUPPORTED_TYPES
+
+                The removed element.
+
+            value : object
+
+                Its value, or None if the BTree object does not hold values.
+
+        Methodology
+        -----------
+
+        The method checks whether the page at the end of the path is a leaf page or not by calling Page.is_leaf(). If it is, then it is just a matter of removing the element from it. If it is not a leaf page, then the element stored in it has to be replaced with an adjacent element first. This is done by calling Page.replace_with_leaf_element(), which returns the rest of the path down to the leaf page the adjacent element has been taken from.
+
+        Either way, the sizes of the pages on the path are decremented through BTree.update_sizes() and the path is given to BTree.rebalance(), which takes care of a possible violation of the minimum number of keys. No DegreeUnderflowError is raised in the process.
+        """
+        page_pointer, index = path[-1]
+        element = page_pointer[index]
+        value = page_pointer.get_value(index)
+        if page_pointer.is_leaf():
+            page_pointer.remove_item(index)
+        else:
+            path = path[:-1] + page_pointer.replace_with_leaf_element(element)
+        self.update_sizes(path, -1)
+        self.update_leaf_count(-1)
+        self.rebalance(path)
+        self.num_keys -= 1
+        if self.bloom_filter is not None:
+            self.update_bloom_filter(num_removed=1)
+        return (element, value)
+
+    def remove_top_down(self, element):
+        """Removes an element in a single pass from the root down to a leaf page.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be removed. A ValueError is raised if it is not in the BTree object.
+
+        Returns
+        -------
+
+        tuple : (element, value)
+
+            The same as BTree.remove_at().
+
+        Methodology
+        -----------
+
+        This is the removal of the top-down mode (see BTree.__init__()), as described by Cormen et al. Before the descent goes into a descendent page with only min_num_keys keys, the page is filled through BTree.fill_descendent(), so that a key can be taken from it later without any merge travelling back up. If the element is found in an internal page, it is replaced with its predecessor (or sucessor) if the descendent page on that side has a key to spare, which is taken by BTree.pop_edge_element(). Otherwise, both descendent pages around the element are merged with it, and the descent goes on into the merged page. Whenever the root loses its last key, BTree.recreate_root() is called right away. The sizes of the pages are decremented on the way down and restored if the element turns out not to be in the BTree object. The path from the root is kept along the way, so that the helpers can tell the level of every merge (see BTree.update_level_counts()).
+        """
+        path = []
+        page_pointer = self.root
+
+        while True:
+            in_page, index = page_pointer.search(element)
+            if page_pointer.is_leaf():
+                if not in_page:
+                    self.update_sizes(path, 1)
+                    raise ValueError(
+                        "The value {} is not in this tree.".format(element)
+                    )
+                page_pointer.size -= 1
+                self.update_leaf_count(-1)
+                self.num_keys -= 1
+                if self.bloom_filter is not None:
+                    self.update_bloom_filter(num_removed=1)
+                return page_pointer.remove_item(index)
+
+            descendents = page_pointer.descendent_pages
+            if in_page:
+                removed = (element, page_pointer.get_value(index))
+                for last, descendent_index in [(True, index), (False, index + 1)]:
+                    descendent = descendents[descendent_index]
+                    if len(descendent) > descendent.min_num_keys:
+                        page_pointer.size -= 1
+                        page_pointer.set_item(
+                            index,
+                            *self.pop_edge_element(
+                                path
+                                + [(page_pointer, descendent_index), (descendent, 0)],
+                                last,
+                            ),
+                        )
+                        self.update_leaf_count(-1)
+                        self.num_keys -= 1
+                        if self.bloom_filter is not None:
+                            self.update_bloom_filter(num_removed=1)
+                        return removed
+                self.demote_left(
+                    path + [(page_pointer, index + 1), (descendents[index + 1], 0)]
+                )
+            elif len(descendents[index]) <= descendents[index].min_num_keys:
+                index = self.fill_descendent(path + [(page_pointer, index)])
+
+            if page_pointer is self.root and len(page_pointer) == 0:
+                self.recreate_root()
+                page_pointer = self.root
+                continue
+            page_pointer.size -= 1
+            path.append((page_pointer, index))
+            page_pointer = page_pointer.descendent_pages[index]
+
+    def fill_descendent(self, path):
+        """Makes sure a descendent page has more than min_num_keys keys, so that one can be removed from it.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the parent of the descendent page, whose last step holds the index of the descendent page under its descendent pages.
+
+        Returns
+        -------
+
+        int
+
+            The index of the page that now covers the keys of the descendent page, which changes if it has been merged with its left sibling.
+
+        Methodology
+        -----------
+
+        If a sibling of the descendent page has a key to spare, a key is rotated through the parent page by Page.borrow_left() or Page.borrow_right() (which also move a descendent page, if the pages are not leaves). Otherwise, the descendent page is merged with a sibling and the key between them through BTree.demote_left(). Since a merged page holds 2 * min_num_keys + 1 keys, this only fits in the pages of the top-down mode.
+        """
+        page, index = path[-1]
+        descendent = page.descendent_pages[index]
+        left_page, right_page = descendent.get_adjacent_pages(page, index)
+        if left_page is not None and len(left_page) > left_page.min_num_keys:
+            descendent.borrow_left(page, index)
+        elif right_page is not None and len(right_page) > right_page.min_num_keys:
+            descendent.borrow_right(page, index)
+        elif left_page is not None:
+            self.demote_left(path + [(descendent, 0)])
+            return index - 1
+        else:
+            self.demote_left(path[:-1] + [(page, index + 1), (right_page, 0)])
+        return index
+
+    def pop_edge_element(self, path, last):
+        """Removes the largest (or smallest) element of the subtree of a page, in a single pass.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the root of the subtree, which must have more than min_num_keys keys.
+
+        last : bool
+
+            Whether to remove the largest element (True) or the smallest one (False).
+
+        Returns
+        -------
+
+        tuple : (element, value)
+
+            The removed element and its value.
+
+        Methodology
+        -----------
+
+        The method descends along the rightmost (or leftmost) descendent pages, filling each one through BTree.fill_descendent() before going into it and decrementing the size of every page on the way. The path is extended on the way down, so that every merge knows the level it happens at (see BTree.update_level_counts()).
+        """
+        page_pointer = path[-1][0]
+        path = path[:-1]
+        while not page_pointer.is_leaf():
+            index = len(page_pointer) if last else 0
+            if len(page_pointer.descendent_pages[index]) <= page_pointer.min_num_keys:
+                index = self.fill_descendent(path + [(page_pointer, index)])
+            page_pointer.size -= 1
+            path.append((page_pointer, index))
+            page_pointer = page_pointer.descendent_pages[index]
+
+        page_pointer.size -= 1
+        return page_pointer.remove_item(len(page_pointer) - 1 if last else 0)
+
+    def rebalance(self, path):
+        """Restores the minimum number of keys of a page that has just lost an element.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        path : list
+
+            The path from the root down to the Page object from which an element has been removed.
+
+        Methodology
+        -----------
+
+        If the page is the root or still has at least min_num_keys keys, nothing needs to be done. Otherwise, the page borrows an element from an adjacent page through Page.borrow() if any of them can spare one, and is merged with one of them through BTree.demote() if not. Page.borrow() only lends keys from leaf pages, so internal pages are always merged (and possibly split again by BTree.demote_left() or BTree.demote_right()), except under the B* policy, where the adjacent page with more keys to spare lends one whether it is a leaf or not.
+        """
+        page = path[-1][0]
+        if len(path) == 1 or len(page) >= page.min_num_keys:
+            return
+        parent_page, page_index = path[-2]
+        if self.b_star:
+            left_page, right_page = page.get_adjacent_pages(parent_page, page_index)
+            left_spare = 0 if left_page is None else len(left_page) - page.min_num_keys
+            right_spare = (
+                0 if right_page is None else len(right_page) - page.min_num_keys
+            )
+            if left_spare > 0 and left_spare >= right_spare:
+                page.borrow_left(parent_page, page_index)
+            elif right_spare > 0:
+                page.borrow_right(parent_page, page_index)
+            else:
+                self.demote(path)
+        elif page.can_borrow(parent_page, page_index):
+            page.borrow(parent_page, page_index)
+        else:
+            self.demote(path)
+
+    def remove_range(self, lo=None, hi=None, inclusive=True):
+        """Removes every element that lies between two bounds, dropping whole subtrees at once.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        lo : SUPPORTED_TYPES, None (default = None)
+
+            The lower bound. If None, there is no lower bound.
+
+        hi : SUPPORTED_TYPES, None (default = None)
+
+            The upper bound. If None, there is no upper bound.
+
+        inclusive : bool, tuple (default = True)
+
+            Whether the bounds themselves are removed, as in BTree.range().
+
+        Returns
+        -------
+
+        int
+
+            How many elements have been removed.
+
+        Methodology
+        -----------
+
+        Instead of calling BTree.remove() for each element, the BTree object is cut along the path of lo and then along the path of hi through BTree.cut_page(), which leaves three subtrees: the elements below the range, the ones inside it and the ones above it. The subtree in the middle is handed to BTree.release_subtree() as a whole, so the pages that lie entirely inside the range are never visited (in memory, at least). The other two are joined back through BTree.join_pages(), using the largest element of the lower subtree (cut away from it in the same way) as the separator. Every step only touches the pages on the two boundary paths, so the whole removal takes O(log n) page operations, no matter how many elements it removes.
+
+        The pages created and released along the boundary paths are counted in the per-level counters of BTree.stats() by BTree.cut_page() and BTree.join_pages(), but the pages of the middle subtree can only be counted by visiting them. BTree.release_subtree() returns their counts if it visits them anyway (as a DiskBTree does, to free their slots in the page file). Otherwise, the counters are marked as stale instead of walking the middle subtree, so the removal stays O(log n) and the next call to BTree.stats() recounts the whole tree in O(n) time. Removing every element resets the counters to the ones of an empty tree.
+        """
+        if type(inclusive) is bool:
+            inclusive = (inclusive, inclusive)
+        if lo is not None and hi is not None and (
+            lo > hi or (lo == hi and not all(inclusive))
+        ):
+            return 0
+
+        lower = (None, 0)
+        middle = (self.root, self.get_depth())
+        upper = (None, 0)
+        if lo is not None:
+            lower, middle = self.cut_page(*middle, lo, not inclusive[0])
+        if hi is not None and middle[0] is not None:
+            middle, upper = self.cut_page(*middle, hi, inclusive[1])
+
+        num_removed = 0
+        if middle[0] is not None:
+            num_removed = middle[0].size
+            counts = self.release_subtree(middle[0])
+            if counts is None:
+                self.level_num_pages = self.level_num_keys = None
+            else:
+                self.add_level_counts(*counts, sign=-1)
+
+        if lower[0] is None:
+            root = upper[0]
+        elif upper[0] is None:
+            root = lower[0]
+        else:
+            page_pointer = lower[0]
+            while page_pointer.descendent_pages:
+                page_pointer = page_pointer.descendent_pages[-1]
+            lower, last = self.cut_page(*lower, page_pointer[-1], False)
+            separator = (last[0][0], last[0].get_value(0))
+            self.update_level(0, -1, -1)
+            self.release_page(last[0])
+            root = self.join_pages(lower, separator, upper)[0]
+
+        if root is None:
+            self.root = self.create_page()
+            self.level_num_pages = [1]
+            self.level_num_keys = [0]
+        else:
+            self.root = root
+            self.trim_levels()
+        self.num_keys -= num_removed
+        if self.bloom_filter is not None:
+            self.update_bloom_filter(num_removed=num_removed)
+        return num_removed
+
+    def cut_page(self, page, height, bound, bound_goes_left):
+        """Cuts a subtree in two along the path of a bound.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The root of the subtree to be cut. It is consumed by the cut: it is either released or reused by one of the resulting subtrees.
+
+        height : int
+
+            The height of the subtree (0 for a leaf page).
+
+        bound : SUPPORTED_TYPES
+
+            The element along whose path the subtree is cut.
+
+        bound_goes_left : bool
+
+            Whether an element equal to bound goes to the left subtree (True) or to the right one (False).
+
+        Returns
+        -------
+
+        tuple : (left, right)
+
+            left : tuple
+
+                A (page, height) tuple with the root and the height of the subtree holding the elements below bound, or (None, 0) if there are none.
+
+            right : tuple
+
+                The same for the elements above bound.
+
+        Methodology
+        -----------
+
+        The keys of the page are split at the position of bound, which is also the descendent page the path of bound goes through. That descendent page is cut recursively. On each side, the keys and descendent pages of the page that are left become a subtree of their own through BTree.create_subtree(), which is joined with the respective half of the recursive cut through BTree.join_pages(), using the key next to the position of bound as the separator. Both resulting subtrees are valid B-Trees, except that their roots may have fewer than min_num_keys keys, just like the root of a BTree object. Since the subtrees joined at each level grow in height from the bottom up, the joins cost O(log n) page operations altogether.
+
+        The page that is cut is released, which is counted in the per-level counters of BTree.stats(), just as the pages created by BTree.create_subtree() and the ones created and released by BTree.join_pages() are, so the counters keep adding up the pages of both resulting subtrees.
+        """
+        keys = page.keys
+        values = page.values
+        descendents = page.descendent_pages
+        if bound_goes_left:
+            index = bisect_right(keys, bound)
+        else:
+            index = bisect_left(keys, bound)
+
+        if height == 0:
+            left = self.create_subtree(
+                keys[:index], None if values is None else values[:index], [], 0
+            )
+            right = self.create_subtree(
+                keys[index:], None if values is None else values[index:], [], 0
+            )
+            self.update_level(0, -1, -len(keys))
+            self.release_page(page)
+            return (left, right)
+
+        left, right = self.cut_page(
+            descendents[index], height - 1, bound, bound_goes_left
+        )
+        if index > 0:
+            outer = self.create_subtree(
+                keys[: index - 1],
+                None if values is None else values[: index - 1],
+                descendents[:index],
+                height,
+            )
+            separator = (keys[index - 1], page.get_value(index - 1))
+            left = self.join_pages(outer, separator, left)
+        if index < len(keys):
+            outer = self.create_subtree(
+                keys[index + 1 :],
+                None if values is None else values[index + 1 :],
+                descendents[index + 1 :],
+                height,
+            )
+            separator = (keys[index], page.get_value(index))
+            right = self.join_pages(right, separator, outer)
+        self.update_level(height, -1, -len(keys))
+        self.release_page(page)
+        return (left, right)
+
+    def create_subtree(self, keys, values, descendents, height):
+        """Creates the root of a subtree from its keys and descendent pages.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        keys : list
+
+            The keys of the root.
+
+        values : list, None
+
+            Their values, which are only used if the BTree object holds values.
+
+        descendents : list
+
+            The descendent pages of the root (one more than the keys), or an empty list for a leaf page.
+
+        height : int
+
+            The height of the subtree.
+
+        Returns
+        -------
+
+        tuple : (page, height)
+
+            The root and the height of the subtree, as used by BTree.cut_page() and BTree.join_pages(). A root without keys is never created: if there are no keys, the single descendent page is the subtree itself, one level lower, and if there are no descendent pages either, (None, 0) is returned for the empty subtree. A page that is created is counted in the per-level counters of BTree.stats().
+        """
+        if not keys:
+            if descendents:
+                return (descendents[0], height - 1)
+            return (None, 0)
+
+        page = self.create_page()
+        page.keys = keys
+        if page.values is not None:
+            page.values = values
+        page.num_keys = len(keys)
+        page.descendent_pages = descendents
+        page.update_size()
+        self.update_level(height, 1, len(keys))
+        return (page, height)
+
+    def join_pages(self, left, separator, right):
+        """Joins two subtrees and an element between them into a single subtree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        left : tuple
+
+            A (page, height) tuple with the root and the height of the subtree whose elements are smaller than the separator, or (None, 0) if it is empty.
+
+        separator : tuple
+
+            The (element, value) pair that goes between both subtrees. The value is None if the BTree object does not hold values.
+
+        right : tuple
+
+            The same as left, for the subtree whose elements are larger than the separator.
+
+        Returns
+        -------
+
+        tuple : (page, height)
+
+            The root and the height of the resulting subtree.
+
+        Methodology
+        -----------
+
+        If both subtrees have the same height, their roots and the separator are merged into a single page, which is split through BTree.split() if it has too many keys, gaining a level. Otherwise, the method descends the right edge of the taller subtree (or the left edge, if the taller one is at the right) down to the page one level above the shorter subtree, and the separator and the root of the shorter subtree are appended to that page (or prepended to it). An empty subtree is handled the same way, with the separator alone going to the leaf page at the edge. The sizes of the pages on the way down are updated through BTree.update_sizes().
+
+        The root of the shorter subtree may have fewer than min_num_keys keys, in which case it is merged with its sibling (and the separator between them). Then, BTree.split() is called for whichever page has too many keys, which may travel all the way up. Each of these steps adds at most one key to the parent page, so the root of the taller subtree can only be split if it was full, and that is how the method knows whether the resulting subtree has gained a level.
+
+        The separator, the pages merged away and the pages created by the splits are counted in the per-level counters of BTree.stats(). The paths given to BTree.split() start at the root of the subtree rather than at the root of the tree, and BTree.update_level_counts() tells their levels through BTree.get_path_level().
+        """
+        if left[0] is None and right[0] is None:
+            return self.create_subtree(
+                self.create_keys([separator[0]]), [separator[1]], [], 0
+            )
+        if left[0] is not None and right[0] is not None and left[1] == right[1]:
+            page, other = left[0], right[0]
+            page.keys = page.keys + self.create_keys([separator[0]]) + other.keys
+            if page.values is not None:
+                page.values = page.values + [separator[1]] + other.values
+            page.num_keys = len(page.keys)
+            page.descendent_pages = page.descendent_pages + other.descendent_pages
+            page.size += 1 + other.size
+            self.update_level(left[1], -1, 1)
+            self.release_page(other)
+            if len(page) > page.max_num_keys:
+                self.split([(page, 0)])
+                return (page, left[1] + 1)
+            return (page, left[1])
+
+        last = right[0] is None or (left[0] is not None and left[1] > right[1])
+        (root, height), (other, other_height) = (
+            (left, right) if last else (right, left)
+        )
+        root_was_full = len(root) == root.max_num_keys
+        if other is None:
+            other_height = -1
+
+        path = []
+        page_pointer = root
+        for _ in range(height - other_height - 1):
+            index = len(page_pointer) if last else 0
+            path.append((page_pointer, index))
+            page_pointer = page_pointer.descendent_pages[index]
+
+        key_index = len(page_pointer) if last else 0
+        page_pointer.insert_item(key_index, *separator)
+        self.update_level(other_height + 1, 0, 1)
+        if other is None:
+            path.append((page_pointer, key_index))
+            self.update_sizes(path, 1)
+            if len(page_pointer) > page_pointer.max_num_keys:
+                self.split(path)
+        else:
+            child_index = key_index + 1 if last else 0
+            page_pointer.descendent_pages.insert(child_index, other)
+            path.append((page_pointer, child_index))
+            self.update_sizes(path, 1 + other.size)
+            if len(other) < other.min_num_keys:
+                path[-1] = (page_pointer, key_index)
+                merged_page = self.merge_descendents(page_pointer, key_index)
+                self.update_level(other_height + 1, 0, -1)
+                self.update_level(other_height, -1, 1)
+                if len(merged_page) > merged_page.max_num_keys:
+                    self.split(path + [(merged_page, 0)])
+            elif len(page_pointer) > page_pointer.max_num_keys:
+                self.split(path)
+
+        if root_was_full and len(root) < root.max_num_keys:
+            height += 1
+        return (root, height)
+
+    def merge_descendents(self, page, separator_index):
+        """Merges two adjacent descendent pages of a page, along with the key between them.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The parent of both pages.
+
+        separator_index : int
+
+            The index of the key between both pages under page.keys.
+
+        Returns
+        -------
+
+        Page
+
+            The merged page, which is the left one of the two. The right one is released. It may have too many keys, which is left for the caller to handle.
+
+        Methodology
+        -----------
+
+        This is the merge of BTree.demote_left(), without the BTree.promote() call that follows it: the pages merged by BTree.join_pages() may add up to well over max_num_keys + 1 keys, which only BTree.split() can handle.
+        """
+        left_page = page.descendent_pages[separator_index]
+        right_page = page.descendent_pages[separator_index + 1]
+        middle_element, middle_value = page.remove_item(separator_index)
+        del page.descendent_pages[separator_index + 1]
+
+        left_page.keys = (
+            left_page.keys + self.create_keys([middle_element]) + right_page.keys
+        )
+        if left_page.values is not None:
+            left_page.values = left_page.values + [middle_value] + right_page.values
+        left_page.num_keys = len(left_page)
+        left_page.size += 1 + right_page.size
+        left_page.descendent_pages = (
+            left_page.descendent_pages + right_page.descendent_pages
+        )
+        self.release_page(right_page)
+        return left_page
+
+    def release_subtree(self, page):
+        """Tells the BTree object that a whole subtree is no longer part of it.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The root of the discarded subtree.
+
+        Returns
+        -------
+
+        tuple : (level_num_pages, level_num_keys), None
+
+            The per-level counts of the subtree, as returned by BTree.count_subtree(), if its pages have been visited. Otherwise, None.
+
+        Methodology
+        -----------
+
+        In memory, dropping the root of the subtree drops all of its pages at once, so only BTree.release_page() is called for it and None is returned, since counting the pages would mean visiting them. Subclasses whose pages have storage of their own (such as DiskBTree) release each page instead, counting them along the way.
+        """
+        self.release_page(page)
+        return None
+
+    def split_at(self, element):
+        """Splits the BTree object in two at an element.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object, which keeps the elements smaller than element.
+
+        element : SUPPORTED_TYPES
+
+            The element at which the BTree object is split. It does not need to be in the BTree object.
+
+        Returns
+        -------
+
+        BTree
+
+            A new tree, created by BTree.create_tree(), holding the elements greater than or equal to element.
+
+        Methodology
+        -----------
+
+        The root is cut along the path of element through BTree.cut_page(), just as BTree.remove_range() does, and each of the two resulting subtrees becomes the root of one of the trees. Only the pages on that path are touched, so the split takes O(log n) page operations. Pages do not need to know which tree they belong to, except for the root (see Page.is_root()), so only the parent_tree attribute of the new roots is updated.
+
+        Telling apart the per-level counters of BTree.stats() of both trees would mean visiting every page of one of the subtrees, since the cut leaves most of their pages untouched. To keep the split O(log n), the counters of both trees are marked as stale instead (unless one of them is left empty, in which case the other one keeps the counters), and the next call to BTree.stats() on each tree recounts it in O(n) time, n being the number of elements of that tree.
+        """
+        check_type(element)
+        other = self.create_tree()
+        if not self.num_keys:
+            return other
+
+        left, right = self.cut_page(self.root, self.get_depth(), element, False)
+        if left[0] is not None and right[0] is not None:
+            self.level_num_pages = self.level_num_keys = None
+            other.level_num_pages = other.level_num_keys = None
+        elif left[0] is None:
+            other.level_num_pages = self.level_num_pages
+            other.level_num_keys = self.level_num_keys
+            other.trim_levels()
+            self.level_num_pages = [1]
+            self.level_num_keys = [0]
+        else:
+            self.trim_levels()
+        if right[0] is not None:
+            other.release_page(other.root)
+            other.root = right[0]
+            other.root.parent_tree = other
+            other.num_keys = other.root.size
+        self.root = self.create_page() if left[0] is None else left[0]
+        self.num_keys -= other.num_keys
+        if self.bloom_filter is not None:
+            self.update_bloom_filter(num_removed=other.num_keys)
+        return other
+
+    @classmethod
+    def join(cls, left, right):
+        """Joins two BTree objects whose elements do not overlap.
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The BTree class (or subclass).
+
+        left : BTree
+
+            A BTree object whose elements are all smaller than the ones of right. It receives every element.
+
+        right : BTree
+
+            A BTree object of the same class, degree, mode and key type as left. It is left empty.
+
+        Returns
+        -------
+
+        BTree
+
+            The left object, now holding the elements of both.
+
+        Methodology
+        -----------
+
+        After checking that both trees can be joined through BTree.check_join(), the smallest element of right is cut away from it through BTree.cut_page() and used as the separator of BTree.join_pages(), which hangs the shorter tree from the edge of the taller one. The whole join takes O(log n) page operations, plus O(m) to add the elements of right to the Bloom filter of left, if it has one (see BTree.use_bloom_filter()). The per-level counters of right, after the cut, are added to the ones of left, which then count the pages created and released by BTree.join_pages(), so they are kept up to date without visiting any other page (unless either tree had stale counters). A ValueError is raised if the trees are not compatible or if their elements overlap.
+        """
+        smallest = cls.check_join(left, right)
+        if not right.num_keys:
+            return left
+
+        added = list(right) if left.bloom_filter is not None else []
+        if not left.num_keys:
+            left.root, right.root = right.root, left.root
+            left.root.parent_tree = left
+            right.root.parent_tree = right
+            left.level_num_pages, right.level_num_pages = (
+                right.level_num_pages,
+                left.level_num_pages,
+            )
+            left.level_num_keys, right.level_num_keys = (
+                right.level_num_keys,
+                left.level_num_keys,
+            )
+        else:
+            first, rest = right.cut_page(right.root, right.get_depth(), smallest, True)
+            separator = (smallest, first[0].get_value(0))
+            right.update_level(0, -1, -1)
+            right.release_page(first[0])
+            if right.level_num_pages is None:
+                left.level_num_pages = left.level_num_keys = None
+            else:
+                left.add_level_counts(right.level_num_pages, right.level_num_keys)
+                left.trim_levels()
+            root, _ = left.join_pages((left.root, left.get_depth()), separator, rest)
+            left.root = root
+            left.root.parent_tree = left
+            right.root = right.create_page()
+            right.level_num_pages = [1]
+            right.level_num_keys = [0]
+        left.num_keys += right.num_keys
+        right.num_keys = 0
+        if left.bloom_filter is not None:
+            left.update_bloom_filter(added)
+        if right.bloom_filter is not None:
+            right.rebuild_bloom_filter()
+        return left
+
+    @classmethod
+    def check_join(cls, left, right):
+        """Checks whether two BTree objects can be joined by BTree.join().
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The BTree class (or subclass).
+
+        left : BTree
+
+            The BTree object that would receive every element.
+
+        right : BTree
+
+            The BTree object whose elements would be added to left.
+
+        Returns
+        -------
+
+        SUPPORTED_TYPES, None
+
+            The smallest element of right, if both trees have elements. Otherwise, None.
+
+        Methodology
+        -----------
+
+        A ValueError is raised if the trees are not of the same class, degree, mode and key type, or if the largest element of left is not smaller than the smallest element of right. Finding both elements only takes a walk down the edge of each tree.
+        """
+        if type(left) is not type(right):
+            raise ValueError("Only B-Trees of the same class can be joined.")
+        if (left.min_num_keys, left.top_down, left.b_star, left.key_type) != (
+            right.min_num_keys,
+            right.top_down,
+            right.b_star,
+            right.key_type,
+        ):
+            raise ValueError(
+                "Only B-Trees of the same degree, mode and key type can be joined."
+            )
+        if not left.num_keys or not right.num_keys:
+            return None
+
+        page_pointer = left.root
+        while page_pointer.descendent_pages:
+            page_pointer = page_pointer.descendent_pages[-1]
+        largest = page_pointer[-1]
+        page_pointer = right.root
+        while page_pointer.descendent_pages:
+            page_pointer = page_pointer.descendent_pages[0]
+        smallest = page_pointer[0]
+        if largest >= smallest:
+            raise ValueError("The elements of both B-Trees overlap.")
+        return smallest
+
+    def create_tree(self):
+        """Creates a new, empty tree like the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        Returns
+        -------
+
+        BTree
+
+            An empty object of the same class, degree, mode and key type as the BTree object, to hold the results of operations such as BTree.split_at() and BTree.union().
+        """
+        return type(self)(
+            self.min_num_keys,
+            top_down=self.top_down,
+            b_star=self.b_star,
+            key_type=self.key_type,
+        )
+
+    def merge_sorted(self, other, keep_self, keep_both, keep_other):
+        """Merges the elements of the BTree object with the ones of another tree in a single ordered traversal of both.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        other : BTree, BPlusTree
+
+            Another tree, which must iterate over its elements in crescent order.
+
+        keep_self : bool
+
+            Whether to keep the elements that are only in the BTree object.
+
+        keep_both : bool
+
+            Whether to keep the elements that are in both trees.
+
+        keep_other : bool
+
+            Whether to keep the elements that are only in the other tree.
+
+        Returns
+        -------
+
+        tuple : (keys, values)
+
+            keys : list
+
+                The elements kept, in crescent order.
+
+            values : list, None
+
+                Their values, if the BTree object holds values, or None. Elements kept from the BTree object keep their values from it (including the ones that are in both trees), and the other elements keep the values they have in the other tree (or None, if it does not hold values).
+
+        Methodology
+        -----------
+
+        Both trees are iterated side by side as (key, value) pairs, and the smaller pending key (or both, if they are equal) is consumed at each step, so the merge takes O(n + m) comparisons. Once either side is exhausted, the rest of the other side is kept or dropped as a whole.
+        """
+        with_values = self.root.values is not None
+        if with_values:
+            mine = self.iterate_forwards(None, None, True, True, with_values=True)
+            if getattr(other.root, "values", None) is not None:
+                theirs = other.iterate_forwards(
+                    None, None, True, True, with_values=True
+                )
+            else:
+                theirs = zip(other, repeat(None))
+        else:
+            mine = zip(self, repeat(None))
+            theirs = zip(other, repeat(None))
+
+        items = []
+        item = next(mine, None)
+        other_item = next(theirs, None)
+        while item is not None and other_item is not None:
+            if item[0] < other_item[0]:
+                if keep_self:
+                    items.append(item)
+                item = next(mine, None)
+            elif other_item[0] < item[0]:
+                if keep_other:
+                    items.append(other_item)
+                other_item = next(theirs, None)
+            else:
+                if keep_both:
+                    items.append(item)
+                item = next(mine, None)
+                other_item = next(theirs, None)
+        if item is not None and keep_self:
+            items.append(item)
+            items.extend(mine)
+        if other_item is not None and keep_other:
+            items.append(other_item)
+            items.extend(theirs)
+
+        keys = [key for key, _ in items]
+        values = [value for _, value in items] if with_values else None
+        return (keys, values)
+
+    def union(self, other):
+        """Returns a new tree with the elements of the BTree object and of another tree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        other : BTree, BPlusTree
+
+            Another tree.
+
+        Returns
+        -------
+
+        BTree
+
+            A new tree, created by BTree.create_tree(), holding every element that is in either tree.
+
+        Methodology
+        -----------
+
+        The elements of both trees are merged through BTree.merge_sorted(), which already leaves them in crescent order, so the new tree is built by BTree.pack() in linear time instead of through repeated insertions. The same goes for BTree.intersection(), BTree.difference() and BTree.symmetric_difference(), which only keep different elements.
+        """
+        tree = self.create_tree()
+        tree.pack(*self.merge_sorted(other, True, True, True))
+        return tree
+
+    def intersection(self, other):
+        """Returns a new tree with the elements that are both in the BTree object and in another tree, built just like in BTree.union()."""
+        tree = self.create_tree()
+        tree.pack(*self.merge_sorted(other, False, True, False))
+        return tree
+
+    def difference(self, other):
+        """Returns a new tree with the elements of the BTree object that are not in another tree, built just like in BTree.union()."""
+        tree = self.create_tree()
+        tree.pack(*self.merge_sorted(other, True, False, False))
+        return tree
+
+    def symmetric_difference(self, other):
+        """Returns a new tree with the elements that are in exactly one of the BTree object and another tree, built just like in BTree.union()."""
+        tree = self.create_tree()
+        tree.pack(*self.merge_sorted(other, True, False, True))
+        return tree
+
+    def isdisjoint(self, other):
+        """Tells if the BTree object and another tree have no elements in common.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        other : BTree, BPlusTree
+
+            Another tree, which must iterate over its elements in crescent order.
+
+        Returns
+        -------
+
+        bool
+
+            Whether no element is in both trees.
+
+        Methodology
+        -----------
+
+        Both trees are traversed side by side, just like in BTree.merge_sorted(), but the traversal stops as soon as an element is found in both of them, or as soon as either tree is exhausted.
+        """
+        mine = iter(self)
+        theirs = iter(other)
+        element = next(mine, None)
+        other_element = next(theirs, None)
+        while element is not None and other_element is not None:
+            if element < other_element:
+                element = next(mine, None)
+            elif other_element < element:
+                other_element = next(theirs, None)
+            else:
+                return False
+        return True
+
+    def issubset(self, other):
+        """Tells if every element of the BTree object is in another tree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        other : BTree, BPlusTree
+
+            Another tree, which must iterate over its elements in crescent order.
+
+        Returns
+        -------
+
+        bool
+
+            Whether the BTree object is a subset of the other tree.
+
+        Methodology
+        -----------
+
+        If the BTree object has more elements than the other tree, the answer is known right away. Otherwise, both trees are traversed side by side, and the traversal stops as soon as an element of the BTree object is skipped over by the other tree, or as soon as the other tree is exhausted with elements of the BTree object still pending.
+        """
+        if self.num_keys > other.num_keys:
+            return False
+
+        theirs = iter(other)
+        for element in self:
+            for other_element in theirs:
+                if other_element >= element:
+                    break
+            else:
+                return False
+            if other_element != element:
+                return False
+        return True
+
+    def recreate_root(self):
+        """Resets the self.root attribute of the BTree.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        Methodology
+        -----------
+
+        This method is executed when, during a BTree.demote() execution, the self.root Page has all of its keys removed. At this point, the root is actually its only descendent page. BTree.demote() verifies for this possibility, and if appropriate, it calls this method, which merely sets self.root to self.root.descendent_pages[0] and releases the old root through BTree.release_page().
+        """
+        if len(self.root.descendent_pages) > 1:
+            raise ValueError("There's more than a root?")
+        old_root = self.root
+        self.root = self.root.descendent_pages[0]
+        self.release_page(old_root)
+        if self.level_num_pages is not None:
+            self.level_num_pages.pop()
+            self.level_num_keys.pop()
+
+    def use_bloom_filter(self, false_positive_rate=0.01):
+        """Puts a Bloom filter in front of the lookups of the BTree object, or takes it away.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        false_positive_rate : float, None (default = 0.01)
+
+            The rate of absent elements that the filter lets through to the pages. If None, the filter is dropped.
+
+        Methodology
+        -----------
+
+        The filter is a BloomFilter object under self.bloom_filter, built from the current elements through BTree.rebuild_bloom_filter(). From then on, every method that adds elements adds them to it too, and every method that removes elements counts them, through BTree.update_bloom_filter(). BTree.__contains__(), BTree.contains_many() and the lookups of BTreeMap ask the filter first, so an element it has never seen is reported as absent without descending the tree. The filter lives in memory only: it is neither copied to the trees created by other methods nor stored by a DiskBTree.
+        """
+        if false_positive_rate is None:
+            self.bloom_filter = None
+            return
+        self.bloom_filter = BloomFilter(self.num_keys, false_positive_rate)
+        self.rebuild_bloom_filter()
+
+    def rebuild_bloom_filter(self):
+        """Rebuilds the Bloom filter from the current elements of the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object with a Bloom filter.
+
+        Methodology
+        -----------
+
+        The filter is cleared through BloomFilter.clear(), sized for twice the current number of elements (so that it can absorb as many insertions before being rebuilt again), and every element is added to it through an in-order traversal. Its query counters are kept.
+        """
+        self.bloom_filter.clear(2 * self.num_keys)
+        for element in self:
+            self.bloom_filter.add(element)
+
+    def update_bloom_filter(self, added=(), num_removed=0):
+        """Keeps the Bloom filter up to date after elements have been inserted or removed.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object with a Bloom filter.
+
+        added : iterable (default = ())
+
+            The elements that have been inserted.
+
+        num_removed : int (default = 0)
+
+            How many elements have been removed.
 
+        Methodology
+        -----------
 
-class BTree:
-    """The B-Tree object per se."""
+        Inserted elements are added to the filter, which must never miss an element of the BTree object. Removed elements cannot be taken out of it, so they are only counted. Once the filter has taken more elements than it was sized for, or once more than half of its elements are gone (see BloomFilter.is_stale()), it is rebuilt through BTree.rebuild_bloom_filter(). Each rebuild takes O(n), but it only happens after O(n) insertions or removals, so it adds O(1) amortized to each of them. Callers check that there is a filter before calling this method, so trees without one pay nothing but that check.
+        """
+        for element in added:
+            self.bloom_filter.add(element)
+        self.bloom_filter.num_removed += num_removed
+        if self.bloom_filter.is_stale():
+            self.rebuild_bloom_filter()
 
-    def __init__(self, min_num_keys, *args):
-        """The BTree class constructor.
+    def __contains__(self, element):
+        """Tells if the BTree object contains a given element.
 
         Parameters
         ----------
@@ -16,35 +2899,61 @@ class BTree:
 
             A BTree object.
 
-        min_num_keys : int
+        element : SUPPORTED_TYPES
 
-            The degree of the tree. This value will be applied to all Page objects and objects of Page subclasses as well.
+            A supported element to be searched throughout the BTree object.
 
-        *args : list
+        Returns
+        -------
 
-            The elements to be inserted. Any further treatment and measures shall be taken by BTree.insert().
+        bool
+            The result of the search, telling if the given element is in the BTree object or not.
+
+        Methodology
+        -----------
+
+        This is just a wrapper to BTree.find(), but without the additional parameters returned by it. If the BTree object has a Bloom filter (see BTree.use_bloom_filter()), it is asked first, and most absent elements are answered without touching any page.
+
+        """
+        if self.bloom_filter is None:
+            return self.find(element)[0]
+        if not self.bloom_filter.query(element):
+            return False
+        in_tree = self.find(element)[0]
+        if not in_tree:
+            self.bloom_filter.num_false_positives += 1
+        return in_tree
+
+    def __len__(self):
+        """Returns the number of elements in the BTree object, which is kept up to date by every insertion and removal."""
+        return self.num_keys
+
+    def __iter__(self):
+        """Iterates over the elements of the BTree object in crescent order.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
 
         Returns
         -------
 
-        BTree
+        generator
 
-            A BTree object containing the values from *args and the degree stated in min_num_keys.
+            A generator yielding every element of the BTree object, from the smallest to the largest.
 
         Methodology
         -----------
 
-        This constructor initializes the BTree object, which in turn initializes a Page object to be its root attribute.
-
-        If there are any additional arguments under *args, they will be inserted sequentially in the BTree object through Btree.insert().
+        This is just a wrapper to BTree.range() without any bounds.
         """
-        self.root = Page(min_num_keys, self, None)
-        self.num_keys = 0
+        return self.range()
 
-        self.insert(*args)
-
-    def insert(self, *args):
-        """Inserts any amount of items into the BTree.
+    def __reversed__(self):
+        """Iterates over the elements of the BTree object in decrescent order.
 
         Parameters
         ----------
@@ -53,43 +2962,22 @@ class BTree:
 
             A BTree object.
 
-        *args : list
+        Returns
+        -------
+
+        generator
 
-            The elements to be inserted. If there are lists with lists or similar cases, they will be merged into an one-dimensional list, and each element of this list will be inserted subsequently.
+            A generator yielding every element of the BTree object, from the largest to the smallest.
 
         Methodology
         -----------
 
-        After merging *args into an one-dimensional list through merge_to_list(), the method will verify if each item is a supported type: if not, a TypeError will be raised.
-
-        Then, BTree.find() will be called to see if the element is already in the BTree object. If it is, a message will be printed and the loop will move to the next item. Otherwise, Page.insert() will be called to insert the element into the closest page BTree.find() returned.
-
-        If a DegreeOverflowError is raised by Page.insert(), BTree.promote() will be called with the page that needed measures to be taken as a parameter.
+        This is just a wrapper to BTree.range() without any bounds and with reverse=True.
         """
-        arguments = merge_to_list(args)
-        for arg in arguments:
-            if type(arg) in SUPPORTED_TYPES:
-                in_tree, page_pointer, _ = self.find(arg)
-                if in_tree:
-                    raise ValueError(
-                        "The value {} is already in the B-Tree.".format(arg)
-                    )
-                    continue
-                try:
-                    page_pointer.insert(arg)
-                except DegreeOverflowError as e:
-                    self.promote(e.page)
-            else:
-                raise TypeError(
-                    "This type is not supported. Type of the argumenet: {}".format(
-                        str(type(arg))
-                    )
-                )
+        return self.range(reverse=True)
 
-            self.num_keys += 1
-
-    def find(self, element):
-        """Finds an element in the BTree object.
+    def range(self, lo=None, hi=None, inclusive=True, reverse=False):
+        """Iterates lazily over the elements of the BTree object that lie between two bounds.
 
         Parameters
         ----------
@@ -98,46 +2986,43 @@ class BTree:
 
             A BTree object.
 
-        element : Object
+        lo : SUPPORTED_TYPES, None (default = None)
 
-            An object to be found in the BTree.
+            The lower bound of the range. If None, the range starts at the smallest element.
 
-        Returns
-        -------
+        hi : SUPPORTED_TYPES, None (default = None)
 
-        tuple : (in_tree, page_pointer)
+            The upper bound of the range. If None, the range ends at the largest element.
 
-            in_tree : bool
+        inclusive : bool, tuple (default = True)
 
-                Tells if the item is in the BTree object.
+            Whether the bounds themselves belong to the range. A (bool, bool) tuple may be given to set the lower and the upper bound separately.
 
-            page_pointer : Page
+        reverse : bool (default = False)
 
-                If in_tree == True, tells the page in which the element to be found is. Otherwise, tells the page in which the element was expected to be found.
+            Whether to yield the elements in decrescent order.
 
-            page_index : int
+        Returns
+        -------
 
-                The index in which the given element is stored in the page returned under page_pointer. If the element is not found, then the returned value will be -1.
+        generator
+
+            A generator yielding the elements of the range, one at a time.
 
         Methodology
         -----------
 
-        This method will begin its search at self.root, which will be the initial value of the page_pointer variable. Then, it will ask the page if the given element is in the page_pointer Page object. If it is, it will return a tuple telling in the first element that it has been found (True), which is the page in which the element is stored in the second element (Page) and which is the index in which the element is stored (int). If it is not, the first element will be False, the Page returned will be the leaf page in which the method expected to find the element and the index returned will be -1.
+        This method keeps a stack of (page, index) pairs with the path from the root to the current position. It begins by descending once towards the first bound, bisecting each page on the way, and from there it walks the pages in order, going down into a descendent page only when the elements before (or after, if reverse == True) the current key have all been yielded. This way, a range with k elements visits only O(log n + k) pages and no list of elements is ever built. The BTree object must not be modified while the generator is being consumed.
         """
-        page_pointer = self.root
-
-        while True:
-            if element in page_pointer:
-                return (True, page_pointer, page_pointer.index(element))
-            else:
-                new_page_pointer = page_pointer.get_probable_descendent(element)
-                if new_page_pointer:
-                    page_pointer = new_page_pointer
-                else:
-                    return (False, page_pointer, -1)
+        if type(inclusive) is bool:
+            inclusive = (inclusive, inclusive)
+        include_lo, include_hi = inclusive
+        if reverse:
+            return self.iterate_backwards(lo, hi, include_lo, include_hi)
+        return self.iterate_forwards(lo, hi, include_lo, include_hi)
 
-    def promote(self, page):
-        """Promotes an element one level above.
+    def iterate_forwards(self, lo, hi, include_lo, include_hi, with_values=False):
+        """Yields the elements between two bounds in crescent order.
 
         Parameters
         ----------
@@ -146,49 +3031,62 @@ class BTree:
 
             A BTree object.
 
-        page : Page
+        lo, hi : SUPPORTED_TYPES, None
 
-            A Page object containing the elements to be treated.
+            The bounds of the range, as given to BTree.range().
 
-        Methodology
-        -----------
+        include_lo, include_hi : bool
+
+            Whether each bound belongs to the range.
+
+        with_values : bool (default = False)
 
-        The method will begin by separating the keys and descendents that will go to each descendent page, as well as the middle key which will remain in the original page.
+            Whether to yield (key, value) tuples instead of keys.
 
-        It is with these values that the method creates two new pages, setting the parent_page attributes and inserting the respective descendents where they are supposed to be.
+        Methodology
+        -----------
 
-        Finally, it gives the two newly-created Page objects, the middle key of the current Page object and the Page object itself to self.promote_root_page() or self.promote_page(), depending on whether the Page object to be promoted is a root page or not.
+        This method holds the actual traversal of BTree.range() when reverse == False. See BTree.range() for details.
         """
-        middle_index = page.min_num_keys
+        stack = []
+        page_pointer = self.root
+        while True:
+            if lo is None:
+                index = 0
+            elif include_lo:
+                index = bisect_left(page_pointer.keys, lo)
+            else:
+                index = bisect_right(page_pointer.keys, lo)
+            stack.append((page_pointer, index))
+            if not page_pointer.descendent_pages:
+                break
+            page_pointer = page_pointer.descendent_pages[index]
+
+        while stack:
+            page_pointer, index = stack.pop()
+            keys = page_pointer.keys
+            values = page_pointer.values
+            if page_pointer.descendent_pages:
+                if index == len(keys):
+                    continue
+                stack.append((page_pointer, index + 1))
+                indexes = [index]
+                page_pointer = page_pointer.descendent_pages[index + 1]
+                while page_pointer.descendent_pages:
+                    stack.append((page_pointer, 0))
+                    page_pointer = page_pointer.descendent_pages[0]
+                stack.append((page_pointer, 0))
+            else:
+                indexes = range(index, len(keys))
 
-        left_keys = page[:middle_index].copy()
-        middle_key = page[middle_index]
-        right_keys = page[middle_index + 1 :].copy()
-        left_descendents = page.descendent_pages[: middle_index + 1]
-        right_descendents = page.descendent_pages[middle_index + 1 :]
-
-        left_child = left_child = Page(page.min_num_keys, self, None)
-        right_child = Page(page.min_num_keys, self, None)
-        left_child.descendent_pages = left_descendents
-        right_child.descendent_pages = right_descendents
-
-        for descendent in left_child.descendent_pages:
-            descendent.parent_page = left_child
-        for descendent in right_child.descendent_pages:
-            descendent.parent_page = right_child
-
-        for item in left_keys:
-            left_child.insert(item)
-        for item in right_keys:
-            right_child.insert(item)
-
-        if page.is_root():
-            self.promote_root_page(page, left_child, middle_key, right_child)
-        else:
-            self.promote_page(page, left_child, middle_key, right_child)
+            for i in indexes:
+                key = keys[i]
+                if hi is not None and (key > hi or (key == hi and not include_hi)):
+                    return
+                yield (key, values[i]) if with_values else key
 
-    def promote_root_page(self, page, left_child, middle_key, right_child):
-        """Promotes a root page.
+    def iterate_backwards(self, lo, hi, include_lo, include_hi, with_values=False):
+        """Yields the elements between two bounds in decrescent order.
 
         Parameters
         ----------
@@ -197,34 +3095,62 @@ class BTree:
 
             A BTree object.
 
-        page : Page
-
-            The Page object to be promoted.
-
-        left_child : Page
+        lo, hi : SUPPORTED_TYPES, None
 
-            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the left pointer relative to the middle key element.
+            The bounds of the range, as given to BTree.range().
 
-        middle_key : SUPPORTED_TYPES
+        include_lo, include_hi : bool
 
-            The middle element. It will be used as reference during the insertion of the left_child and right_child under the proper descendent_pages list attribute.
+            Whether each bound belongs to the range.
 
-        right_child : Page
+        with_values : bool (default = False)
 
-            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the right pointer relative to the middle key element.
+            Whether to yield (key, value) tuples instead of keys.
 
         Methodology
         -----------
 
-        Since it is the root page we are talking about, the process is relatively straightforward: it is just a matter of setting page.keys to be just the middle key element and the page.descendent_pages list to be just the two newly-created Page objects. The method finishes its job by telling the children who their parent is.
+        This method holds the actual traversal of BTree.range() when reverse == True, mirroring BTree.iterate_forwards(). See BTree.range() for details.
         """
-        page.keys = [middle_key]
-        page.descendent_pages = [left_child, right_child]
-        left_child.parent_page = page
-        right_child.parent_page = page
+        stack = []
+        page_pointer = self.root
+        while True:
+            if hi is None:
+                index = len(page_pointer.keys)
+            elif include_hi:
+                index = bisect_right(page_pointer.keys, hi)
+            else:
+                index = bisect_left(page_pointer.keys, hi)
+            stack.append((page_pointer, index))
+            if not page_pointer.descendent_pages:
+                break
+            page_pointer = page_pointer.descendent_pages[index]
+
+        while stack:
+            page_pointer, index = stack.pop()
+            keys = page_pointer.keys
+            values = page_pointer.values
+            if page_pointer.descendent_pages:
+                if index == 0:
+                    continue
+                stack.append((page_pointer, index - 1))
+                indexes = [index - 1]
+                page_pointer = page_pointer.descendent_pages[index - 1]
+                while page_pointer.descendent_pages:
+                    stack.append((page_pointer, len(page_pointer.keys)))
+                    page_pointer = page_pointer.descendent_pages[-1]
+                stack.append((page_pointer, len(page_pointer.keys)))
+            else:
+                indexes = range(index - 1, -1, -1)
 
-    def promote_page(self, page, left_child, middle_key, right_child):
-        """Promotes a root page.
+            for i in indexes:
+                key = keys[i]
+                if lo is not None and (key < lo or (key == lo and not include_lo)):
+                    return
+                yield (key, values[i]) if with_values else key
+
+    def find_neighbour(self, element, before, inclusive):
+        """Finds the closest element of the BTree object before (or after) a given element.
 
         Parameters
         ----------
@@ -233,51 +3159,63 @@ class BTree:
 
             A BTree object.
 
-        page : Page
+        element : SUPPORTED_TYPES
 
-            The Page object to be promoted.
+            The element to be taken as reference. It does not need to be in the BTree object.
 
-        left_child : Page
+        before : bool
 
-            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the left pointer relative to the middle key element.
+            Whether to look for the largest element before the given one (True) or for the smallest element after it (False).
 
-        middle_key : SUPPORTED_TYPES
+        inclusive : bool
 
-            The middle element. It will be used as reference during the insertion of the left_child and right_child under the proper descendent_pages list attribute.
+            Whether the given element itself may be returned, if it is in the BTree object.
 
-        right_child : Page
+        Returns
+        -------
 
-            A Page object created by BTree.promote(), which will be set under the descendent_pages list to be the right pointer relative to the middle key element.
+        SUPPORTED_TYPES, None
+
+            The element found, or None if there is no such element.
 
         Methodology
         -----------
 
-        Although the goal of this method is virtually the same as BTree.promote_root_page(), its executions are quite different. The pages that fall under this method can be leaf pages or pages in intermediate levels. This is the most difficult case, since just a wrong pointer is enough to generate unexpected behavior during the use of this BTree object.
-
-        First, the method saves the parent_page and eliminates the page object completely. The necessary information is already stored under the remaining parameters provided. Then, it inserts the middle_key in the parent_page, obtains the index in which the middle key element has been stored and uses it as reference to insert the left_child and right_child Page objects. It finishes its job by telling each descendent page who their parent is.
-
-        Before wrapping it up, the method has to verify if there has been a violation of the B-Tree rules. It does so by verifying the proper methods and calling BTree.promote(), BTree.demote() or neither.
+        This method descends once from the root, bisecting each page. The key right before (or after) the bisection point of each page is closer to the given element than any key seen in the pages above, so it becomes the candidate, and the descent goes on into the descendent page at the bisection point, which holds every key between the candidate and the given element. The last candidate is the answer, which takes O(log n) steps whether the given element is in the BTree object or not.
         """
-        parent_page = page.parent_page
-        parent_page.descendent_pages.remove(page)
-        del page
-
-        parent_page.insert(middle_key, will_raise=False)
-        insertion_index = parent_page.index(middle_key)
-
-        parent_page.descendent_pages.insert(insertion_index, right_child)
-        parent_page.descendent_pages.insert(insertion_index, left_child)
-
-        left_child.parent_page = parent_page
-        right_child.parent_page = parent_page
-
-        if len(parent_page) > parent_page.max_num_keys:
-            self.promote(parent_page)
-        elif not parent_page.is_root() and len(parent_page) < parent_page.min_num_keys:
-            self.demote(parent_page)
-
-    def demote(self, page):
-        """Demotes a page of the BTree object.
+        check_type(element)
+        bisect = bisect_right if before == inclusive else bisect_left
+        candidate = None
+        page_pointer = self.root
+        while True:
+            keys = page_pointer.keys
+            index = bisect(keys, element)
+            if before and index > 0:
+                candidate = keys[index - 1]
+            elif not before and index < len(keys):
+                candidate = keys[index]
+            if candidate == element or page_pointer.is_leaf():
+                return candidate
+            page_pointer = page_pointer.descendent_pages[index]
+
+    def floor(self, element):
+        """Returns the largest element of the BTree object that is smaller than or equal to a given element, or None if there is not any (see BTree.find_neighbour())."""
+        return self.find_neighbour(element, before=True, inclusive=True)
+
+    def ceiling(self, element):
+        """Returns the smallest element of the BTree object that is larger than or equal to a given element, or None if there is not any (see BTree.find_neighbour())."""
+        return self.find_neighbour(element, before=False, inclusive=True)
+
+    def predecessor(self, element):
+        """Returns the largest element of the BTree object that is smaller than a given element, or None if there is not any (see BTree.find_neighbour())."""
+        return self.find_neighbour(element, before=True, inclusive=False)
+
+    def successor(self, element):
+        """Returns the smallest element of the BTree object that is larger than a given element, or None if there is not any (see BTree.find_neighbour())."""
+        return self.find_neighbour(element, before=False, inclusive=False)
+
+    def rank(self, element, inclusive=False):
+        """Counts the elements of the BTree object that are smaller than a given element.
 
         Parameters
         ----------
@@ -286,33 +3224,46 @@ class BTree:
 
             A BTree object.
 
-        page : Page
+        element : SUPPORTED_TYPES
 
-            A Page object to be demoted.
+            The element whose rank is wanted. It does not need to be in the BTree object.
 
-        Methodology
-        -----------
+        inclusive : bool (default = False)
 
-        At the beginning of the execution of this method, the parent_page and the index in which the page is stored under parent_page.descendent_pages are saved in parent_page and page_index, respectively. Then, it decides which sibling page will be part of the merge procedure, calling either BTree.demote_left() or BTree.demote_right().
+            Whether an element equal to the given one should be counted as well.
 
-        After these methods are done with their jobs, this method moves forward to a set of verifications: if, after this procedure, the parent_page violates the B-Tree minimum degree rule, then BTree.demote() is called with parent_page as a parameter. Otherwise, if parent_page actually is the root of the BTree object and its length is 0, it means that the depth of the B-Tree has lowered, and the self.root attribute must be resetted. This is done by calling BTree.recreate_root().
+        Returns
+        -------
 
-        """
-        parent_page = page.parent_page
-        page_index = page.parent_page.descendent_pages.index(page)
-        if page.get_left_page():
-            self.demote_left(page, page_index)
-        else:
-            self.demote_right(page, page_index)
+        int
 
-        if not parent_page.is_root() and len(parent_page) < parent_page.min_num_keys:
-            self.demote(parent_page)
+            How many elements are smaller than (or, if inclusive == True, smaller than or equal to) the given element. For an element of the BTree object, this is its index in the sorted order.
 
-        elif parent_page.is_root() and len(parent_page) == 0:
-            self.recreate_root()
+        Methodology
+        -----------
 
-    def demote_left(self, page, page_index):
-        """Merges the page in question with the page at its left, taking an element from the parent page.
+        This method descends once from the root towards the element, bisecting each page. At each page, the keys before the bisection point and the sizes of the descendent pages to their left are added to the rank, so that only one path is visited and the whole count takes O(log n) steps. If the element is found in an internal page, the size of the descendent page right before it is added as well and the descent stops there.
+        """
+        check_type(element)
+        bisect = bisect_right if inclusive else bisect_left
+        rank = 0
+        page_pointer = self.root
+        while True:
+            keys = page_pointer.keys
+            index = bisect(keys, element)
+            rank += index
+            if page_pointer.is_leaf():
+                return rank
+
+            descendents = page_pointer.descendent_pages
+            for descendent in descendents[:index]:
+                rank += descendent.size
+            if not inclusive and index < len(keys) and keys[index] == element:
+                return rank + descendents[index].size
+            page_pointer = descendents[index]
+
+    def select(self, index):
+        """Returns the element of the BTree object at a given position of the sorted order.
 
         Parameters
         ----------
@@ -321,39 +3272,42 @@ class BTree:
 
             A BTree object.
 
-        page : Page
+        index : int
 
-            The Page object which will undergo the merge procedure.
+            The position of the element, starting at 0. Negative indexes count from the end, just like in lists. An IndexError is raised if it is out of range.
+
+        Returns
+        -------
 
-        page_index : int
+        SUPPORTED_TYPES
 
-            The index in which the page is stored in page.parent_page.descendent_pages.
+            The element at the given position.
 
         Methodology
         -----------
 
-        After obtaining the parent page, the element to be taken from it and the left page, this method will move on to the proper page merge. Actually, what happens is that the left page receives the middle element taken from parent_page and the remaining elements from page, as well as the descendent pages of page. Then, page is removed and deleted.
-
-        The method finishes by updating the descendents of the left page with regards to their parent and verifying whether the resulting left_page has surpassed the maximum number of keys it is allowed to store in the BTree object. If so, BTree.promote() is called with left_page as a parameter.
+        This method descends from the root, skipping the descendent pages (and the keys between them) that lie entirely before the wanted position, as told by their size attributes. Every page visited is on a single path, so the element is found in O(log n) steps.
         """
-        parent_page = page.parent_page
-        left_page = page.get_left_page()
-        middle_element = parent_page[page_index - 1]
-        parent_page.remove(middle_element, will_raise=False)
-        left_page.insert(middle_element, will_raise=False)
-        for element in page:
-            left_page.insert(element, will_raise=False)
-        left_page.descendent_pages = left_page.descendent_pages + page.descendent_pages
-        parent_page.descendent_pages.remove(page)
-        del page
+        num_keys = self.root.size
+        if index < 0:
+            index += num_keys
+        if not 0 <= index < num_keys:
+            raise IndexError("The index {} is out of range.".format(index))
 
-        left_page.update_descendents_parent_references()
-
-        if len(left_page) > left_page.max_num_keys:
-            self.promote(left_page)
-
-    def demote_right(self, page, page_index):
-        """Merges the page in question with the page at its right, taking an element from the parent page.
+        page_pointer = self.root
+        while not page_pointer.is_leaf():
+            for key_index, descendent in enumerate(page_pointer.descendent_pages):
+                if index < descendent.size:
+                    page_pointer = descendent
+                    break
+                index -= descendent.size
+                if index == 0:
+                    return page_pointer[key_index]
+                index -= 1
+        return page_pointer[index]
+
+    def count(self, lo=None, hi=None, inclusive=True):
+        """Counts the elements of the BTree object that lie between two bounds.
 
         Parameters
         ----------
@@ -362,128 +3316,93 @@ class BTree:
 
             A BTree object.
 
-        page : Page
+        lo, hi, inclusive
 
-            The Page object which will undergo the merge procedure.
+            The same as in BTree.range().
+
+        Returns
+        -------
 
-        page_index : int
+        int
 
-            The index in which the page is stored in page.parent_page.descendent_pages.
+            How many elements BTree.range() would yield for the same bounds.
 
         Methodology
         -----------
 
-        After obtaining the parent page, the element to be taken from it and the right page, this method will move on to the proper page merge. Actually, what happens is that the right page receives the middle element taken from parent_page and the remaining elements from page, as well as the descendent pages of page. Then, page is removed and deleted.
-
-        The method finishes by updating the descendents of the right page with regards to their parent and verifying whether the resulting right_page has surpassed the maximum number of keys it is allowed to store in the BTree object. If so, BTree.promote() is called with right_page as a parameter.
+        The count is the difference between the ranks of the two bounds (see BTree.rank()), so it takes O(log n) steps no matter how many elements lie between them.
         """
-        parent_page = page.parent_page
-        right_page = page.get_right_page()
-        middle_element = parent_page[page_index]
-        parent_page.remove(middle_element, will_raise=False)
-        right_page.insert(middle_element, will_raise=False)
-        for element in page:
-            right_page.insert(element, will_raise=False)
-        right_page.descendent_pages = (
-            page.descendent_pages + right_page.descendent_pages
-        )
-        parent_page.descendent_pages.remove(page)
-        del page
-
-        right_page.update_descendents_parent_references()
+        if type(inclusive) is bool:
+            inclusive = (inclusive, inclusive)
+        include_lo, include_hi = inclusive
+        lo_rank = 0 if lo is None else self.rank(lo, not include_lo)
+        hi_rank = self.root.size if hi is None else self.rank(hi, include_hi)
+        return max(hi_rank - lo_rank, 0)
 
-        if len(right_page) > right_page.max_num_keys:
-            self.promote(right_page)
-
-    def remove(self, *args):
-        """Removes any amount of items of the BTree object.
+    def prefix_scan(self, prefix, limit=None):
+        """Iterates lazily over the elements that start with a prefix.
 
         Parameters
         ----------
 
         self : BTree
 
-            A BTree object.
-
-        *args : list
-
-            The elements to be removed. If there are lists with lists or similar cases, they will be merged into an one-dimensional list, and each element of this list will be inserted subsequently.
+            A BTree object of str elements.
 
-        Methodology
-        -----------
+        prefix : str
 
-        After merging *args into an one-dimensional list, BTree.find() will be called to see if the element is already in the BTree object. If it is not, an ValueError will be raised. Otherwise, the method will move forward to see if the Page is a leaf page or not by calling Page.is_leaf(). If it is, then it is just a matter of calling Page.remove() to remove the element of the page BTree.find() returned and deal with the possibility of a DegreeUnderflowError being raised. If it is not a leaf page, then the element stored in it has to be replaced with an adjacent element first. This is done by calling Page.replace_with_leaf_element(). The possibility of a DegreeUnderflowError exists here as well.
+            The prefix. The empty prefix matches every element.
 
-        If a DegreeUnderflowError is raised by Page.remove() or Page.replace_with_leaf_element(), BTree.demote() will be called with the page that needs measures to be taken as a parameter.
-        """
-        arguments = merge_to_list(args)
-        for arg in arguments:
-            in_tree, page_pointer, arg_index = self.find(arg)
-            if in_tree == True:
-                if page_pointer.is_leaf():
-                    try:
-                        page_pointer.remove(arg)
-                    except DegreeUnderflowError as e:
-                        if e.page.can_borrow():
-                            e.page.borrow()
-                        else:
-                            self.demote(e.page)
-                else:
-                    try:
-                        page_pointer.replace_with_leaf_element(arg)
-                    except DegreeUnderflowError as e:
-                        self.demote(e.page)
-            else:
-                raise ValueError("The value {} is not in this tree.".format(arg))
+        limit : int, None (default = None)
 
-    def recreate_root(self):
-        """Resets the self.root attribute of the BTree.
+            The maximum number of elements to be yielded. If None, every matching element is.
 
-        Parameters
-        ----------
+        Returns
+        -------
 
-        self : BTree
+        generator
 
-            A BTree object.
+            A generator yielding the matching elements, in crescent order.
 
         Methodology
         -----------
 
-        This method is executed when, during a BTree.demote() execution, the self.root Page has all of its keys removed. At this point, the root is actually its only descendent page. BTree.demote() verifies for this possibility, and if appropriate, it calls this method, which merely sets self.root to self.root.descendent_pages[0], sets self.root.parent_page to None and updates the descendent_pages accordingly.
+        The elements that start with the prefix are exactly the ones between the prefix itself (inclusive) and the bound returned by get_prefix_bound() (exclusive), so this is just BTree.range() over those bounds: a single descent seeks the first element greater than or equal to the prefix, and the walk stops at the first element that does not match any more. Yielding k elements therefore visits O(log n + k) pages, no matter how many elements the BTree object has.
         """
-        if len(self.root.descendent_pages) > 1:
-            raise ValueError("There's more than a root?")
-        self.root = self.root.descendent_pages[0]
-        self.root.parent_page = None
-        self.root.update_descendents_parent_references()
+        if type(prefix) is not str:
+            raise TypeError("The prefix must be a str object.")
+        elements = self.range(prefix, get_prefix_bound(prefix), (True, False))
+        return elements if limit is None else islice(elements, limit)
 
-    def __contains__(self, element):
-        """Tells if the BTree object contains a given element.
+    def count_prefix(self, prefix):
+        """Counts the elements that start with a prefix.
 
         Parameters
         ----------
 
         self : BTree
 
-            A BTree object.
+            A BTree object of str elements.
 
-        element : SUPPORTED_TYPES
+        prefix : str
 
-            A supported element to be searched throughout the BTree object.
+            The prefix.
 
         Returns
         -------
 
-        bool
-            The result of the search, telling if the given element is in the BTree object or not.
+        int
+
+            How many elements BTree.prefix_scan() would yield for the prefix.
 
         Methodology
         -----------
 
-        This is just a wrapper to BTree.find(), but without the additional parameters returned by it.
-
+        The same bounds of BTree.prefix_scan() are handed to BTree.count(), which subtracts their ranks, so the count takes O(log n) steps without visiting the matching elements at all.
         """
-        return self.find(element)[0]
+        if type(prefix) is not str:
+            raise TypeError("The prefix must be a str object.")
+        return self.count(prefix, get_prefix_bound(prefix), (True, False))
 
     def __repr__(self):
         """The visual representation of the BTree object.
@@ -532,6 +3451,110 @@ class BTree:
 
         return "\n".join(representations)
 
+    def stats(self):
+        """Reports the shape of the BTree object.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        Returns
+        -------
+
+        dict
+
+            height : int
+
+                The number of levels, which is 1 for a tree whose root is a leaf page.
+
+            num_keys : int
+
+                The number of elements.
+
+            num_pages : int
+
+                The number of pages.
+
+            fill_factor : float
+
+                num_keys / (num_pages * max_num_keys), that is, how full the pages are on average.
+
+            levels : list
+
+                A dict for each level, from the root down, with the num_pages, num_keys and fill_factor of that level alone.
+
+        Methodology
+        -----------
+
+        Usually, nothing is counted here: the number of keys and the number of pages and keys of each level are kept up to date by the methods that change them, either by inserting into and removing from leaf pages (see BTree.update_leaf_count()) or by splitting and merging pages (see BTree.update_level_counts()), and a DiskBTree stores them in its page file. The report therefore takes O(height) time, instead of O(n) for walking the whole tree. BTree.join() and BTree.remove_range() count the pages they create and release along their cuts, but the pages of the subtrees that BTree.split_at() hands over (or that BTree.remove_range() drops, in memory) cannot be counted without visiting them, so these methods mark the counters as stale (None) to stay O(log n). So does a DiskBTree whose page file could not hold them. Stale counters are recounted by the next report through BTree.recount_levels(), which takes O(n) time once.
+        """
+        if self.level_num_pages is None:
+            self.recount_levels()
+        max_num_keys = self.root.max_num_keys
+        num_pages = sum(self.level_num_pages)
+        levels = [
+            {
+                "num_pages": level_num_pages,
+                "num_keys": level_num_keys,
+                "fill_factor": level_num_keys / (level_num_pages * max_num_keys),
+            }
+            for level_num_pages, level_num_keys in zip(
+                reversed(self.level_num_pages), reversed(self.level_num_keys)
+            )
+        ]
+        return {
+            "height": len(self.level_num_pages),
+            "num_keys": self.num_keys,
+            "num_pages": num_pages,
+            "fill_factor": self.num_keys / (num_pages * max_num_keys),
+            "levels": levels,
+        }
+
+    def recount_levels(self):
+        """Counts the pages and keys of each level from scratch through BTree.count_subtree(), refreshing the counters of BTree.stats()."""
+        self.level_num_pages, self.level_num_keys = self.count_subtree(self.root)
+
+    def count_subtree(self, page):
+        """Counts the pages and keys of each level of a subtree, one level at a time.
+
+        Parameters
+        ----------
+
+        self : BTree
+
+            A BTree object.
+
+        page : Page
+
+            The root of the subtree.
+
+        Returns
+        -------
+
+        tuple : (level_num_pages, level_num_keys)
+
+            Two lists with the number of pages and keys of each level of the subtree, from the leaves up, as in self.level_num_pages and self.level_num_keys.
+        """
+        level_num_pages = []
+        level_num_keys = []
+        pages = [page]
+        while True:
+            level_num_pages.append(len(pages))
+            level_num_keys.append(sum(len(level_page) for level_page in pages))
+            if not pages[0].descendent_pages:
+                break
+            pages = [
+                descendent
+                for level_page in pages
+                for descendent in level_page.descendent_pages
+            ]
+        level_num_pages.reverse()
+        level_num_keys.reverse()
+        return (level_num_pages, level_num_keys)
+
     def get_depth(self):
         """Returns the depth of the BTree object.
 
@@ -552,11 +3575,13 @@ class BTree:
         Methodology
         -----------
 
-        This method just calls BTree.get_pages_of_depth() with 1 as a parameter, and increments the value by one unit until it returns None, taking note of the last number. At the end, it returns the depth obtained.
+        Since every leaf page lies at the same depth, this method just follows the first descendent page from the root down to a leaf page, counting the levels on the way. It therefore visits a single page per level, instead of gathering whole levels through BTree.get_pages_of_depth().
         """
         depth = 0
-        while self.get_pages_of_depth(depth + 1):
+        page_pointer = self.root
+        while page_pointer.descendent_pages:
             depth += 1
+            page_pointer = page_pointer.descendent_pages[0]
         return depth
 
     def get_pages_of_depth(self, depth, merge_lists=True):
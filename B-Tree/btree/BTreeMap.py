@@ -0,0 +1,447 @@
+from itertools import islice
+from operator import itemgetter
+
+from btree.helper import *
+from btree.BTree import *
+from btree.Page import *
+
+
+class BTreeMap(BTree):
+    """A B-Tree that maps each key to a value, storing both in its pages."""
+
+    def __init__(
+        self, min_num_keys, items=(), top_down=False, b_star=False, key_type=None
+    ):
+        """The BTreeMap class constructor.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        min_num_keys : int
+
+            The degree of the tree.
+
+        items : dict, iterable (default = ())
+
+            The initial contents of the map, either as a dict (or any object with an items() method) or as an iterable of (key, value) pairs.
+
+        top_down : bool (default = False)
+
+            Whether to insert and remove in a single pass from the root down, as in BTree.__init__().
+
+        b_star : bool (default = False)
+
+            Whether to follow the B*-tree policy, as in BTree.__init__().
+
+        key_type : type, None (default = None)
+
+            The type of every key, as in BTree.__init__(). The values are always kept in lists.
+
+        Returns
+        -------
+
+        BTreeMap
+
+            A BTreeMap object containing the given items.
+
+        Methodology
+        -----------
+
+        The BTreeMap object is a BTree object whose pages hold a values list side by side with their keys (see BTreeMap.create_page()). Since every method of BTree and Page that moves keys around moves their values along with them, the whole B-Tree machinery works unchanged. Keys inserted through BTree.insert() get None as their value.
+        """
+        BTree.__init__(
+            self, min_num_keys, top_down=top_down, b_star=b_star, key_type=key_type
+        )
+        self.update(items)
+
+    @classmethod
+    def bulk_load(cls, min_num_keys, items, fill_factor=1.0, **kwargs):
+        """Builds a BTreeMap object from (key, value) pairs, bottom-up.
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The BTreeMap class (or subclass) to be instantiated.
+
+        min_num_keys : int
+
+            The degree of the tree.
+
+        items : dict, iterable
+
+            The items to be stored, either as a dict or as an iterable of (key, value) pairs. If the pairs are not in crescent order of their keys already, they will be sorted first.
+
+        fill_factor : float (default = 1.0)
+
+            How full each page should be, as in BTree.bulk_load().
+
+        **kwargs : dict
+
+            Further keyworded arguments to be given to the constructor of cls.
+
+        Returns
+        -------
+
+        BTreeMap
+
+            A BTreeMap object containing the given items.
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        tree = cls(min_num_keys, **kwargs)
+        items = list(items)
+        for key, _ in items:
+            tree.check_key(key)
+        if any(items[i][0] >= items[i + 1][0] for i in range(len(items) - 1)):
+            items.sort(key=itemgetter(0))
+            for i in range(len(items) - 1):
+                if items[i][0] == items[i + 1][0]:
+                    raise ValueError(
+                        "The key {} is repeated.".format(items[i][0])
+                    )
+
+        tree.pack(
+            [key for key, _ in items], [value for _, value in items], fill_factor
+        )
+        return tree
+
+    def create_page(self):
+        """Creates a new, empty Page object that holds values.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        Returns
+        -------
+
+        Page
+
+            The newly-created Page object, whose values attribute is an empty list.
+        """
+        page = BTree.create_page(self)
+        page.values = []
+        return page
+
+    def put(self, key, value):
+        """Maps a key to a value, inserting the key if it is not in the BTreeMap yet.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        key : SUPPORTED_TYPES
+
+            The key.
+
+        value : object
+
+            The value to be stored with the key.
+
+        Methodology
+        -----------
+
+        BTree.find_path() is called for the key. If it is found, its value is just replaced. Otherwise, the key and its value are inserted through BTree.insert_at(), just like BTree.insert() does. In top-down mode, BTree.insert_top_down() does both in a single pass.
+        """
+        self.check_key(key)
+        if self.top_down:
+            self.insert_top_down(key, value, overwrite=True)
+            return
+        in_tree, path = self.find_path(key)
+        if in_tree:
+            page_pointer, index = path[-1]
+            page_pointer.values[index] = value
+            return
+
+        self.insert_at(path, key, value)
+
+    def update(self, items):
+        """Puts several items into the BTreeMap.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        items : dict, iterable
+
+            The items, either as a dict (or any object with an items() method) or as an iterable of (key, value) pairs.
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        for key, value in items:
+            self.put(key, value)
+
+    def get(self, key, default=None):
+        """Returns the value of a key, or a default value if the key is not in the BTreeMap.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        key : SUPPORTED_TYPES
+
+            The key.
+
+        default : object (default = None)
+
+            What to return if the key is not found.
+
+        Returns
+        -------
+
+        object
+
+            The value of the key, or default.
+        """
+        in_tree, value = self.lookup(key)
+        return value if in_tree else default
+
+    def lookup(self, key):
+        """Finds a key and its value, asking the Bloom filter first.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        key : SUPPORTED_TYPES
+
+            The key.
+
+        Returns
+        -------
+
+        tuple : (in_tree, value)
+
+            in_tree : bool
+
+                Whether the key is in the BTreeMap.
+
+            value : object
+
+                The value of the key, or None if it is not in the BTreeMap.
+
+        Methodology
+        -----------
+
+        If the BTreeMap has a Bloom filter (see BTree.use_bloom_filter()) and the filter rules the key out, the answer is given without touching any page, just like in BTree.__contains__(). Otherwise, the key is found through BTree.find().
+        """
+        if self.bloom_filter is not None and not self.bloom_filter.query(key):
+            return (False, None)
+        in_tree, page_pointer, index = self.find(key)
+        if in_tree:
+            return (True, page_pointer.values[index])
+        if self.bloom_filter is not None:
+            self.bloom_filter.num_false_positives += 1
+        return (False, None)
+
+    def get_many(self, keys, default=None):
+        """Returns the values of a batch of keys, through a single traversal of the BTreeMap.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        keys : iterable
+
+            The keys, in any order. Repeated keys are allowed.
+
+        default : object (default = None)
+
+            What to return for the keys that are not found.
+
+        Returns
+        -------
+
+        list
+
+            The value of each key (or default), in the order the keys were given.
+
+        Methodology
+        -----------
+
+        The keys are sorted and handed to BTree.find_sorted(), just like in BTree.contains_many() (Bloom filter included), and only the runs of keys that have been found are looked up in their pages.
+        """
+        keys = list(keys)
+        positions = range(len(keys))
+        if self.bloom_filter is not None:
+            positions = [
+                position
+                for position in positions
+                if self.bloom_filter.query(keys[position])
+            ]
+        order = sorted(positions, key=keys.__getitem__)
+        probes = [keys[position] for position in order]
+
+        results = [default] * len(keys)
+        for start, end, in_tree, page_pointer, index in self.find_sorted(probes):
+            if in_tree:
+                value = page_pointer.values[index]
+                for position in order[start:end]:
+                    results[position] = value
+            elif self.bloom_filter is not None:
+                self.bloom_filter.num_false_positives += end - start
+        return results
+
+    def pop(self, key, *default):
+        """Removes a key from the BTreeMap and returns its value.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        key : SUPPORTED_TYPES
+
+            The key to be removed.
+
+        *default : list
+
+            Optionally, a single value to be returned if the key is not found. If it is not given, a KeyError is raised instead.
+
+        Returns
+        -------
+
+        object
+
+            The value the key had, or the default value.
+
+        Methodology
+        -----------
+
+        The key is found through BTree.find_path() and removed through BTree.remove_at(), which returns its value and takes care of the rebalancing (and of the values of the keys it moves around). In top-down mode, BTree.remove_top_down() is used instead.
+        """
+        if self.top_down:
+            try:
+                _, value = self.remove_top_down(key)
+            except ValueError:
+                if default:
+                    return default[0]
+                raise KeyError(key)
+            return value
+
+        in_tree, path = self.find_path(key)
+        if not in_tree:
+            if default:
+                return default[0]
+            raise KeyError(key)
+
+        _, value = self.remove_at(path)
+        return value
+
+    def setdefault(self, key, default=None):
+        """Returns the value of a key, putting a default value for it first if the key is not in the BTreeMap.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        key : SUPPORTED_TYPES
+
+            The key.
+
+        default : object (default = None)
+
+            The value to be stored if the key is not found.
+
+        Returns
+        -------
+
+        object
+
+            The value of the key.
+        """
+        in_tree, value = self.lookup(key)
+        if in_tree:
+            return value
+        self.put(key, default)
+        return default
+
+    def items(self, lo=None, hi=None, inclusive=True, reverse=False):
+        """Iterates lazily over the (key, value) pairs whose keys lie between two bounds.
+
+        Parameters
+        ----------
+
+        self : BTreeMap
+
+            A BTreeMap object.
+
+        lo, hi, inclusive, reverse
+
+            The same as in BTree.range().
+
+        Returns
+        -------
+
+        generator
+
+            A generator yielding (key, value) tuples, in the order of their keys.
+        """
+        if type(inclusive) is bool:
+            inclusive = (inclusive, inclusive)
+        if reverse:
+            return self.iterate_backwards(lo, hi, *inclusive, with_values=True)
+        return self.iterate_forwards(lo, hi, *inclusive, with_values=True)
+
+    def prefix_items(self, prefix, limit=None):
+        """Iterates lazily over the (key, value) pairs whose keys start with a prefix, within the same bounds and limit as BTree.prefix_scan()."""
+        if type(prefix) is not str:
+            raise TypeError("The prefix must be a str object.")
+        items = self.iterate_forwards(
+            prefix, get_prefix_bound(prefix), True, False, with_values=True
+        )
+        return items if limit is None else islice(items, limit)
+
+    def keys(self, lo=None, hi=None, inclusive=True, reverse=False):
+        """Iterates lazily over the keys that lie between two bounds, just like BTree.range()."""
+        return self.range(lo, hi, inclusive, reverse)
+
+    def values(self, lo=None, hi=None, inclusive=True, reverse=False):
+        """Iterates lazily over the values whose keys lie between two bounds, in the order of their keys."""
+        return (value for _, value in self.items(lo, hi, inclusive, reverse))
+
+    def __getitem__(self, key):
+        """Returns the value of a key, raising a KeyError if it is not in the BTreeMap."""
+        in_tree, value = self.lookup(key)
+        if not in_tree:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        """Maps a key to a value through BTreeMap.put()."""
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        """Removes a key, raising a KeyError if it is not in the BTreeMap."""
+        if key not in self:
+            raise KeyError(key)
+        self.remove(key)
@@ -0,0 +1,240 @@
+from math import ceil, log
+
+
+class BloomFilter:
+    """A probabilistic set that tells for sure when an element has never been added to it."""
+
+    def __init__(self, capacity, false_positive_rate=0.01):
+        """The BloomFilter class constructor.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        capacity : int
+
+            How many elements the filter is sized for. More elements can be added, but the false positive rate grows beyond the given one.
+
+        false_positive_rate : float (default = 0.01)
+
+            The probability of an element that has never been added being reported as (maybe) present, once capacity elements have been added.
+
+        Returns
+        -------
+
+        BloomFilter
+
+            An empty BloomFilter object.
+
+        Methodology
+        -----------
+
+        A filter with m bits and k hash functions holding n elements has a false positive rate of about (1 - e^(-kn/m))^k, which is minimized by k = (m / n) ln 2. For a target rate p, this gives m = -n ln p / (ln 2)^2 bits, which are stored in a bytearray. The filter keeps counters of the queries it has answered (see BloomFilter.get_stats()), which are kept by BloomFilter.clear().
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(
+                "The false positive rate must be in the (0, 1) interval."
+            )
+
+        self.false_positive_rate = false_positive_rate
+        self.num_queries = 0
+        self.num_negatives = 0
+        self.num_false_positives = 0
+        self.clear(capacity)
+
+    def clear(self, capacity):
+        """Empties the filter, resizing it for a new capacity.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        capacity : int
+
+            How many elements the filter is sized for, as in BloomFilter.__init__().
+        """
+        self.capacity = max(1, capacity)
+        self.num_bits = max(
+            8,
+            ceil(-self.capacity * log(self.false_positive_rate) / log(2) ** 2),
+        )
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.num_elements = 0
+        self.num_removed = 0
+
+    def get_indexes(self, element):
+        """Returns the indexes of the bits of an element.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        element : SUPPORTED_TYPES
+
+            The element.
+
+        Returns
+        -------
+
+        generator
+
+            A generator yielding self.num_hashes bit indexes.
+
+        Methodology
+        -----------
+
+        Instead of k independent hash functions, the indexes are derived from two hashes of the element through double hashing (h1 + i * h2 mod m), which behaves just as well for a Bloom filter. The hashes are taken from tuples holding the element, since the hash of a small int is the int itself. Elements that compare equal (such as 1 and 1.0) have the same hash, just as they are the same key for a BTree object. Python salts the hashes of str objects per process, so the filter must not be stored.
+        """
+        first = hash((element, 0))
+        second = hash((element, 1)) | 1
+        num_bits = self.num_bits
+        return ((first + i * second) % num_bits for i in range(self.num_hashes))
+
+    def add(self, element):
+        """Sets the bits of an element.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be added.
+        """
+        bits = self.bits
+        for index in self.get_indexes(element):
+            bits[index >> 3] |= 1 << (index & 7)
+        self.num_elements += 1
+
+    def __contains__(self, element):
+        """Tells if every bit of an element is set, that is, if the element may have been added.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        element : SUPPORTED_TYPES
+
+            The element.
+
+        Returns
+        -------
+
+        bool
+
+            False if the element has certainly never been added, True otherwise.
+
+        Methodology
+        -----------
+
+        The indexes are the same as in BloomFilter.get_indexes(), but they are computed inline, stopping at the first bit that is not set. Most absent elements are ruled out by the first one or two bits, so this is much cheaper than computing every index, which matters since the filter exists to be cheaper than a descent of the tree.
+        """
+        index = hash((element, 0))
+        step = hash((element, 1)) | 1
+        bits = self.bits
+        num_bits = self.num_bits
+        for _ in range(self.num_hashes):
+            bit = index % num_bits
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            index += step
+        return True
+
+    def query(self, element):
+        """Tells if an element may have been added, just like BloomFilter.__contains__(), counting the query and its answer for BloomFilter.get_stats()."""
+        self.num_queries += 1
+        if self.__contains__(element):
+            return True
+        self.num_negatives += 1
+        return False
+
+    def is_stale(self):
+        """Tells if the filter should be rebuilt.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        Returns
+        -------
+
+        bool
+
+            Whether the filter holds more elements than it is sized for, or whether more than half of the elements added to it have been removed from the tree since then.
+
+        Methodology
+        -----------
+
+        Bits cannot be unset, since other elements may share them, so removed elements keep answering as (maybe) present. This does not make the filter wrong, only less useful, which is why it is rebuilt after heavy removals as well as when it overflows its capacity.
+        """
+        return (
+            self.num_elements > self.capacity
+            or 2 * self.num_removed > self.num_elements
+        )
+
+    def get_stats(self):
+        """Reports how useful the filter has been.
+
+        Parameters
+        ----------
+
+        self : BloomFilter
+
+            A BloomFilter object.
+
+        Returns
+        -------
+
+        dict
+
+            num_queries : int
+
+                The number of queries answered.
+
+            num_negatives : int
+
+                How many of them have been answered by the filter alone, that is, how many lookups it has short-circuited.
+
+            num_false_positives : int
+
+                How many of them have passed the filter for elements that were not in the tree, as reported by the tree.
+
+            short_circuit_rate : float
+
+                num_negatives / num_queries.
+
+            false_positive_rate : float
+
+                The observed rate of false positives among the queries for absent elements.
+        """
+        num_absent = self.num_negatives + self.num_false_positives
+        return {
+            "num_queries": self.num_queries,
+            "num_negatives": self.num_negatives,
+            "num_false_positives": self.num_false_positives,
+            "short_circuit_rate": (
+                self.num_negatives / self.num_queries if self.num_queries else 0.0
+            ),
+            "false_positive_rate": (
+                self.num_false_positives / num_absent if num_absent else 0.0
+            ),
+        }
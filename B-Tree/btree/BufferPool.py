@@ -0,0 +1,358 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from weakref import WeakValueDictionary
+from zlib import crc32
+
+
+EVICTION_POLICIES = ["lru", "clock"]
+
+
+class BufferPool:
+    """Keeps a bounded number of DiskPage objects loaded in memory."""
+
+    def __init__(self, page_file, capacity=64, eviction="lru"):
+        """The constructor of the BufferPool class.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page_file : PageFile
+
+            The PageFile object from which pages are read and to which they are written.
+
+        capacity : int (default = 64)
+
+            How many pages may stay loaded in memory at the same time.
+
+        eviction : str (default = "lru")
+
+            The eviction policy, "lru" (least recently used) or "clock" (second chance).
+
+        Returns
+        -------
+
+        BufferPool
+
+            A BufferPool object.
+
+        Methodology
+        -----------
+
+        Loaded pages are kept under self.pages, an OrderedDict from page ids to DiskPage objects. With the "lru" policy, each access moves a page to the end of it, so the first page is always the least recently used one. With the "clock" policy, an access just sets the reference bit of the page, and the pages are swept in order, giving a second chance to the ones that have been referenced since the last sweep.
+
+        Every DiskPage object of the tree, loaded or not, is registered under self.registry, which holds weak references only. This way, a page id is always represented by the same object while it is referenced somewhere, and unloaded pages that nothing points to are collected.
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                "The eviction policy must be one of {}.".format(EVICTION_POLICIES)
+            )
+        if capacity < 1:
+            raise ValueError("The buffer pool must hold at least one page.")
+
+        self.page_file = page_file
+        self.capacity = capacity
+        self.eviction = eviction
+        self.pages = OrderedDict()
+        self.registry = WeakValueDictionary()
+        self.checksums = {}
+        self.referenced = set()
+        self.pinning = False
+        self.pinned_pages = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+
+    def get_page(self, page_id, page_factory):
+        """Returns the DiskPage object of a given page id.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page_id : int
+
+            The id of the page.
+
+        page_factory : callable
+
+            A function receiving the page id and returning a new, unloaded DiskPage object for it. It is called only if the page is not registered yet.
+
+        Returns
+        -------
+
+        DiskPage
+
+            The DiskPage object of the given page id.
+        """
+        page = self.registry.get(page_id)
+        if page is None:
+            page = page_factory(page_id)
+            self.registry[page_id] = page
+        return page
+
+    def add(self, page):
+        """Registers a newly-created page, which is loaded and dirty from the start.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object to be registered.
+
+        Returns
+        -------
+
+        int
+
+            The id allocated to the page in the page file.
+        """
+        page_id = self.page_file.allocate()
+        self.registry[page_id] = page
+        self.pages[page_id] = page
+        self.access(page_id)
+        self.evict_excess()
+        return page_id
+
+    def access(self, page_id):
+        """Tells the BufferPool object that a loaded page has been used.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page_id : int
+
+            The id of the page.
+
+        Methodology
+        -----------
+
+        This method updates the information used by the eviction policy and, while pinning is enabled, pins the page so that it is not evicted before BufferPool.pin() is done.
+        """
+        if self.eviction == "lru":
+            self.pages.move_to_end(page_id)
+        else:
+            self.referenced.add(page_id)
+        if self.pinning:
+            self.pinned_pages.add(page_id)
+
+    def hit(self, page):
+        """Accounts for an access to a page that is already loaded.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object accessed.
+        """
+        self.hits += 1
+        self.access(page.page_id)
+
+    def load(self, page):
+        """Loads the contents of a page from the page file.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object to be loaded.
+
+        Methodology
+        -----------
+
+        The slot of the page is read and handed to DiskPage.decode(). The checksum of the bytes it used is kept, so that the page is only written back if its contents change. Loading a page may evict another one, according to the eviction policy.
+        """
+        self.misses += 1
+        data = self.page_file.read(page.page_id)
+        size = page.decode(data)
+        self.checksums[page.page_id] = crc32(data[:size])
+        self.pages[page.page_id] = page
+        self.access(page.page_id)
+        self.evict_excess()
+
+    def write(self, page):
+        """Writes a loaded page to the page file, if it has changed since it was loaded.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object to be written.
+
+        Methodology
+        -----------
+
+        The page is serialized through DiskPage.encode() and its checksum is compared with the one of its last known version in the page file. Only dirty pages (the ones whose checksums differ) are written.
+        """
+        data = page.encode()
+        checksum = crc32(data)
+        if self.checksums.get(page.page_id) != checksum:
+            self.page_file.write(page.page_id, data)
+            self.checksums[page.page_id] = checksum
+            self.writes += 1
+
+    def evict(self, page):
+        """Writes back a page (if dirty) and unloads it.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object to be evicted.
+        """
+        self.write(page)
+        del self.pages[page.page_id]
+        self.referenced.discard(page.page_id)
+        self.checksums.pop(page.page_id, None)
+        page.unload()
+        self.evictions += 1
+
+    def evict_excess(self):
+        """Evicts pages until the number of loaded pages fits in the capacity.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        Methodology
+        -----------
+
+        The candidates are taken from the beginning of self.pages. Pinned pages are moved to its end without being evicted, and so are (with the "clock" policy) referenced pages, whose reference bit is cleared. If every loaded page is pinned, the capacity is temporarily exceeded.
+        """
+        candidates = len(self.pages) * 2
+        while len(self.pages) > self.capacity and candidates > 0:
+            candidates -= 1
+            page_id, page = next(iter(self.pages.items()))
+            if page_id in self.pinned_pages:
+                self.pages.move_to_end(page_id)
+            elif page_id in self.referenced:
+                self.referenced.discard(page_id)
+                self.pages.move_to_end(page_id)
+            else:
+                self.evict(page)
+
+    @contextmanager
+    def pin(self):
+        """Pins every page accessed inside a with block, so that none of them is evicted before it ends.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        Methodology
+        -----------
+
+        Operations that change pages (such as BTree.insert() and BTree.remove()) keep references to the lists of several pages at the same time, so a page must not be written back and unloaded halfway through them. This context manager enables pinning for its with block and, at the end of it, unpins the pages and evicts the excess.
+        """
+        self.pinning = True
+        try:
+            yield
+        finally:
+            self.pinning = False
+            self.pinned_pages.clear()
+            self.evict_excess()
+
+    def release(self, page):
+        """Forgets a discarded page and frees its slot in the page file.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        page : DiskPage
+
+            The DiskPage object that is no longer part of the tree.
+        """
+        self.pages.pop(page.page_id, None)
+        self.registry.pop(page.page_id, None)
+        self.checksums.pop(page.page_id, None)
+        self.referenced.discard(page.page_id)
+        self.pinned_pages.discard(page.page_id)
+        self.page_file.release(page.page_id)
+
+    def flush(self):
+        """Writes every dirty loaded page to the page file.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+        """
+        for page in self.pages.values():
+            self.write(page)
+        self.page_file.flush()
+
+    def get_stats(self):
+        """Returns the counters of the BufferPool object.
+
+        Parameters
+        ----------
+
+        self : BufferPool
+
+            A BufferPool object.
+
+        Returns
+        -------
+
+        dict
+
+            The number of hits, misses, evictions and writes so far, along with the hit ratio and the number of loaded pages.
+        """
+        accesses = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / accesses if accesses else 0.0,
+            "evictions": self.evictions,
+            "writes": self.writes,
+            "loaded_pages": len(self.pages),
+        }
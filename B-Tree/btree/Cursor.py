@@ -0,0 +1,240 @@
+class Cursor:
+    """A position in a BTree object that can move between neighbouring elements and search from where it is."""
+
+    def __init__(self, tree):
+        """The Cursor class constructor.
+
+        Parameters
+        ----------
+
+        self : Cursor
+
+            A Cursor object.
+
+        tree : BTree
+
+            The BTree object the cursor moves over.
+
+        Returns
+        -------
+
+        Cursor
+
+            A Cursor object which is not on any element yet (see Cursor.seek(), Cursor.first() and Cursor.last()).
+
+        Methodology
+        -----------
+
+        Since pages do not point to their parents, the cursor keeps the path from the root down to its current element, under self.stack, as a list of [page, index, lo, hi] lists. For every page but the last, index tells which descendent page the path follows; for the last page, it is the index of the current element under its keys. lo and hi are the closest keys of the ancestors around the subtree of the page (None if there is none on that side), which tell which elements can be found under it without going any higher. An empty stack means the cursor is not on any element.
+
+        Like the iterators of a BTree object, a cursor must not be used after the tree is modified: it may point to pages that are no longer part of it. BTree.cursor() should be called again instead.
+        """
+        self.tree = tree
+        self.stack = []
+
+    @property
+    def key(self):
+        """The element the cursor is on, or None if it is not on any element."""
+        if not self.stack:
+            return None
+        page, index, _, _ = self.stack[-1]
+        return page[index]
+
+    @property
+    def value(self):
+        """The value of the element the cursor is on (None if the tree does not hold values or if the cursor is not on any element)."""
+        if not self.stack:
+            return None
+        page, index, _, _ = self.stack[-1]
+        return page.get_value(index)
+
+    def push(self, page, index):
+        """Descends from the last page of the stack into one of its descendent pages.
+
+        Parameters
+        ----------
+
+        self : Cursor
+
+            A Cursor object whose stack is not empty.
+
+        page : Page
+
+            The descendent page, which is descendent_pages[index] of the last page of the stack.
+
+        index : int
+
+            Its position under the descendent pages of its parent page, which becomes the index of the parent page in the stack.
+
+        Methodology
+        -----------
+
+        The bounds of the new page are the keys of its parent page around it or, if it is the first (or last) descendent page, the bounds of the parent page itself. The index of the new page is set to 0, to be overwritten by the caller.
+        """
+        parent = self.stack[-1]
+        parent[1] = index
+        parent_page = parent[0]
+        lo = parent_page[index - 1] if index > 0 else parent[2]
+        hi = parent_page[index] if index < len(parent_page) else parent[3]
+        self.stack.append([page, 0, lo, hi])
+
+    def seek(self, element):
+        """Moves the cursor to an element or, if it is not in the tree, to the smallest element greater than it.
+
+        Parameters
+        ----------
+
+        self : Cursor
+
+            A Cursor object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be searched for.
+
+        Returns
+        -------
+
+        bool
+
+            Whether the element is in the tree. If there is no element greater than or equal to it, the cursor is left on no element.
+
+        Methodology
+        -----------
+
+        This is a finger search: instead of starting at the root, the cursor climbs its stack only until it reaches a page whose subtree may hold the element, that is, whose bounds lie strictly around it. Then it descends from there as in BTree.find(), recording the path. Searching for an element close to the current one therefore only climbs (and descends) a few levels. If the search ends in a leaf page past its last key, the smallest greater element is found through Cursor.next().
+        """
+        stack = self.stack
+        while stack and not (
+            (stack[-1][2] is None or stack[-1][2] < element)
+            and (stack[-1][3] is None or element < stack[-1][3])
+        ):
+            stack.pop()
+        if not stack:
+            stack.append([self.tree.root, 0, None, None])
+
+        while True:
+            page = stack[-1][0]
+            in_page, index = page.search(element)
+            if in_page:
+                stack[-1][1] = index
+                return True
+            if not page.descendent_pages:
+                break
+            self.push(page.descendent_pages[index], index)
+
+        if index < len(page):
+            stack[-1][1] = index
+        elif index == 0:
+            stack.clear()
+        else:
+            stack[-1][1] = index - 1
+            self.next()
+        return False
+
+    def first(self):
+        """Moves the cursor to the smallest element of the tree, returning it (or None if the tree is empty)."""
+        self.stack = [[self.tree.root, 0, None, None]]
+        return self.descend(last=False)
+
+    def last(self):
+        """Moves the cursor to the largest element of the tree, returning it (or None if the tree is empty)."""
+        self.stack = [[self.tree.root, 0, None, None]]
+        return self.descend(last=True)
+
+    def descend(self, last):
+        """Moves the cursor down from the last page of its stack to the first (or last) element of its subtree.
+
+        Parameters
+        ----------
+
+        self : Cursor
+
+            A Cursor object whose stack is not empty.
+
+        last : bool
+
+            Whether to go down to the last element of the subtree (True) or to the first one (False).
+
+        Returns
+        -------
+
+        SUPPORTED_TYPES, None
+
+            The element the cursor ends up on, or None if the subtree is empty (which only happens for the root of an empty tree).
+        """
+        page = self.stack[-1][0]
+        while page.descendent_pages:
+            index = len(page) if last else 0
+            page = page.descendent_pages[index]
+            self.push(page, index)
+        if not len(page):
+            self.stack.clear()
+            return None
+        self.stack[-1][1] = len(page) - 1 if last else 0
+        return page[self.stack[-1][1]]
+
+    def next(self):
+        """Moves the cursor to the next element.
+
+        Parameters
+        ----------
+
+        self : Cursor
+
+            A Cursor object.
+
+        Returns
+        -------
+
+        SUPPORTED_TYPES, None
+
+            The next element, or None if the cursor was on the largest element (or on no element), in which case it is left on no element.
+
+        Methodology
+        -----------
+
+        If the cursor is on an internal page, the next element is the first one of the descendent page at the right of the current element, found through Cursor.descend(). If it is on a leaf page, the next element is the next key of the page or, after its last key, the key of the closest ancestor whose path did not come from its last descendent page, which is found by popping the stack. Each page is pushed and popped once while walking through the whole tree, so each step costs O(1) amortized.
+        """
+        stack = self.stack
+        if not stack:
+            return None
+
+        page, index, _, _ = stack[-1]
+        if page.descendent_pages:
+            self.push(page.descendent_pages[index + 1], index + 1)
+            return self.descend(last=False)
+        if index + 1 < len(page):
+            stack[-1][1] = index + 1
+            return page[index + 1]
+
+        stack.pop()
+        while stack:
+            page, index, _, _ = stack[-1]
+            if index < len(page):
+                return page[index]
+            stack.pop()
+        return None
+
+    def prev(self):
+        """Moves the cursor to the previous element, just like Cursor.next() does in the opposite direction, returning it (or None if there is none)."""
+        stack = self.stack
+        if not stack:
+            return None
+
+        page, index, _, _ = stack[-1]
+        if page.descendent_pages:
+            self.push(page.descendent_pages[index], index)
+            return self.descend(last=True)
+        if index > 0:
+            stack[-1][1] = index - 1
+            return page[index - 1]
+
+        stack.pop()
+        while stack:
+            page, index, _, _ = stack[-1]
+            if index > 0:
+                stack[-1][1] = index - 1
+                return page[index - 1]
+            stack.pop()
+        return None
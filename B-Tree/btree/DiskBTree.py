@@ -0,0 +1,561 @@
+from itertools import islice
+
+from btree.helper import *
+from btree.BTree import *
+from btree.BufferPool import *
+from btree.DiskPage import *
+from btree.PageFile import *
+
+
+class DiskBTree(BTree):
+    """A B-Tree whose pages live in a file and are loaded on demand through a buffer pool."""
+
+    def __init__(
+        self,
+        min_num_keys,
+        path,
+        *args,
+        page_size=None,
+        buffer_size=64,
+        eviction="lru",
+        top_down=False,
+        b_star=False,
+    ):
+        """The DiskBTree class constructor.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        min_num_keys : int
+
+            The degree of the tree. If the file already holds a tree, it must have the same degree.
+
+        path : str
+
+            The path of the page file. If it already holds a tree, the tree is opened. Otherwise, a new one is created.
+
+        *args : list
+
+            The elements to be inserted, just as in BTree.__init__().
+
+        page_size : int, None (default = None)
+
+            The size, in bytes, of the slot of each page. If None, DiskBTree.get_default_page_size() is used, which is enough for numeric keys. Trees of str keys should use larger slots, since each key must fit in its share of a slot (see DiskBTree.get_max_key_size()). It is ignored when opening an existing file.
+
+        buffer_size : int (default = 64)
+
+            How many pages the buffer pool may keep loaded at the same time.
+
+        eviction : str (default = "lru")
+
+            The eviction policy of the buffer pool, "lru" or "clock".
+
+        top_down : bool (default = False)
+
+            Whether to insert and remove in a single pass from the root down, as in BTree.__init__(). The mode is stored in the file, and opening the file in the other mode raises a ValueError, since top-down pages may hold one more key than the default mode allows.
+
+        b_star : bool (default = False)
+
+            Whether to follow the B*-tree policy, as in BTree.__init__(). It is not stored in the file, which can be opened with or without it, since both policies keep pages within the same bounds.
+
+        Returns
+        -------
+
+        DiskBTree
+
+            A DiskBTree object.
+
+        Methodology
+        -----------
+
+        The constructor opens (or creates) a PageFile object and a BufferPool object on top of it. When opening an existing tree, the root is created as an unloaded DiskPage object from the root id stored in the header of the file, and every other page is loaded only when a search reaches it. The per-level counters of BTree.stats() are read from the header as well, so reports cost no page reads. Only if the header could not hold them (for slots too small for the height of the tree) do they start stale, and the first report loads every page to recount them. After that, the DiskBTree object behaves just like a BTree object, since its pages are DiskPage objects, whose keys and descendent pages are read through the buffer pool. Keys are encoded into the slots of the page file anyway, so a DiskBTree object has no key type (see BTree.__init__()) and keeps the keys of its loaded pages in lists.
+        """
+        if top_down and b_star:
+            raise ValueError("The top-down mode does not support the B* policy.")
+        if page_size is None:
+            page_size = self.get_default_page_size(min_num_keys)
+
+        self.page_file = PageFile(path, page_size, min_num_keys, top_down)
+        self.buffer_pool = BufferPool(self.page_file, buffer_size, eviction)
+        self.min_num_keys = self.page_file.min_num_keys
+        self.top_down = top_down
+        self.b_star = b_star
+        self.key_type = None
+        self.key_typecode = None
+        self.bloom_filter = None
+
+        if self.page_file.root_id:
+            self.root = self.get_page(self.page_file.root_id)
+            self.root.size = self.page_file.num_keys
+            self.num_keys = self.page_file.num_keys
+            self.level_num_pages = self.page_file.level_num_pages
+            self.level_num_keys = self.page_file.level_num_keys
+        else:
+            self.root = self.create_page()
+            self.num_keys = 0
+            self.level_num_pages = [1]
+            self.level_num_keys = [0]
+
+        self.insert(*args)
+
+    @staticmethod
+    def get_default_page_size(min_num_keys):
+        """Returns the default slot size for a given degree.
+
+        Parameters
+        ----------
+
+        min_num_keys : int
+
+            The degree of the tree.
+
+        Returns
+        -------
+
+        int
+
+            The smallest power of two (and at least 512) that holds a full page of numeric keys, in either mode (see BTree.__init__()).
+        """
+        max_num_keys = 2 * min_num_keys + 1
+        needed_size = (
+            PAGE_HEADER.size
+            + max_num_keys * TAGGED_INT.size
+            + (max_num_keys + 1) * (PAGE_ID.size + SUBTREE_SIZE.size)
+        )
+        page_size = 512
+        while page_size < needed_size:
+            page_size *= 2
+        return page_size
+
+    def get_max_key_size(self):
+        """Returns how many bytes a str key may take in UTF-8.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        Returns
+        -------
+
+        int
+
+            The size of the largest str key that is guaranteed to fit in a full page.
+
+        Methodology
+        -----------
+
+        A full page has max_num_keys keys and max_num_keys + 1 descendent pages, where max_num_keys is the one of the top-down mode, so that the key size does not depend on the mode of the file. The room left by its header and the ids and sizes of its descendent pages is split evenly among its keys, and each key also needs KEY_LENGTH.size bytes to store its length.
+        """
+        max_num_keys = 2 * self.min_num_keys + 1
+        key_room = (
+            self.page_file.page_size
+            - PAGE_HEADER.size
+            - (max_num_keys + 1) * (PAGE_ID.size + SUBTREE_SIZE.size)
+        )
+        return key_room // max_num_keys - KEY_LENGTH.size
+
+    def create_page(self):
+        """Creates a new, empty DiskPage object, allocating a slot for it.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        Returns
+        -------
+
+        DiskPage
+
+            The newly-created DiskPage object.
+        """
+        return DiskPage(self.min_num_keys, self)
+
+    def get_page(self, page_id):
+        """Returns the DiskPage object of a page stored in the page file.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        page_id : int
+
+            The id of the page.
+
+        Returns
+        -------
+
+        DiskPage
+
+            The DiskPage object of the given id. If there is none yet, an unloaded one is created.
+        """
+        return self.buffer_pool.get_page(
+            page_id, lambda page_id: DiskPage(self.min_num_keys, self, page_id)
+        )
+
+    def release_page(self, page):
+        """Frees the slot of a DiskPage object that is no longer part of the tree.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        page : DiskPage
+
+            The DiskPage object that has been discarded.
+        """
+        self.buffer_pool.release(page)
+
+    def check_key(self, element):
+        """Raises an exception if an element cannot be inserted into the DiskBTree object.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        element : object
+
+            The element to be checked.
+
+        Methodology
+        -----------
+
+        Besides the checks of BTree.check_key(), the element must fit in a slot of the page file once encoded by encode_keys(): int elements that do not fit in a signed 64-bit integer raise a ValueError, and so do str elements that cannot be encoded in UTF-8 (such as lone surrogates) or that take more than DiskBTree.get_max_key_size() bytes in it. Since every insertion checks its elements through this method, such an element is rejected before it reaches a page, instead of making every later write of that page fail.
+        """
+        BTree.check_key(self, element)
+        if type(element) is int and not -(2**63) <= element < 2**63:
+            raise ValueError(
+                "The key {} does not fit in a 64-bit integer.".format(element)
+            )
+        if type(element) is str:
+            try:
+                key_size = len(element.encode("utf-8"))
+            except UnicodeEncodeError:
+                raise ValueError("The key {!r} is not valid Unicode.".format(element))
+            max_key_size = self.get_max_key_size()
+            if key_size > max_key_size:
+                raise ValueError(
+                    "A key of {} bytes does not fit in a slot (at most {}).".format(
+                        key_size, max_key_size
+                    )
+                )
+
+    def insert(self, *args):
+        """Inserts any amount of items into the DiskBTree.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        *args : list
+
+            The elements to be inserted, just as in BTree.insert().
+
+        Methodology
+        -----------
+
+        Each element is inserted by BTree.insert() while the buffer pool pins every page it touches, so no page is written back halfway through a split. Elements that could not be written to the page file are rejected by DiskBTree.check_key().
+        """
+        for arg in iterate_merged(args):
+            with self.buffer_pool.pin():
+                BTree.insert(self, arg)
+
+    def insert_leaf_batch(self, elements, start):
+        """Inserts the elements of a sorted batch that belong in the same leaf page through BTree.insert_leaf_batch(), while the buffer pool pins every page it touches."""
+        with self.buffer_pool.pin():
+            return BTree.insert_leaf_batch(self, elements, start)
+
+    def remove(self, *args):
+        """Removes any amount of items of the DiskBTree.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        *args : list
+
+            The elements to be removed, just as in BTree.remove().
+
+        Methodology
+        -----------
+
+        Each element is removed by BTree.remove() while the buffer pool pins every page it touches, so no page is written back halfway through a merge.
+        """
+        for arg in iterate_merged(args):
+            with self.buffer_pool.pin():
+                BTree.remove(self, arg)
+
+    def remove_range(self, lo=None, hi=None, inclusive=True):
+        """Removes every element that lies between two bounds through BTree.remove_range(), while the buffer pool pins every page it touches. The pages of the removed subtree are released one at a time by DiskBTree.release_subtree(), so only the pages of the boundary paths stay pinned."""
+        with self.buffer_pool.pin():
+            return BTree.remove_range(self, lo, hi, inclusive)
+
+    def create_tree(self, path=None):
+        """Creates a new, empty tree of the same degree and mode as the DiskBTree.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        path : str, None (default = None)
+
+            The path of the page file of the new tree, which must not hold a tree yet. If None, the new tree is a BTree object in memory, since a DiskBTree needs a page file of its own. The results of BTree.union() and similar methods are therefore BTree objects.
+
+        Returns
+        -------
+
+        BTree
+
+            An empty BTree object or, if path is given, an empty DiskBTree object with the same page size and buffer pool settings as the DiskBTree.
+        """
+        if path is None:
+            return BTree(self.min_num_keys, top_down=self.top_down, b_star=self.b_star)
+        return DiskBTree(
+            self.min_num_keys,
+            path,
+            page_size=self.page_file.page_size,
+            buffer_size=self.buffer_pool.capacity,
+            eviction=self.buffer_pool.eviction,
+            top_down=self.top_down,
+            b_star=self.b_star,
+        )
+
+    def split_at(self, element, path=None):
+        """Splits the DiskBTree in two at an element.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object, which keeps the elements smaller than element.
+
+        element : SUPPORTED_TYPES
+
+            The element at which the DiskBTree is split. It does not need to be in the DiskBTree.
+
+        path : str, None (default = None)
+
+            The path of the page file of the new tree, as in DiskBTree.create_tree(). If None, the new tree is kept in memory.
+
+        Returns
+        -------
+
+        BTree
+
+            A new tree, created by DiskBTree.create_tree(), holding the elements greater than or equal to element.
+
+        Methodology
+        -----------
+
+        Unlike in memory, the pages of a DiskBTree belong to its page file, so the subtree cut by BTree.split_at() cannot be handed over to another tree. Instead, the elements greater than or equal to element are read through BTree.range() and bulk loaded into the new tree by BTree.pack(), and then they are removed from the DiskBTree by DiskBTree.remove_range(), which releases their pages. The split therefore takes O(log n + k) page operations, k being the number of elements moved, instead of O(log n).
+        """
+        check_type(element)
+        other = self.create_tree(path)
+        other.pack(list(self.range(element)))
+        self.remove_range(element)
+        return other
+
+    @classmethod
+    def join(cls, left, right):
+        """Joins two DiskBTree objects whose elements do not overlap.
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The DiskBTree class.
+
+        left : DiskBTree
+
+            A DiskBTree object whose elements are all smaller than the ones of right. It receives every element.
+
+        right : DiskBTree
+
+            A DiskBTree object of the same degree and mode as left. It is left empty.
+
+        Returns
+        -------
+
+        DiskBTree
+
+            The left object, now holding the elements of both.
+
+        Methodology
+        -----------
+
+        After checking that both trees can be joined through BTree.check_join(), the elements of right are streamed into left by BTree.insert_many(), in batches of as many elements as the pages of the buffer pool of left can hold. Since every element of right is greater than the ones of left, each batch lands on the rightmost leaf page of left, so it costs a single descent, and the pages it creates fit in the buffer pool. Then, every page of right is released by DiskBTree.remove_range(). Unlike BTree.join(), which hangs the pages of one tree from the other, each tree keeps its own page file here, so the join takes O(log n + m) page operations, m being the number of elements of right.
+        """
+        cls.check_join(left, right)
+        batch_size = left.buffer_pool.capacity * left.min_num_keys
+        elements = iter(right)
+        batch = list(islice(elements, batch_size))
+        while batch:
+            left.insert_many(batch)
+            batch = list(islice(elements, batch_size))
+        right.remove_range()
+        return left
+
+    @classmethod
+    def load(cls, path, file_path, fill_factor=1.0, **kwargs):
+        """Builds a DiskBTree object from a snapshot written by BTree.save().
+
+        Parameters
+        ----------
+
+        cls : type
+
+            The DiskBTree class.
+
+        path : str
+
+            The path of the snapshot.
+
+        file_path : str
+
+            The path of the page file of the new DiskBTree object, which must not hold a tree yet.
+
+        fill_factor : float (default = 1.0)
+
+            How full each page should be, as in BTree.bulk_load().
+
+        **kwargs : dict
+
+            Further keyworded arguments to be given to DiskBTree.__init__(), such as page_size or buffer_size.
+
+        Returns
+        -------
+
+        DiskBTree
+
+            A DiskBTree object with the degree, mode and contents of the saved tree.
+
+        Methodology
+        -----------
+
+        The pages of a snapshot cannot be copied into the slots of a page file as they are, since their keys are encoded differently, so the snapshot is read by BTree.load() and its keys are streamed, in order, into the page file through DiskBTree.bulk_load(), which packs them bottom-up in O(n) time. The degree and mode of the snapshot are kept, but not its key type, since a DiskBTree has none (see DiskBTree.__init__()). A ValueError is raised, just as in BTree.load(), if the file is not a valid snapshot or if it holds values, since DiskPage objects cannot hold them, and, as in DiskBTree.check_key(), if any key does not fit in the slots of the page file.
+        """
+        snapshot = BTree.load(path)
+        return cls.bulk_load(
+            snapshot.min_num_keys,
+            snapshot,
+            fill_factor,
+            path=file_path,
+            top_down=snapshot.top_down,
+            b_star=snapshot.b_star,
+            **kwargs,
+        )
+
+    def release_subtree(self, page):
+        """Releases every page of a discarded subtree.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+
+        page : DiskPage
+
+            The root of the discarded subtree.
+
+        Returns
+        -------
+
+        tuple : (level_num_pages, level_num_keys)
+
+            The number of pages and keys of each level of the subtree, from the leaves up, as in BTree.count_subtree().
+
+        Methodology
+        -----------
+
+        Unlike in memory, each page of the subtree has a slot of its own in the page file, so every page is visited (loading it to learn its descendent pages) and released through DiskBTree.release_page(). Since every page is visited anyway, the pages and keys of each level are counted along the way, keeping the per-level counters of BTree.stats() up to date for free.
+
+        The subtree may hold many more pages than the buffer pool, even though DiskBTree.remove_range() pins every page it touches. The walk is depth-first, so the stack only holds the unloaded DiskPage objects of O(height) pages, and each page leaves the buffer pool (pinned or not) as soon as it is released, right after being visited. At most one page of the subtree is therefore loaded at a time, besides the pinned pages of the boundary paths.
+        """
+        level_num_pages = []
+        level_num_keys = []
+        stack = [(page, 0)]
+        while stack:
+            page, depth = stack.pop()
+            if depth == len(level_num_pages):
+                level_num_pages.append(0)
+                level_num_keys.append(0)
+            level_num_pages[depth] += 1
+            level_num_keys[depth] += len(page)
+            stack.extend(
+                (descendent, depth + 1) for descendent in page.descendent_pages
+            )
+            self.release_page(page)
+        level_num_pages.reverse()
+        level_num_keys.reverse()
+        return level_num_pages, level_num_keys
+
+    def flush(self):
+        """Writes every dirty page and the header of the page file.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+        """
+        self.page_file.root_id = self.root.page_id
+        self.page_file.num_keys = self.root.size
+        if self.level_num_pages is None:
+            self.page_file.level_num_pages = self.page_file.level_num_keys = None
+        else:
+            self.page_file.level_num_pages = list(self.level_num_pages)
+            self.page_file.level_num_keys = list(self.level_num_keys)
+        self.buffer_pool.flush()
+
+    def close(self):
+        """Flushes the DiskBTree object and closes its page file.
+
+        Parameters
+        ----------
+
+        self : DiskBTree
+
+            A DiskBTree object.
+        """
+        self.flush()
+        self.page_file.close()
+
+    def __enter__(self):
+        """Allows DiskBTree objects to be used in with blocks."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the DiskBTree object at the end of a with block."""
+        self.close()
@@ -0,0 +1,218 @@
+from struct import Struct
+
+from btree.helper import *
+from btree.Page import *
+
+
+PAGE_HEADER = Struct("<BHH")
+PAGE_ID = Struct("<Q")
+SUBTREE_SIZE = Struct("<Q")
+
+
+class DiskPage(Page):
+    """A Page of a DiskBTree, whose contents are loaded on demand through a BufferPool."""
+
+    __slots__ = (
+        "_keys",
+        "_descendent_pages",
+        "buffer_pool",
+        "loaded",
+        "page_id",
+        "__weakref__",
+    )
+
+    def __init__(self, min_num_keys, parent_tree, page_id=None):
+        """The constructor of the DiskPage class.
+
+        Parameters
+        ----------
+
+        self : DiskPage
+
+            A DiskPage object.
+
+        min_num_keys : int
+
+            The degree of the B-Tree.
+
+        parent_tree : DiskBTree
+
+            The DiskBTree object to which the DiskPage object relates.
+
+        page_id : int, None (default = None)
+
+            The id of a page already stored in the page file. If None, a new, empty page is created and a slot is allocated for it.
+
+        Returns
+        -------
+
+        DiskPage
+
+            The resulting DiskPage object.
+
+        Methodology
+        -----------
+
+        A DiskPage object has the same attributes of a Page object, but self.keys and self.descendent_pages are properties backed by self._keys and self._descendent_pages, which are only present while the page is loaded. Accessing any of them while the page is unloaded makes the BufferPool object read the page from its slot. An existing page is therefore created unloaded, and costs nothing but this small object until it is actually used. The size attribute is not a property: it is stored in the slot of the parent page and set by its DiskPage.decode(), so that BTree.rank() and BTree.select() can read the sizes of the descendents of a page without loading them. Since the BufferPool object keeps weak references to every DiskPage object, __weakref__ is one of its slots.
+        """
+        self.max_num_keys = 2 * min_num_keys
+        if parent_tree.top_down:
+            self.max_num_keys += 1
+        self.min_num_keys = min_num_keys
+        self.parent_tree = parent_tree
+        self.buffer_pool = parent_tree.buffer_pool
+        self.values = None
+
+        if page_id is None:
+            self._keys = []
+            self._descendent_pages = []
+            self.num_keys = 0
+            self.size = 0
+            self.loaded = True
+            self.page_id = self.buffer_pool.add(self)
+        else:
+            self.unload()
+            self.num_keys = 0
+            self.size = None
+            self.page_id = page_id
+
+    @property
+    def keys(self):
+        """The keys of the DiskPage object, loaded on demand."""
+        self.load()
+        return self._keys
+
+    @keys.setter
+    def keys(self, keys):
+        self.load()
+        self._keys = keys
+
+    @property
+    def descendent_pages(self):
+        """The descendent pages of the DiskPage object, loaded on demand."""
+        self.load()
+        return self._descendent_pages
+
+    @descendent_pages.setter
+    def descendent_pages(self, descendent_pages):
+        self.load()
+        self._descendent_pages = descendent_pages
+
+    def load(self):
+        """Makes sure the DiskPage object is loaded.
+
+        Parameters
+        ----------
+
+        self : DiskPage
+
+            A DiskPage object.
+
+        Methodology
+        -----------
+
+        If the page is loaded, the access is just reported to the BufferPool object (so it can keep track of recently used pages). Otherwise, the BufferPool object is asked to read it from the page file.
+        """
+        if self.loaded:
+            self.buffer_pool.hit(self)
+        else:
+            self.buffer_pool.load(self)
+
+    def unload(self):
+        """Drops the contents of the DiskPage object, keeping only its identity.
+
+        Parameters
+        ----------
+
+        self : DiskPage
+
+            A DiskPage object.
+        """
+        self._keys = None
+        self._descendent_pages = None
+        self.loaded = False
+
+    def encode(self):
+        """Serializes the DiskPage object.
+
+        Parameters
+        ----------
+
+        self : DiskPage
+
+            A DiskPage object.
+
+        Returns
+        -------
+
+        bytes
+
+            The serialized page, to be written in its slot of the page file.
+
+        Methodology
+        -----------
+
+        The page is written as a header (the kind of key block, the number of keys and the number of descendent pages), followed by the key block made by encode_keys(), the ids of the descendent pages and their sizes.
+        """
+        key_type, key_block = encode_keys(self._keys)
+        return b"".join(
+            [
+                PAGE_HEADER.pack(
+                    key_type, len(self._keys), len(self._descendent_pages)
+                ),
+                key_block,
+                Struct("<{}Q".format(len(self._descendent_pages))).pack(
+                    *[descendent.page_id for descendent in self._descendent_pages]
+                ),
+                Struct("<{}Q".format(len(self._descendent_pages))).pack(
+                    *[descendent.size for descendent in self._descendent_pages]
+                ),
+            ]
+        )
+
+    def decode(self, data):
+        """Fills the DiskPage object with the contents of its slot.
+
+        Parameters
+        ----------
+
+        self : DiskPage
+
+            A DiskPage object.
+
+        data : bytes
+
+            The contents of the slot, as written by DiskPage.encode().
+
+        Returns
+        -------
+
+        int
+
+            How many bytes of data have been used.
+
+        Methodology
+        -----------
+
+        The keys are read through decode_keys(), and each descendent page id is turned into a DiskPage object through DiskBTree.get_page(), which reuses the DiskPage object of that id if it is still around, and gets its size from the slot.
+        """
+        key_type, num_keys, num_descendents = PAGE_HEADER.unpack_from(data)
+        keys, offset = decode_keys(data, PAGE_HEADER.size, key_type, num_keys)
+        descendent_ids = Struct("<{}Q".format(num_descendents)).unpack_from(
+            data, offset
+        )
+        offset += num_descendents * PAGE_ID.size
+        descendent_sizes = Struct("<{}Q".format(num_descendents)).unpack_from(
+            data, offset
+        )
+
+        self._keys = keys
+        self._descendent_pages = [
+            self.parent_tree.get_page(descendent_id)
+            for descendent_id in descendent_ids
+        ]
+        for descendent, size in zip(self._descendent_pages, descendent_sizes):
+            descendent.size = size
+        self.num_keys = num_keys
+        self.loaded = True
+        return offset + num_descendents * SUBTREE_SIZE.size
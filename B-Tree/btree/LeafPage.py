@@ -0,0 +1,42 @@
+from btree.helper import *
+from btree.Page import *
+
+
+class LeafPage(Page):
+    """A leaf Page of a B+Tree, linked to its sibling leaves."""
+
+    __slots__ = ("previous_page", "next_page")
+
+    def __init__(self, min_num_keys, parent_tree):
+        """The constructor of the LeafPage class.
+
+        Parameters
+        ----------
+
+        self : LeafPage
+
+            A LeafPage object.
+
+        min_num_keys : int
+
+            The degree of the leaves of the B+Tree.
+
+        parent_tree : BPlusTree
+
+            The BPlusTree object to which the LeafPage object relates.
+
+        Returns
+        -------
+
+        LeafPage
+
+            The resulting LeafPage object.
+
+        Methodology
+        -----------
+
+        Besides the attributes of a Page object, a LeafPage object has previous_page and next_page, which point to the leaves immediately before and after it (or None, at the ends). Together, they form a doubly-linked list of all the leaves of the tree, in order.
+        """
+        super().__init__(min_num_keys, parent_tree)
+        self.previous_page = None
+        self.next_page = None
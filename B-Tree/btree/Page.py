@@ -1,3 +1,5 @@
+from bisect import bisect_left, bisect_right
+
 from btree.helper import *
 from btree.constants import *
 from btree.DegreeOverflowError import *
@@ -7,7 +9,18 @@ from btree.DegreeUnderflowError import *
 class Page:
     """A Page of the B-Tree."""
 
-    def __init__(self, min_num_keys, parent_tree, parent_page):
+    __slots__ = (
+        "descendent_pages",
+        "keys",
+        "values",
+        "max_num_keys",
+        "min_num_keys",
+        "num_keys",
+        "size",
+        "parent_tree",
+    )
+
+    def __init__(self, min_num_keys, parent_tree):
         """The construtor of the Page class.
 
         Paramters
@@ -25,10 +38,6 @@ class Page:
 
             The BTree object to which the Page object relates.
 
-        parent_page : Page
-
-            The Page object which relates with the Page object to be created.
-
         Returns
         -------
 
@@ -39,16 +48,21 @@ class Page:
         Methodology
         -----------
 
-        This constructor basically sets a bunch of attributes according to the provided parameters.
+        This constructor basically sets a bunch of attributes according to the provided parameters. The values attribute is None, unless the page belongs to a BTreeMap object, which turns it into a list holding the value of each key, side by side with self.keys. The size attribute holds the number of keys in the subtree rooted at the Page object, which is kept up to date by BTree and Page methods for order statistics (see BTree.rank() and BTree.select()).
+
+        Pages do not point to their parents. Whenever a method needs the parent of a page, it is given the path from the root recorded by BTree.find_path().
+
+        The attributes are declared under __slots__, so Page objects carry no __dict__, which would take more memory than a page of a small degree holds in keys. Subclasses must declare their own attributes under __slots__ as well.
 
         """
         self.descendent_pages = []
         self.keys = []
+        self.values = None
         self.max_num_keys = 2 * min_num_keys
         self.min_num_keys = min_num_keys
         self.num_keys = 0
-        self.parent_page = parent_page
-        if parent_tree:
+        self.size = 0
+        if parent_tree is not None:
             self.parent_tree = parent_tree
 
     def __contains__(self, element):
@@ -75,9 +89,9 @@ class Page:
         Methodology
         -----------
 
-        This method basically uses list.__contains__() with the provided parameter and returns the result.
+        This method bisects self.keys through Page.search() and returns whether the element has been found in it.
         """
-        return element in self.keys
+        return self.search(element)[0]
 
     def __repr__(self):
         """The graphical representation of the Page object.
@@ -183,7 +197,7 @@ class Page:
         """
         return self.keys.__getitem__(*args, **kwargs)
 
-    def insert(self, element, will_raise=True):
+    def insert(self, element, will_raise=True, value=None):
         """Inserts a number in the B-Tree.
 
         Parameters
@@ -201,15 +215,64 @@ class Page:
 
             Whether to verify for violations of B-Tree rules.
 
+        value : object (default = None)
+
+            The value of the element, stored under self.values at the same index. It is ignored if the Page object does not hold values.
+
+        Returns
+        -------
+
+        int
+
+            The index in which the element has been inserted under self.keys.
+
         Methodology
         ----------
 
-        This method just inserts the element into self.keys and, if will_raise == True, checks for rule violations, raising a DegreeOverflowError if that is the case. This exception is handled by the BTree class.
+        This method just inserts the element into self.keys (and its value into self.values, if there is such a list) and, if will_raise == True, checks for rule violations, raising a DegreeOverflowError if that is the case. BTree.insert() passes will_raise=False and checks the length of the page itself, which is much cheaper than raising and catching an exception.
         """
-        insert_crescent(element, self.keys)
+        index = insert_crescent(element, self.keys)
+        if self.values is not None:
+            self.values.insert(index, value)
         self.num_keys += 1
         if will_raise and len(self.keys) > self.max_num_keys:
             raise DegreeOverflowError(self)
+        return index
+
+    def search(self, element):
+        """Bisects the Page object looking for a given element.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object.
+
+        element : SUPPORTED_TYPES
+
+            The element to be searched for.
+
+        Returns
+        -------
+
+        tuple : (in_page, index)
+
+            in_page : bool
+
+                Whether the given element is stored in the Page object or not.
+
+            index : int
+
+                If in_page == True, the index in which the element is stored under self.keys. Otherwise, the index of the descendent page in which the element is expected to be found (which is also the index in which it would be inserted under self.keys).
+
+        Methodology
+        -----------
+
+        This method uses bisect_left() over self.keys, which is kept sorted at all times, so that a single O(log n) search answers both whether the element is in the Page object and where the search should continue if it is not.
+        """
+        index = bisect_left(self.keys, element)
+        return (index < len(self.keys) and self.keys[index] == element, index)
 
     def get_probable_descendent(self, element):
         """Returns the descennt page where a given element is expected to be.
@@ -235,20 +298,13 @@ class Page:
         Methodology
         -----------
 
-        This method basically compares the keys of the page with the given element, returning the proper item of self.descendent_pages.
+        This method bisects the keys of the page with bisect_right(), which gives the index of the first key greater than the given element, returning the proper item of self.descendent_pages.
 
         This method is used by BTree.find() when searching for a given element, as it helps abstract the decision behind which descendent page to search next.
         """
-        for i in range(len(self)):
-            if self[i] > element:
-                try:
-                    return self.descendent_pages[i]
-                except:
-                    return None
-        try:
-            return self.descendent_pages[len(self)]
-        except:
-            return None
+        if self.descendent_pages:
+            return self.descendent_pages[bisect_right(self.keys, element)]
+        return None
 
     def remove(self, element, will_raise=True):
         """Removes an element of a Page object.
@@ -271,16 +327,19 @@ class Page:
         Methodology
         -----------
 
-        This method just removes the element of self.keys and, if will_raise == True, checks for rule violations, raising a DegreeUnderflowError if that is the case. This exception is handled by the BTree class.
+        This method just removes the element of self.keys (whose index is found through Page.index()), along with its value, and, if will_raise == True, checks for rule violations, raising a DegreeUnderflowError if that is the case. BTree.remove() passes will_raise=False and calls BTree.rebalance() instead.
         """
-        self.keys.remove(element)
+        index = self.index(element)
+        del self.keys[index]
+        if self.values is not None:
+            del self.values[index]
         self.num_keys -= 1
 
-        if will_raise and self.parent_page != None and len(self) < self.min_num_keys:
+        if will_raise and not self.is_root() and len(self) < self.min_num_keys:
             raise DegreeUnderflowError(self)
 
-    def index(self, *args, **kwargs):
-        """Returns the index of a element in a Page object.
+    def get_value(self, index):
+        """Returns the value stored at a given index of a Page object.
 
         Parameters
         ----------
@@ -289,27 +348,136 @@ class Page:
 
             A Page object.
 
-        *args : list
+        index : int
 
-            The arguments provided.
+            The index of the key whose value is wanted.
 
-        **kwargs : dict
+        Returns
+        -------
 
-            The keyworded arguments provided.
+        object
+
+            The value under self.values[index], or None if the Page object does not hold values.
+        """
+        if self.values is None:
+            return None
+        return self.values[index]
+
+    def set_item(self, index, element, value=None):
+        """Replaces the key (and its value) stored at a given index of a Page object.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object.
+
+        index : int
+
+            The index to be overwritten.
+
+        element : SUPPORTED_TYPES
+
+            The new key.
+
+        value : object (default = None)
+
+            The new value. It is ignored if the Page object does not hold values.
+        """
+        self.keys[index] = element
+        if self.values is not None:
+            self.values[index] = value
+
+    def insert_item(self, index, element, value=None):
+        """Inserts a key (and its value) at a given index of a Page object.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object.
+
+        index : int
+
+            The index in which the key will be stored. It is up to the caller to keep self.keys in crescent order.
+
+        element : SUPPORTED_TYPES
+
+            The key to be inserted.
+
+        value : object (default = None)
+
+            The value of the key. It is ignored if the Page object does not hold values.
+        """
+        self.keys.insert(index, element)
+        if self.values is not None:
+            self.values.insert(index, value)
+        self.num_keys += 1
+
+    def remove_item(self, index):
+        """Removes the key (and its value) stored at a given index of a Page object.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object.
+
+        index : int
+
+            The index of the key to be removed.
+
+        Returns
+        -------
+
+        tuple : (element, value)
+
+            element : SUPPORTED_TYPES
+
+                The removed key.
+
+            value : object
+
+                Its value, or None if the Page object does not hold values.
+        """
+        element = self.keys.pop(index)
+        value = None if self.values is None else self.values.pop(index)
+        self.num_keys -= 1
+        return (element, value)
+
+    def index(self, element):
+        """Returns the index of a element in a Page object.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object.
+
+        element : SUPPORTED_TYPES
+
+            The element whose index is wanted.
 
         Returns
         -------
 
         int
 
-            The index in which the given element is expected to be found in self.keys.
+            The index in which the given element is stored in self.keys.
 
         Methodology
         -----------
 
-        This method basically gives to Page objects the same behavior of list objects with regards to their .index() implementations.
+        This method gives to Page objects the same behavior of list objects with regards to their .index() implementations, including raising a ValueError if the element is not in the Page object, but it does so by bisecting self.keys through Page.search() instead of scanning it.
         """
-        return self.keys.index(*args, **kwargs)
+        in_page, index = self.search(element)
+        if not in_page:
+            raise ValueError("{} is not in the page.".format(element))
+        return index
 
     def get_adjacent_element(self, element, with_page=False):
         """Returns an adjacent element (predecessor or sucessor) of a given number.
@@ -476,7 +644,7 @@ class Page:
                 else:
                     return pointer[0]
 
-    def get_adjacent_pages(self):
+    def get_adjacent_pages(self, parent_page, page_index):
         """Returns the adjacent pages of a Page object.
 
         Parameters
@@ -486,6 +654,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Returns
         -------
 
@@ -506,19 +682,12 @@ class Page:
 
         This method basically calls Page.get_left_page() and Page.get_right_page() and returns both results under a tuple object.
         """
-        try:
-            left_page = self.get_left_page()
-        except:
-            left_page = None
-
-        try:
-            right_page = self.get_right_page()
-        except:
-            right_page = None
-
-        return (left_page, right_page)
+        return (
+            self.get_left_page(parent_page, page_index),
+            self.get_right_page(parent_page, page_index),
+        )
 
-    def get_left_page(self):
+    def get_left_page(self, parent_page, page_index):
         """Returns the page at the left of a Page object.
 
         Parameters
@@ -528,6 +697,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Returns
         -------
 
@@ -538,18 +715,13 @@ class Page:
         Methodology
         -----------
 
-        This method basically finds the Page index under page.parent_page.descendent_pages and gets the element in the same list that is immediately before the Page object. If that is not possible, None is returned.
+        Pages do not know their parents: the parent and the position of the Page object are given by the caller, usually from the path recorded by BTree.find_path(). This way, the left page is found in O(1), instead of scanning parent_page.descendent_pages for the Page object.
         """
-        if self.parent_page == None:
+        if page_index == 0:
             return None
-        else:
-            page_pointer_index = self.parent_page.descendent_pages.index(self)
-            if page_pointer_index == 0:
-                return None
-            else:
-                return self.parent_page.descendent_pages[page_pointer_index - 1]
+        return parent_page.descendent_pages[page_index - 1]
 
-    def get_right_page(self):
+    def get_right_page(self, parent_page, page_index):
         """Returns the page at the right of a Page object.
 
         Parameters
@@ -559,6 +731,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Returns
         -------
 
@@ -569,16 +749,11 @@ class Page:
         Methodology
         -----------
 
-        This method basically finds the Page index under page.parent_page.descendent_pages and gets the element in the same list that is immediately after the Page object. If that is not possible, None is returned.
+        Just like Page.get_left_page(), this method relies on the position given by the caller.
         """
-        if self.parent_page == None:
+        if page_index == len(parent_page):
             return None
-        else:
-            page_pointer_index = self.parent_page.descendent_pages.index(self)
-            if page_pointer_index == len(self.parent_page):
-                return None
-            else:
-                return self.parent_page.descendent_pages[page_pointer_index + 1]
+        return parent_page.descendent_pages[page_index + 1]
 
     def can_get_borrowed(self):
         """Returns how many elements can be borrowed from a Page object.
@@ -607,7 +782,7 @@ class Page:
         else:
             return 0
 
-    def can_borrow(self, with_excedent_number=False):
+    def can_borrow(self, parent_page, page_index, with_excedent_number=False):
         """Tells whether a Page object can borrow elements from adjacent Page objects.
 
         Parameters
@@ -617,6 +792,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         with_excedent_number : bool (default = False)
 
             Whether to return the number of elements that can be borrowed instead of a boolean result.
@@ -639,11 +822,17 @@ class Page:
                 How many elements can be borrowed from the right page.
         """
         if with_excedent_number == True:
-            return (self.can_borrow_left(), self.can_borrow_right())
+            return (
+                self.can_borrow_left(parent_page, page_index),
+                self.can_borrow_right(parent_page, page_index),
+            )
         else:
-            return bool(self.can_borrow_left() or self.can_borrow_right())
+            return bool(
+                self.can_borrow_left(parent_page, page_index)
+                or self.can_borrow_right(parent_page, page_index)
+            )
 
-    def can_borrow_left(self):
+    def can_borrow_left(self, parent_page, page_index):
         """Tells whether a Page object can borrow elements from the left Page object (if there is any).
 
         Parameters
@@ -653,6 +842,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Returns
         -------
 
@@ -663,14 +860,14 @@ class Page:
         Methodology
         -----------
 
-        This method basically calls the Page.can_get_borrowed() method of the left Page object (obtained through Page.get_left_page()).
+        This method basically calls the Page.can_get_borrowed() method of the left Page object (obtained through Page.get_left_page()), returning 0 if there is no such page.
         """
-        try:
-            return self.get_left_page().can_get_borrowed()
-        except:
+        left_page = self.get_left_page(parent_page, page_index)
+        if left_page is None:
             return 0
+        return left_page.can_get_borrowed()
 
-    def can_borrow_right(self):
+    def can_borrow_right(self, parent_page, page_index):
         """Tells whether a Page object can borrow elements from the right Page object (if there is any).
 
         Parameters
@@ -680,6 +877,14 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Returns
         -------
 
@@ -690,14 +895,14 @@ class Page:
         Methodology
         -----------
 
-        This method basically calls the Page.can_get_borrowed() method of the right Page object (obtained through Page.get_right_page()).
+        This method basically calls the Page.can_get_borrowed() method of the right Page object (obtained through Page.get_right_page()), returning 0 if there is no such page.
         """
-        try:
-            return self.get_right_page().can_get_borrowed()
-        except:
+        right_page = self.get_right_page(parent_page, page_index)
+        if right_page is None:
             return 0
+        return right_page.can_get_borrowed()
 
-    def borrow(self):
+    def borrow(self, parent_page, page_index):
         """Borrows an element from an adjacent Page object, if possible.
 
         Parameters
@@ -707,23 +912,31 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Methodology
         -----------
 
         This method calls Page.can_borrow() and compares the results to decide on which adjacent Page object to borrow from, calling either Page.borrow_left() or Page.borrow_right().
         """
-        borrow_possibilities = self.can_borrow(True)
+        borrow_possibilities = self.can_borrow(parent_page, page_index, True)
 
         if borrow_possibilities[0] > borrow_possibilities[1]:
-            self.borrow_left()
+            self.borrow_left(parent_page, page_index)
         elif borrow_possibilities[1] > borrow_possibilities[0]:
-            self.borrow_right()
+            self.borrow_right(parent_page, page_index)
         elif borrow_possibilities[0] > 0:
-            self.borrow_left()
+            self.borrow_left(parent_page, page_index)
         else:
             raise Exception("Cannot borrow!")
 
-    def borrow_left(self):
+    def borrow_left(self, parent_page, page_index):
         """Borrows an element from the left Page object.
 
         Parameters
@@ -733,20 +946,34 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Methodology
         -----------
 
-        This method gets an element of the left Page object and moves it to page.parent_page, so that the element in its place can be brought down to the Page object.
+        This method gets the last element of the left Page object and moves it to parent_page, so that the element in its place can be brought down to the Page object. Every element is addressed by its index, so no page is searched. Values travel along with their elements. If the pages are not leaves, the last descendent page of the left Page object becomes the first descendent page of the Page object. The sizes of both pages are adjusted accordingly (their parent's size does not change).
         """
-        page_index = self.parent_page.descendent_pages.index(self)
-        left_page = self.get_left_page()
-        element_to_borrow = left_page[-1]
-        middle_element = self.parent_page[page_index - 1]
-        left_page.remove(element_to_borrow)
-        self.parent_page.keys[page_index - 1] = element_to_borrow
-        self.insert(middle_element)
-
-    def borrow_right(self):
+        left_page = parent_page.descendent_pages[page_index - 1]
+        element_to_borrow, value_to_borrow = left_page.remove_item(len(left_page) - 1)
+        moved_size = 0
+        if not left_page.is_leaf():
+            descendent = left_page.descendent_pages.pop()
+            self.descendent_pages.insert(0, descendent)
+            moved_size = descendent.size
+        left_page.size -= 1 + moved_size
+        middle_element = parent_page[page_index - 1]
+        middle_value = parent_page.get_value(page_index - 1)
+        parent_page.set_item(page_index - 1, element_to_borrow, value_to_borrow)
+        self.insert_item(0, middle_element, middle_value)
+        self.size += 1 + moved_size
+
+    def borrow_right(self, parent_page, page_index):
         """Borrows an element from the right Page object.
 
         Parameters
@@ -756,18 +983,32 @@ class Page:
 
             A Page object.
 
+        parent_page : Page
+
+            The parent of the Page object.
+
+        page_index : int
+
+            The index in which the Page object is stored under parent_page.descendent_pages.
+
         Methodology
         -----------
 
-        This method gets an element of the right Page object and moves it to page.parent_page, so that the element in its place can be brought down to the Page object.
+        This method mirrors Page.borrow_left(), taking the first element (and, if the pages are not leaves, the first descendent page) of the right Page object instead.
         """
-        page_index = self.parent_page.descendent_pages.index(self)
-        right_page = self.get_right_page()
-        element_to_borrow = right_page[0]
-        middle_element = self.parent_page[page_index]
-        right_page.remove(element_to_borrow)
-        self.parent_page.keys[page_index] = element_to_borrow
-        self.insert(middle_element)
+        right_page = parent_page.descendent_pages[page_index + 1]
+        element_to_borrow, value_to_borrow = right_page.remove_item(0)
+        moved_size = 0
+        if not right_page.is_leaf():
+            descendent = right_page.descendent_pages.pop(0)
+            self.descendent_pages.append(descendent)
+            moved_size = descendent.size
+        right_page.size -= 1 + moved_size
+        middle_element = parent_page[page_index]
+        middle_value = parent_page.get_value(page_index)
+        parent_page.set_item(page_index, element_to_borrow, value_to_borrow)
+        self.insert_item(len(self), middle_element, middle_value)
+        self.size += 1 + moved_size
 
     def get_pages_of_depth(self, depth, current_pointer=None, current_depth=0):
         """Returns all keys of Pages in the same depth.
@@ -818,7 +1059,7 @@ class Page:
             else:
                 raise ValueError("The tree is not that tall!")
         else:
-            return current_pointer.keys
+            return list(current_pointer.keys)
 
     def is_leaf(self):
         """Tells if a Page object is a leaf page.
@@ -864,9 +1105,53 @@ class Page:
         Methodology
         -----------
 
-        This method actually tells whether the self.parent_page attribute is None or not.
+        This method tells whether the Page object is the root of the tree it belongs to, since pages do not point to their parents.
         """
-        return self.parent_page == None
+        return self.parent_tree.root is self
+
+    def get_adjacent_path(self, index):
+        """Returns the path down to the adjacent element (predecessor or sucessor) of a key of the Page object.
+
+        Parameters
+        ----------
+
+        self : Page
+
+            A Page object, which must not be a leaf.
+
+        index : int
+
+            The index of the key under self.keys.
+
+        Returns
+        -------
+
+        list
+
+            A list of (page, index) tuples, starting with the Page object. Each index is the one of the descendent page followed, except for the last tuple, which holds the leaf Page object and the index of the adjacent element in it.
+
+        Methodology
+        -----------
+
+        The predecessor is the rightmost element of the left descendent page of the key, and the sucessor is the leftmost element of its right descendent page. Both are found, and the path to the one whose leaf Page object holds more keys is returned, just like Page.get_adjacent_element() does.
+        """
+        previous_path = [(self, index)]
+        page_pointer = self.descendent_pages[index]
+        while not page_pointer.is_leaf():
+            previous_path.append((page_pointer, len(page_pointer)))
+            page_pointer = page_pointer.descendent_pages[-1]
+        previous_path.append((page_pointer, len(page_pointer) - 1))
+
+        next_path = [(self, index + 1)]
+        page_pointer = self.descendent_pages[index + 1]
+        while not page_pointer.is_leaf():
+            next_path.append((page_pointer, 0))
+            page_pointer = page_pointer.descendent_pages[0]
+        next_path.append((page_pointer, 0))
+
+        if len(next_path[-1][0]) > len(previous_path[-1][0]):
+            return next_path
+        return previous_path
 
     def replace_with_leaf_element(self, element):
         """Replace an element of the Page object with a element in a leaf Page object.
@@ -882,23 +1167,28 @@ class Page:
 
             The element to be replaced with an element from a leaf Page object.
 
+        Returns
+        -------
+
+        list
+
+            The path from the Page object down to the leaf Page object from which the adjacent element has been taken, as returned by Page.get_adjacent_path().
+
         Methodology
         -----------
 
-        This method calls Page.get_adjacent_element() to get the best element to replace the one in the Page object, and proceeds with the replacement process. Then, it updates the references of the descendent Page objects, and raises a DegreeUnderflowError if the leaf Page from which an element has been taken now violates the B-Tree rules.
+        This method calls Page.get_adjacent_path() to get the best element to replace the one in the Page object, and proceeds with the replacement process, which also moves the value of the adjacent element. The path is returned so that the caller can update the sizes of the pages on it and rebalance the leaf Page object, which might now violate the B-Tree rules (see BTree.remove()).
 
         """
-        number, number_page = self.get_adjacent_element(element, with_page=True)
-        number_page.remove(number, will_raise=False)
-        self.keys[self.index(element)] = number
-
-        self.update_descendents_parent_references()
-
-        if len(number_page) < number_page.min_num_keys:
-            raise DegreeUnderflowError(number_page)
+        index = self.index(element)
+        path = self.get_adjacent_path(index)
+        number_page, number_index = path[-1]
+        number, number_value = number_page.remove_item(number_index)
+        self.set_item(index, number, number_value)
+        return path
 
-    def update_descendents_parent_references(self):
-        """Updates the Page.parent_page attribute of Page objects in Page.descendent_pages.
+    def update_size(self):
+        """Recomputes the size attribute of a Page object from its keys and descendents.
 
         Parameters
         ----------
@@ -910,7 +1200,8 @@ class Page:
         Methodology
         -----------
 
-        This method iterates through all elements of self.descendent_pages, setting their parent_page attribute to the Page object.
+        The size of a page is the number of its own keys plus the sizes of its descendent pages, which are assumed to be up to date already. It is used when a page is built from pieces of other pages, such as in BTree.promote().
         """
-        for descendent in self.descendent_pages:
-            descendent.parent_page = self
+        self.size = len(self.keys) + sum(
+            descendent.size for descendent in self.descendent_pages
+        )
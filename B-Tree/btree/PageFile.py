@@ -0,0 +1,295 @@
+from os import path as os_path
+from struct import Struct
+
+
+class PageFile:
+    """A file made of fixed-size slots, each one holding a serialized page."""
+
+    header = Struct("<4sHIIQQQQB")
+    num_levels = Struct("<B")
+    free_slot = Struct("<BQ")
+    magic = b"BTRE"
+    version = 2
+    free_slot_flag = 0xFF
+
+    def __init__(self, path, page_size=None, min_num_keys=None, top_down=False):
+        """The constructor of the PageFile class.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        path : str
+
+            The path of the file. If it does not exist (or is empty), it will be created.
+
+        page_size : int, None (default = None)
+
+            The size, in bytes, of each slot. It is mandatory when creating a new file and ignored when opening an existing one, whose page size is read from its header.
+
+        min_num_keys : int, None (default = None)
+
+            The degree of the tree stored in the file. It is mandatory when creating a new file. When opening an existing one, a ValueError is raised if it differs from the stored degree.
+
+        top_down : bool (default = False)
+
+            Whether the tree stored in the file is in top-down mode (see BTree.__init__()), whose pages may hold one more key. When opening an existing file, a ValueError is raised if it differs from the stored mode, since pages written in one mode may not be valid in the other.
+
+        Returns
+        -------
+
+        PageFile
+
+            A PageFile object.
+
+        Methodology
+        -----------
+
+        Slot 0 of the file holds a header with the page size, the degree, the mode, the root page id, the number of slots, the head of the list of free slots and the number of keys of the tree, followed by the number of pages and keys of each level of the tree (see BTree.stats()), under self.level_num_pages and self.level_num_keys, if they fit in the rest of the slot. Every other slot holds either a page or a free slot, which points to the next free one, so that released slots are reused before the file grows.
+        """
+        if os_path.exists(path) and os_path.getsize(path) > 0:
+            self.file = open(path, "r+b")
+            self.read_header()
+            if min_num_keys is not None and min_num_keys != self.min_num_keys:
+                raise ValueError(
+                    "The file holds a B-Tree of degree {}, not {}.".format(
+                        self.min_num_keys, min_num_keys
+                    )
+                )
+            if top_down != self.top_down:
+                raise ValueError(
+                    "The file holds a B-Tree {}in top-down mode.".format(
+                        "" if self.top_down else "not "
+                    )
+                )
+        else:
+            if page_size is None or min_num_keys is None:
+                raise ValueError("A new page file needs a page size and a degree.")
+            if page_size < self.header.size:
+                raise ValueError(
+                    "The page size must be at least {} bytes.".format(self.header.size)
+                )
+            self.file = open(path, "w+b")
+            self.page_size = page_size
+            self.min_num_keys = min_num_keys
+            self.top_down = top_down
+            self.root_id = 0
+            self.num_slots = 1
+            self.free_head = 0
+            self.num_keys = 0
+            self.level_num_pages = [1]
+            self.level_num_keys = [0]
+            self.write_header()
+
+    def read_header(self):
+        """Reads the header of the file into the attributes of the PageFile object.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+        """
+        self.file.seek(0)
+        data = self.file.read(self.header.size)
+        (
+            magic,
+            version,
+            self.page_size,
+            self.min_num_keys,
+            self.root_id,
+            self.num_slots,
+            self.free_head,
+            self.num_keys,
+            flags,
+        ) = self.header.unpack(data)
+        self.top_down = bool(flags)
+        if magic != self.magic or version != self.version:
+            raise ValueError(
+                "This is not a B-Tree page file of version {}.".format(self.version)
+            )
+
+        data = self.file.read(self.page_size - self.header.size)
+        (num_levels,) = self.num_levels.unpack_from(data) if data else (0,)
+        if num_levels:
+            counters = Struct("<{}Q".format(2 * num_levels)).unpack_from(
+                data, self.num_levels.size
+            )
+            self.level_num_pages = list(counters[:num_levels])
+            self.level_num_keys = list(counters[num_levels:])
+        else:
+            self.level_num_pages = self.level_num_keys = None
+
+    def write_header(self):
+        """Writes the attributes of the PageFile object into the header of the file.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        Methodology
+        -----------
+
+        The per-level counters are written after the fixed part of the header, preceded by the number of levels. If they are stale (None) or do not fit in the slot, the number of levels is written as 0, which tells PageFile.read_header() that they are unknown.
+        """
+        counters = b""
+        if self.level_num_pages is not None:
+            num_levels = len(self.level_num_pages)
+            size = self.header.size + self.num_levels.size + 16 * num_levels
+            if num_levels < 256 and size <= self.page_size:
+                counters = self.num_levels.pack(num_levels) + Struct(
+                    "<{}Q".format(2 * num_levels)
+                ).pack(*self.level_num_pages, *self.level_num_keys)
+        header = self.header.pack(
+            self.magic,
+            self.version,
+            self.page_size,
+            self.min_num_keys,
+            self.root_id,
+            self.num_slots,
+            self.free_head,
+            self.num_keys,
+            1 if self.top_down else 0,
+        )
+        self.file.seek(0)
+        self.file.write((header + counters).ljust(self.page_size, b"\0"))
+
+    def read(self, page_id):
+        """Reads the slot of a page.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        page_id : int
+
+            The id of the page.
+
+        Returns
+        -------
+
+        bytes
+
+            The contents of the slot.
+        """
+        self.file.seek(page_id * self.page_size)
+        return self.file.read(self.page_size)
+
+    def write(self, page_id, data):
+        """Writes a serialized page into its slot.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        page_id : int
+
+            The id of the page.
+
+        data : bytes
+
+            The serialized page. A ValueError is raised if it does not fit in a slot.
+        """
+        if len(data) > self.page_size:
+            raise ValueError(
+                "The page needs {} bytes, but slots have {} bytes.".format(
+                    len(data), self.page_size
+                )
+            )
+        self.file.seek(page_id * self.page_size)
+        self.file.write(data.ljust(self.page_size, b"\0"))
+
+    def allocate(self):
+        """Reserves a slot for a new page.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        Returns
+        -------
+
+        int
+
+            The id of the reserved slot.
+
+        Methodology
+        -----------
+
+        If there is any free slot, the head of the list of free slots is taken and the next free slot (stored in it) becomes the new head. Otherwise, a new slot is appended to the end of the file.
+        """
+        if self.free_head:
+            page_id = self.free_head
+            _, self.free_head = self.free_slot.unpack(
+                self.read(page_id)[: self.free_slot.size]
+            )
+            return page_id
+
+        page_id = self.num_slots
+        self.num_slots += 1
+        return page_id
+
+    def release(self, page_id):
+        """Gives back the slot of a discarded page.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+
+        page_id : int
+
+            The id of the slot to be released.
+
+        Methodology
+        -----------
+
+        The slot becomes the new head of the list of free slots, storing the previous head in itself.
+        """
+        self.write(page_id, self.free_slot.pack(self.free_slot_flag, self.free_head))
+        self.free_head = page_id
+
+    def flush(self):
+        """Writes the header and flushes the file.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+        """
+        self.write_header()
+        self.file.flush()
+
+    def close(self):
+        """Flushes and closes the file.
+
+        Parameters
+        ----------
+
+        self : PageFile
+
+            A PageFile object.
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
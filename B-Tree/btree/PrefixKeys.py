@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from os.path import commonprefix
+
+
+class PrefixKeys:
+    """A sorted sequence of str keys, stored as the prefix they all share and the suffix of each key."""
+
+    __slots__ = ("prefix", "suffixes")
+
+    def __init__(self, keys=()):
+        """The PrefixKeys class constructor.
+
+        Parameters
+        ----------
+
+        self : PrefixKeys
+
+            A PrefixKeys object.
+
+        keys : iterable (default = ())
+
+            The keys to be held, in crescent order.
+
+        Returns
+        -------
+
+        PrefixKeys
+
+            A PrefixKeys object holding the given keys.
+
+        Methodology
+        -----------
+
+        Since the keys are sorted, the longest prefix they all share is the common prefix of the first and the last one, which becomes self.prefix. Only the rest of each key is kept under self.suffixes, so keys such as paths or hierarchical ids, which share long prefixes within a page, take much less memory. Reading a key rebuilds it by concatenation, but searches (see PrefixKeys.search()) only compare suffixes.
+
+        The prefix is kept as a common prefix of the keys, but not necessarily the longest one: removing keys never makes it longer, while inserting a key that does not start with it makes it shorter (see PrefixKeys.shorten_prefix()). Slicing computes the longest prefix of the slice again, so the pages created by splits start out fully compressed.
+        """
+        keys = list(keys)
+        self.prefix = commonprefix([keys[0], keys[-1]]) if keys else ""
+        if self.prefix:
+            prefix_length = len(self.prefix)
+            keys = [key[prefix_length:] for key in keys]
+        self.suffixes = keys
+
+    def __repr__(self):
+        """The representation of the PrefixKeys object, showing its prefix and suffixes."""
+        return "PrefixKeys({!r}, {!r})".format(self.prefix, self.suffixes)
+
+    def __len__(self):
+        """Returns the number of keys."""
+        return len(self.suffixes)
+
+    def __iter__(self):
+        """Iterates over the keys, in crescent order."""
+        prefix = self.prefix
+        return (prefix + suffix for suffix in self.suffixes)
+
+    def __getitem__(self, index):
+        """Returns the key at an index or, for a slice, a new PrefixKeys object holding the keys of the slice, with the longest prefix they share."""
+        if type(index) is not slice:
+            return self.prefix + self.suffixes[index]
+
+        keys = PrefixKeys()
+        keys.prefix = self.prefix
+        keys.suffixes = self.suffixes[index]
+        if keys.suffixes:
+            extension = commonprefix([keys.suffixes[0], keys.suffixes[-1]])
+            if extension:
+                keys.prefix += extension
+                keys.suffixes = [
+                    suffix[len(extension) :] for suffix in keys.suffixes
+                ]
+        return keys
+
+    def __setitem__(self, index, key):
+        """Replaces the key at an index, which must keep the keys in crescent order."""
+        self.shorten_prefix(key)
+        self.suffixes[index] = key[len(self.prefix) :]
+
+    def __delitem__(self, index):
+        """Removes the key (or the keys of a slice) at an index."""
+        del self.suffixes[index]
+
+    def __add__(self, other):
+        """Concatenates two sequences of keys, the keys of other coming after the ones of self, into a new PrefixKeys object."""
+        return PrefixKeys([*self, *other])
+
+    def shorten_prefix(self, key):
+        """Makes the prefix a prefix of a key as well.
+
+        Parameters
+        ----------
+
+        self : PrefixKeys
+
+            A PrefixKeys object.
+
+        key : str
+
+            The key about to be stored.
+
+        Methodology
+        -----------
+
+        If the key starts with the prefix, nothing changes. Otherwise, the prefix is cut down to what it shares with the key, and the part that has been cut is put back in front of every suffix, which takes O(k) for k keys. If there are no keys, the key itself becomes the prefix, so that the first key of a page sets its prefix.
+        """
+        prefix = self.prefix
+        if str.startswith(key, prefix):
+            return
+        if not self.suffixes:
+            self.prefix = key
+            return
+        shared = commonprefix([prefix, key])
+        removed = prefix[len(shared) :]
+        self.prefix = shared
+        self.suffixes = [removed + suffix for suffix in self.suffixes]
+
+    def insert(self, index, key):
+        """Inserts a key at an index, which must keep the keys in crescent order."""
+        self.shorten_prefix(key)
+        self.suffixes.insert(index, key[len(self.prefix) :])
+
+    def append(self, key):
+        """Inserts a key after every other key."""
+        self.insert(len(self.suffixes), key)
+
+    def extend(self, keys):
+        """Inserts several keys, in crescent order, after every other key."""
+        for key in keys:
+            self.insert(len(self.suffixes), key)
+
+    def pop(self, index=-1):
+        """Removes the key at an index and returns it."""
+        return self.prefix + self.suffixes.pop(index)
+
+    def search(self, element):
+        """Bisects the keys looking for an element, comparing only suffixes.
+
+        Parameters
+        ----------
+
+        self : PrefixKeys
+
+            A PrefixKeys object.
+
+        element : str
+
+            The element to be searched for.
+
+        Returns
+        -------
+
+        tuple : (found, index)
+
+            The same as Page.search(): whether the element is one of the keys, and the index where it is (or would be inserted).
+
+        Methodology
+        -----------
+
+        If the element does not start with the prefix, it is either smaller or greater than every key, which a single comparison with the prefix tells. Otherwise, the prefix is cut from the element once and the suffix is bisected among the suffixes, so the shared prefix is never compared again. Elements of other types raise a TypeError, just as comparing them with the keys would.
+        """
+        prefix = self.prefix
+        suffixes = self.suffixes
+        if not str.startswith(element, prefix):
+            return (False, 0 if element < prefix else len(suffixes))
+        if prefix:
+            element = element[len(prefix) :]
+        index = bisect_left(suffixes, element)
+        return (index < len(suffixes) and suffixes[index] == element, index)
+
+    def bisect_right(self, element):
+        """Returns the index of the first key greater than an element, comparing only suffixes, as in PrefixKeys.search()."""
+        prefix = self.prefix
+        if not str.startswith(element, prefix):
+            return 0 if element < prefix else len(self.suffixes)
+        if prefix:
+            element = element[len(prefix) :]
+        return bisect_right(self.suffixes, element)
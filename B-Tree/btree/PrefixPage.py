@@ -0,0 +1,64 @@
+from bisect import bisect_left, bisect_right
+
+from btree.helper import *
+from btree.Page import *
+from btree.PrefixKeys import *
+
+
+class PrefixPage(Page):
+    """A Page of a B-Tree of str keys, which stores the prefix its keys share only once."""
+
+    __slots__ = ()
+
+    def __init__(self, min_num_keys, parent_tree):
+        """The constructor of the PrefixPage class.
+
+        Parameters
+        ----------
+
+        self : PrefixPage
+
+            A PrefixPage object.
+
+        min_num_keys : int
+
+            The degree of the B-Tree.
+
+        parent_tree : BTree
+
+            The BTree object to which the PrefixPage object relates, whose key type is str.
+
+        Returns
+        -------
+
+        PrefixPage
+
+            The resulting PrefixPage object.
+
+        Methodology
+        -----------
+
+        A PrefixPage object is a Page object whose self.keys is a PrefixKeys object instead of a list. Since PrefixKeys objects behave like sorted lists of str objects, every method of BTree and Page works unchanged, while PrefixPage.search() and PrefixPage.get_probable_descendent(), which are called on every page a search goes through, only compare suffixes. Positions for insertions are found by PrefixPage.search() as well.
+
+        The savings come from the memory of the keys, not from speed: CPython compares the shared prefixes of full str keys with a single memcmp() call, which is cheaper than checking and cutting the prefix of the searched element in Python code, so searches are somewhat slower. The PrefixKeys object and its prefix also take some memory of their own, which only pays off when pages hold more than a few keys (that is, for degrees above 2 or so).
+        """
+        super().__init__(min_num_keys, parent_tree)
+        self.keys = PrefixKeys()
+
+    def search(self, element):
+        """Bisects the PrefixPage object looking for a given element, just like Page.search(), but comparing suffixes only, as in PrefixKeys.search(), whose code is inlined here since this method runs on every page a search goes through."""
+        keys = self.keys
+        prefix = keys.prefix
+        suffixes = keys.suffixes
+        if not str.startswith(element, prefix):
+            return (False, 0 if element < prefix else len(suffixes))
+        if prefix:
+            element = element[len(prefix) :]
+        index = bisect_left(suffixes, element)
+        return (index < len(suffixes) and suffixes[index] == element, index)
+
+    def get_probable_descendent(self, element):
+        """Returns the descendent page in which an element is expected to be found, just like Page.get_probable_descendent(), but comparing suffixes only, as in PrefixKeys.bisect_right()."""
+        if self.descendent_pages:
+            return self.descendent_pages[self.keys.bisect_right(element)]
+        return None
@@ -1,5 +1,16 @@
 from btree.BTree import *
 # from btree.RootPage import *
 from btree.Page import *
+from btree.PrefixKeys import *
+from btree.PrefixPage import *
 from btree.DegreeOverflowError import *
-from btree.DegreeUnderflowError import *
\ No newline at end of file
+from btree.DegreeUnderflowError import *
+from btree.PageFile import *
+from btree.BufferPool import *
+from btree.DiskPage import *
+from btree.DiskBTree import *
+from btree.LeafPage import *
+from btree.BPlusTree import *
+from btree.BTreeMap import *
+from btree.BloomFilter import *
+from btree.Cursor import *
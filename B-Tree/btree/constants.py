@@ -1,4 +1,18 @@
 # SUPPORTED TYPES
 SUPPORTED_LIST_TYPES = [list, tuple, set]
+NOT_MERGED_TYPES = [bytes, bytearray]
 SUPPORTED_TYPES = [int, float, str]
+MAX_CHARACTER = chr(0x10FFFF)
 
+
+# TYPED KEY STORAGE
+KEY_TYPECODES = {int: "q", float: "d"}
+
+
+# SNAPSHOTS
+SNAPSHOT_MAGIC = b"BTSS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_KEY_TYPES = [None, int, float, str]
+SNAPSHOT_TOP_DOWN = 1
+SNAPSHOT_B_STAR = 2
+SNAPSHOT_VALUES = 4
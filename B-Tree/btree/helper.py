@@ -1,3 +1,6 @@
+from bisect import bisect_left
+from struct import Struct, error as StructError
+
 from btree.constants import *
 
 
@@ -14,23 +17,40 @@ def insert_crescent(element, array):
     array: list
     
         The list into which the element shall be inserted.
+
+    Returns
+    -------
+
+    int
+
+        The index in which the element has been inserted.
         
     Methodology
     -----------
     
-    This function compares the given element against the elements of the given array, searching for the appropriate spot to insert it.
+    This function bisects the given array (which is already sorted) to find the appropriate spot to insert the element, which takes O(log n) comparisons instead of comparing the element against every key of the array.
     """
-    if len(array) == 0:
-        array.append(element)
-        return
-    for (index, key) in enumerate(array):
-        if element > key:
-            continue
-        else:
-            array.insert(index, element)
-            return
-    array.append(element)
-    return
+    index = bisect_left(array, element)
+    array.insert(index, element)
+    return index
+
+
+def check_type(element):
+    """Raises a TypeError if an element is not of SUPPORTED_TYPES.
+
+    Parameters
+    ----------
+
+    element : object
+
+        The element to be checked.
+    """
+    if type(element) not in SUPPORTED_TYPES:
+        raise TypeError(
+            "This type is not supported. Type of the argumenet: {}".format(
+                str(type(element))
+            )
+        )
 
 
 def is_class(obj, class_name):
@@ -67,6 +87,44 @@ def is_class(obj, class_name):
         return False
 
 
+def iterate_merged(*args):
+    """Iterates lazily over the elements of nested iterables, as if they had been merged into an one-dimensional list.
+
+    Parameters
+    ----------
+
+    *args : list
+
+        The elements to be merged. Any of them may be an iterable (such as a list, a tuple, a set, a range, a generator or an open file) holding elements or further iterables, nested as deep as needed.
+
+    Returns
+    -------
+
+    generator
+
+        A generator yielding every element that is not an iterable, in order.
+
+    Methodology
+    -----------
+
+    Instead of building a list through recursive calls, this generator keeps a stack with an iterator for each level of nesting it is in. Elements of SUPPORTED_TYPES are yielded right away (str objects are iterable, but they are elements), and so are bytes-like objects and objects that cannot be iterated, which are left for check_type() to reject. Any other object is iterated, its iterator being pushed onto the stack until it is exhausted. Only one element is held at a time, so a generator of millions of elements is consumed in constant memory (besides the depth of the nesting), and no recursion limit is ever reached.
+    """
+    stack = [iter(args)]
+    while stack:
+        for element in stack[-1]:
+            if type(element) in SUPPORTED_TYPES or type(element) in NOT_MERGED_TYPES:
+                yield element
+                continue
+            try:
+                stack.append(iter(element))
+            except TypeError:
+                yield element
+                continue
+            break
+        else:
+            stack.pop()
+
+
 def merge_to_list(*args):
     """Merges elements of various list types and types into an one-dimensional list.
     
@@ -87,16 +145,9 @@ def merge_to_list(*args):
     Methodology
     -----------
     
-    This function basically calls itself recursively to get deeper and deeper into the provided list structures and obtain only the elements contained in them. They are returned to extend the final_list list, which is returned at the end of execution.
+    This function just gathers the elements yielded by iterate_merged() into a list, for callers that need all of them at once. Callers that go through the elements one at a time should use iterate_merged() directly, which does not hold them all in memory.
     """
-    final_list = []
-    for element in args:
-        if type(element) in SUPPORTED_LIST_TYPES:
-            for item in element:
-                final_list.extend(merge_to_list(item))
-        else:
-            final_list.append(element)
-    return final_list
+    return list(iterate_merged(*args))
 
 
 def merge_to_list_of_lists(*args):
@@ -133,3 +184,227 @@ def merge_to_list_of_lists(*args):
             except IndexError:
                 final_list.append([])
     return final_list
+
+
+def get_page_sizes(num_keys, min_num_keys, max_num_keys, target_num_keys):
+    """Distributes a number of sorted keys evenly among the pages of a single B-Tree level.
+
+    Parameters
+    ----------
+
+    num_keys : int
+
+        How many keys the level has to hold, counting the ones that will be left between pages as separators.
+
+    min_num_keys : int
+
+        The minimum number of keys a non-root page may have.
+
+    max_num_keys : int
+
+        The maximum number of keys a page may have.
+
+    target_num_keys : int
+
+        How many keys each page should ideally have.
+
+    Returns
+    -------
+
+    list
+
+        The number of keys of each page of the level, from left to right. Between every two consecutive pages, one key is left out to be used as a separator in the level above.
+
+    Methodology
+    -----------
+
+    A level with num_keys keys split into p pages uses p - 1 of them as separators, so each page gets (num_keys + 1) / p - 1 keys on average. This function picks the smallest p that keeps that average under target_num_keys, reduces it if the pages would end up under min_num_keys and then spreads the remainder one key at a time over the leftmost pages, so that no two pages differ by more than one key.
+    """
+    num_pages = max(1, -(-(num_keys + 1) // (target_num_keys + 1)))
+    num_pages = max(1, min(num_pages, (num_keys + 1) // (min_num_keys + 1)))
+    if num_pages == 1 and num_keys > max_num_keys:
+        raise ValueError("The keys do not fit in the given degree.")
+
+    base_size, remainder = divmod(num_keys - num_pages + 1, num_pages)
+    return [base_size + 1] * remainder + [base_size] * (num_pages - remainder)
+
+
+def get_prefix_bound(prefix):
+    """Returns the smallest str that is greater than every str starting with a given prefix.
+
+    Parameters
+    ----------
+
+    prefix : str
+
+        The prefix.
+
+    Returns
+    -------
+
+    str, None
+
+        The bound, or None if there is none (which happens for the empty prefix and for prefixes made only of the largest character).
+
+    Methodology
+    -----------
+
+    str objects are compared character by character, so every str that starts with the prefix is smaller than the prefix with its last character replaced by the next one. Trailing occurrences of the largest character (chr(0x10FFFF)) cannot be incremented, so they are dropped first, and the character before them is incremented instead.
+    """
+    prefix = prefix.rstrip(MAX_CHARACTER)
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+KEY_BLOCK_INT = 0
+KEY_BLOCK_FLOAT = 1
+KEY_BLOCK_STR = 2
+KEY_BLOCK_NUMBER = 3
+KEY_BLOCK_LONG_INT = 4
+KEY_BLOCK_LONG_STR = 5
+KEY_LENGTH = Struct("<H")
+LONG_KEY_LENGTH = Struct("<I")
+TAGGED_INT = Struct("<Bq")
+TAGGED_FLOAT = Struct("<Bd")
+TAGGED_LONG_INT = Struct("<BI")
+
+
+def encode_keys(keys):
+    """Serializes a list of keys into a typed block of bytes.
+
+    Parameters
+    ----------
+
+    keys : list
+
+        The keys to be serialized. All of them must be of SUPPORTED_TYPES.
+
+    Returns
+    -------
+
+    tuple : (key_type, data)
+
+        key_type : int
+
+            The kind of block that has been written: KEY_BLOCK_INT, KEY_BLOCK_FLOAT, KEY_BLOCK_STR, KEY_BLOCK_LONG_STR or KEY_BLOCK_NUMBER.
+
+        data : bytes
+
+            The serialized keys.
+
+    Methodology
+    -----------
+
+    When every key is an int that fits in 64 bits (or every key is a float), the keys are packed all at once as 64-bit integers (or doubles). Strings are written as UTF-8 bytes preceded by their length, which takes KEY_LENGTH.size bytes, or LONG_KEY_LENGTH.size bytes (in a KEY_BLOCK_LONG_STR block) if any of them takes more than 65535 bytes. Lists mixing ints and floats, which are the only types that can be compared with each other, are written with a one-byte tag before each key, and so are lists holding ints that do not fit in 64 bits, which are tagged as KEY_BLOCK_LONG_INT and written as their two's complement bytes preceded by their length. A ValueError is raised for str keys that cannot be encoded in UTF-8 (such as lone surrogates) and for keys of any other type.
+    """
+    if all(type(key) is int and -(2**63) <= key < 2**63 for key in keys):
+        return (KEY_BLOCK_INT, Struct("<{}q".format(len(keys))).pack(*keys))
+    if all(type(key) is float for key in keys):
+        return (KEY_BLOCK_FLOAT, Struct("<{}d".format(len(keys))).pack(*keys))
+    if all(type(key) is str for key in keys):
+        try:
+            encoded_keys = [key.encode("utf-8") for key in keys]
+        except UnicodeEncodeError as error:
+            raise ValueError(
+                "A key cannot be encoded in UTF-8: {}".format(error.reason)
+            )
+        if all(len(encoded_key) <= 0xFFFF for encoded_key in encoded_keys):
+            key_type = KEY_BLOCK_STR
+            key_length = KEY_LENGTH
+        else:
+            key_type = KEY_BLOCK_LONG_STR
+            key_length = LONG_KEY_LENGTH
+        data = []
+        for encoded_key in encoded_keys:
+            data.append(key_length.pack(len(encoded_key)))
+            data.append(encoded_key)
+        return (key_type, b"".join(data))
+
+    data = []
+    for key in keys:
+        if type(key) is float:
+            data.append(TAGGED_FLOAT.pack(KEY_BLOCK_FLOAT, key))
+        elif type(key) is not int:
+            raise ValueError(
+                "A key of {} cannot be serialized with numbers.".format(type(key))
+            )
+        elif -(2**63) <= key < 2**63:
+            data.append(TAGGED_INT.pack(KEY_BLOCK_INT, key))
+        else:
+            encoded_key = key.to_bytes(
+                key.bit_length() // 8 + 1, "little", signed=True
+            )
+            data.append(TAGGED_LONG_INT.pack(KEY_BLOCK_LONG_INT, len(encoded_key)))
+            data.append(encoded_key)
+    return (KEY_BLOCK_NUMBER, b"".join(data))
+
+
+def decode_keys(data, offset, key_type, num_keys):
+    """Deserializes a block of keys written by encode_keys().
+
+    Parameters
+    ----------
+
+    data : bytes
+
+        The bytes containing the block.
+
+    offset : int
+
+        Where the block begins in data.
+
+    key_type : int
+
+        The kind of block, as returned by encode_keys().
+
+    num_keys : int
+
+        How many keys the block holds.
+
+    Returns
+    -------
+
+    tuple : (keys, offset)
+
+        keys : list
+
+            The deserialized keys.
+
+        offset : int
+
+            Where the block ends in data.
+    """
+    if key_type == KEY_BLOCK_INT or key_type == KEY_BLOCK_FLOAT:
+        block = Struct(
+            "<{}{}".format(num_keys, "q" if key_type == KEY_BLOCK_INT else "d")
+        )
+        return (list(block.unpack_from(data, offset)), offset + block.size)
+
+    keys = []
+    if key_type == KEY_BLOCK_STR or key_type == KEY_BLOCK_LONG_STR:
+        key_length = KEY_LENGTH if key_type == KEY_BLOCK_STR else LONG_KEY_LENGTH
+        for _ in range(num_keys):
+            (length,) = key_length.unpack_from(data, offset)
+            offset += key_length.size
+            keys.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+    else:
+        for _ in range(num_keys):
+            tag = data[offset]
+            if tag == KEY_BLOCK_INT:
+                keys.append(TAGGED_INT.unpack_from(data, offset)[1])
+                offset += TAGGED_INT.size
+            elif tag == KEY_BLOCK_FLOAT:
+                keys.append(TAGGED_FLOAT.unpack_from(data, offset)[1])
+                offset += TAGGED_FLOAT.size
+            else:
+                (_, length) = TAGGED_LONG_INT.unpack_from(data, offset)
+                offset += TAGGED_LONG_INT.size
+                keys.append(
+                    int.from_bytes(
+                        data[offset : offset + length], "little", signed=True
+                    )
+                )
+                offset += length
+    return (keys, offset)
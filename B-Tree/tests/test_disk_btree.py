@@ -0,0 +1,119 @@
+from os.path import abspath, dirname, getsize
+from sys import path as sys_path
+
+import pytest
+
+sys_path.append(dirname(dirname(abspath(__file__))))
+from btree import *
+
+
+def check_tree(tree, elements):
+    """Checks that a tree holds exactly the given elements and that its per-level counters match its pages."""
+    assert list(tree) == elements
+    assert tree.num_keys == tree.root.size == len(elements)
+    counts = tree.count_subtree(tree.root)
+    assert tree.stats()["num_keys"] == len(elements)
+    assert (tree.level_num_pages, tree.level_num_keys) == counts
+
+
+@pytest.mark.parametrize("path_name", [None, "upper.db"])
+def test_split_at(tmp_path, path_name):
+    tree = DiskBTree(2, str(tmp_path / "tree.db"), range(1000), buffer_size=8)
+    path = None if path_name is None else str(tmp_path / path_name)
+    other = tree.split_at(600, path)
+
+    assert type(other) is (BTree if path is None else DiskBTree)
+    check_tree(tree, list(range(600)))
+    check_tree(other, list(range(600, 1000)))
+    tree.close()
+    if path is not None:
+        other.close()
+        with DiskBTree(2, path) as reopened:
+            check_tree(reopened, list(range(600, 1000)))
+
+
+def test_split_at_bounds(tmp_path):
+    tree = DiskBTree(2, str(tmp_path / "tree.db"), range(100))
+    check_tree(tree.split_at(-1, str(tmp_path / "all.db")), list(range(100)))
+    check_tree(tree, [])
+    check_tree(tree.split_at(0), [])
+    tree.close()
+
+
+@pytest.mark.parametrize("sizes", [(1000, 50), (50, 1000), (0, 300), (300, 0)])
+def test_join(tmp_path, sizes):
+    left = DiskBTree(2, str(tmp_path / "left.db"), range(sizes[0]), buffer_size=8)
+    right = DiskBTree(
+        2, str(tmp_path / "right.db"), range(5000, 5000 + sizes[1]), buffer_size=8
+    )
+    elements = list(range(sizes[0])) + list(range(5000, 5000 + sizes[1]))
+
+    assert DiskBTree.join(left, right) is left
+    check_tree(left, elements)
+    check_tree(right, [])
+    left.close()
+    right.close()
+    with DiskBTree(2, str(tmp_path / "left.db")) as reopened:
+        check_tree(reopened, elements)
+
+
+def test_join_errors(tmp_path):
+    left = DiskBTree(2, str(tmp_path / "left.db"), range(100))
+    with pytest.raises(ValueError):
+        DiskBTree.join(left, DiskBTree(2, str(tmp_path / "low.db"), range(50, 60)))
+    with pytest.raises(ValueError):
+        DiskBTree.join(left, DiskBTree(3, str(tmp_path / "other.db"), [500]))
+    with pytest.raises(ValueError):
+        DiskBTree.join(left, BTree(2, 500))
+    check_tree(left, list(range(100)))
+    left.close()
+
+
+@pytest.mark.parametrize("keys", [list(range(-500, 500)), ["a" * i for i in range(30)]])
+def test_load(tmp_path, keys):
+    BTree(2, keys, top_down=True).save(str(tmp_path / "tree.snap"))
+    tree = DiskBTree.load(
+        str(tmp_path / "tree.snap"), str(tmp_path / "tree.db"), page_size=4096
+    )
+
+    assert (tree.min_num_keys, tree.top_down) == (2, True)
+    check_tree(tree, keys)
+    tree.close()
+    with DiskBTree(2, str(tmp_path / "tree.db"), top_down=True) as reopened:
+        check_tree(reopened, keys)
+
+
+def test_load_errors(tmp_path):
+    BTreeMap(2, {1: "a"}).save(str(tmp_path / "map.snap"))
+    with pytest.raises(ValueError):
+        DiskBTree.load(str(tmp_path / "map.snap"), str(tmp_path / "map.db"))
+    BTree(2, range(10)).save(str(tmp_path / "tree.snap"))
+    DiskBTree(2, str(tmp_path / "full.db"), 100).close()
+    with pytest.raises(ValueError):
+        DiskBTree.load(str(tmp_path / "tree.snap"), str(tmp_path / "full.db"))
+
+
+def test_remove_range_within_buffer_pool(tmp_path):
+    path = str(tmp_path / "tree.db")
+    DiskBTree.bulk_load(2, range(20000), path=path, buffer_size=4).close()
+    tree = DiskBTree(2, path, buffer_size=4)
+    height = tree.stats()["height"]
+    buffer_pool = tree.buffer_pool
+    load = buffer_pool.load
+    peak = [0]
+
+    def tracked_load(page):
+        load(page)
+        peak[0] = max(peak[0], len(buffer_pool.pages))
+
+    buffer_pool.load = tracked_load
+    assert tree.remove_range(100, 19900) == 19801
+    assert peak[0] <= buffer_pool.capacity + 4 * height
+    assert len(buffer_pool.pages) <= buffer_pool.capacity
+    check_tree(tree, list(range(100)) + list(range(19901, 20000)))
+
+    size = getsize(path)
+    tree.insert_many(range(100, 2000))
+    tree.flush()
+    assert getsize(path) == size
+    tree.close()